@@ -0,0 +1,65 @@
+# Class hierarchies from Assignment 2
+#
+# Importing the package runs no demonstrations, touches no files and imports no submodules.
+# Each name below is loaded from its submodule the first time it is used, so a worker that
+# only needs vehicles never pays for shapes, animals or file handlers:
+#
+#   from assignment2 import Car             imports assignment2.vehicles only
+#   from assignment2.shapes import Circle   imports assignment2.shapes only
+#
+# Submodules import typing only for type checkers, behind a TYPE_CHECKING = False guard that
+# mypy and pyright treat as true: at runtime typing costs more to import than any of them.
+# For the same reason, slow standard library modules such as re, json and concurrent.futures
+# are imported inside the functions that need them rather than at the top of a submodule.
+import importlib
+import types
+
+# Public names by the submodule defining them
+_SUBMODULE_EXPORTS = {
+    "vehicles": ("Vehicle", "Car", "Bike", "Fleet", "start_all", "stop_all"),
+    "engine_log": ("EngineLog", "ENGINE_LOG"),
+    "shapes": ("Shape", "Circle", "Rectangle", "ShapeArray", "ShapeCollection", "SpatialIndex",
+               "calculate_total_area", "StyledShape", "BorderedRectangle"),
+    "animals": ("Animal", "Dog", "Cat", "process_sound", "process_sounds", "write_sounds"),
+    "sound_scheduler": ("SoundScheduler",),
+    "people": ("DictionaryColumn", "PersonTable"),
+    "file_handlers": ("ReadCache", "FileHandler", "TextFileHandler", "BinaryFileHandler",
+                      "CompressedFileHandler", "GzipFileHandler", "Bz2FileHandler", "LzmaFileHandler",
+                      "ZstdFileHandler", "HandlerRegistry", "HANDLER_REGISTRY", "open_handler",
+                      "ByteBudget", "CopyResult", "BulkCopyEngine", "bulk_copy", "BatchTextWriter"),
+    "async_file_handlers": ("AsyncFileHandler", "AsyncTextFileHandler", "AsyncBinaryFileHandler"),
+    "serialization": ("encode_objects", "dump_objects", "SnapshotReader", "load_objects"),
+    "instrumentation": ("MethodStats", "Instrumentation", "INSTRUMENTATION"),
+    "flyweights": ("Spec", "ShapeSpec", "VehicleSpec", "SharedVehicle", "SpecFactory", "SPEC_FACTORY"),
+    "demos": (),
+}
+_EXPORTS = {name: submodule for submodule, names in _SUBMODULE_EXPORTS.items() for name in names}
+
+__all__ = sorted(_EXPORTS) + sorted(_SUBMODULE_EXPORTS)
+
+
+def __getattr__(name: str):
+    """
+    Import the submodule defining name on first access
+    Args:
+        name (str): A public name or submodule name
+    Returns:
+        Any: The requested class, function, constant or submodule
+    Raises:
+        AttributeError: If the package has no such name
+    """
+    if name in _SUBMODULE_EXPORTS:
+        return importlib.import_module(f".{name}", __name__)
+    submodule = _EXPORTS.get(name)
+    if submodule is None:
+        raise AttributeError(f"module {__name__!r} has no attribute {name!r}")
+    value = getattr(importlib.import_module(f".{submodule}", __name__), name)
+    # Later lookups find classes and constants directly and skip this function. Functions are
+    # looked up on their submodule every time, so Instrumentation's patches of them are seen
+    if not isinstance(value, types.FunctionType):
+        globals()[name] = value
+    return value
+
+
+def __dir__():
+    return sorted(set(globals()) | set(__all__))
@@ -0,0 +1,4 @@
+# Runs the demonstrations: python -m assignment2
+from .demos import main
+
+main()
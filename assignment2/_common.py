@@ -0,0 +1,178 @@
+# Helpers shared by the class hierarchies: cached descriptions and bulk column validation
+from __future__ import annotations
+
+from contextlib import contextmanager
+import functools
+import gc
+import operator
+import sys
+
+TYPE_CHECKING = False
+if TYPE_CHECKING:
+    from typing import Any, Callable, Dict, Iterator, List, Optional, Tuple
+
+
+# Decorator caching get_description until a public attribute is reassigned
+def cached_description(method: Callable[[Any], str]) -> Callable[[Any], str]:
+    """
+    Cache the string returned by a get_description method in the object's _description slot
+    The attributes it reads must be declared with described_attribute so reassignment clears the cache.
+    Equal descriptions are interned so identical objects share one string.
+    Args:
+        method (Callable[[Any], str]): The get_description implementation
+    Returns:
+        Callable[[Any], str]: The caching wrapper
+    """
+    # The cache is keyed by method so an override and its base never share a string. The key is
+    # the method's name rather than the function itself so that cached objects still pickle.
+    key = sys.intern(f"{method.__module__}.{method.__qualname__}")
+
+    @functools.wraps(method)
+    def get_description(self) -> str:
+        cached = self._description
+        if cached is not None and cached[0] == key:
+            return cached[1]
+        description = sys.intern(method(self))
+        self._description = (key, description)
+        return description
+    return get_description
+
+
+def described_attribute(name: str, on_change: Optional[Callable[[Any], None]] = None) -> property:
+    """
+    Create a property stored in the slot "_<name>" that clears the cached description when set
+    __init__ methods assign the slot directly, so construction pays no extra cost.
+    Args:
+        name (str): The public attribute name
+        on_change (Optional[Callable[[Any], None]]): Called with the object after each reassignment
+    Returns:
+        property: The attribute descriptor
+    """
+    slot = '_' + name
+
+    def set_value(self, value: Any) -> None:
+        setattr(self, slot, value)
+        self._description = None
+        if on_change is not None:
+            on_change(self)
+
+    return property(operator.attrgetter(slot), set_value, doc=f"The {name} attribute")
+
+
+def state_without(obj: Any, slot: str) -> Tuple[Optional[Dict[str, Any]], Dict[str, Any]]:
+    """
+    Get the pickle and copy state of a slotted object, leaving out the container it belongs to
+    A pickled or copied member is not in the container, so it must not carry a reference to it.
+    Args:
+        obj (Any): A slotted object
+        slot (str): The slot referring to its container, which is cleared in the state
+    Returns:
+        Tuple[Optional[Dict[str, Any]], Dict[str, Any]]: The __dict__ of a subclass without
+            __slots__ (or None), and the value of every set slot
+    """
+    state = {}
+    for cls in type(obj).__mro__:
+        for name in cls.__dict__.get('__slots__', ()):
+            if hasattr(obj, name):
+                state[name] = getattr(obj, name)
+    state[slot] = None
+    return getattr(obj, '__dict__', None) or None, state
+
+
+def column_error(values: List[Any], is_valid: Callable[[Any], bool], message: str) -> Optional[str]:
+    """
+    Validate a whole column at once, describing every offending row together
+    Args:
+        values (List[Any]): The column
+        is_valid (Callable[[Any], bool]): Predicate each value must satisfy
+        message (str): Error message, followed by the offending row indexes
+    Returns:
+        Optional[str]: The error, or None if every value satisfies the predicate
+    """
+    bad_rows = [row for row, value in enumerate(values) if not is_valid(value)]
+    if bad_rows:
+        return f"{message} (rows {', '.join(map(str, bad_rows))})"
+    return None
+
+
+def positive_columns_error(message: str, *columns: List[float]) -> Optional[str]:
+    """
+    Validate that every value in some numeric columns is positive
+    Args:
+        message (str): Error message, followed by the offending row indexes
+        *columns (List[float]): The columns, all describing the same rows
+    Returns:
+        Optional[str]: The error, or None if every value is positive
+    """
+    # min() runs in C, so valid columns are checked without a Python-level loop
+    if all(not column or min(column) > 0 for column in columns):
+        return None
+    return column_error(list(zip(*columns)), lambda row: all(value > 0 for value in row), message)
+
+
+def raise_column_errors(*errors: Optional[str]) -> None:
+    """
+    Raise one error reporting the failures of several column checks
+    Args:
+        *errors (Optional[str]): Results of column_error and positive_columns_error
+    Raises:
+        ValueError: If any check failed, listing every failure
+    """
+    messages = [error for error in errors if error is not None]
+    if messages:
+        raise ValueError("; ".join(messages))
+
+
+def check_column(values: List[Any], is_valid: Callable[[Any], bool], message: str) -> None:
+    """
+    Validate a whole column at once, reporting every offending row together
+    Args:
+        values (List[Any]): The column
+        is_valid (Callable[[Any], bool]): Predicate each value must satisfy
+        message (str): Error message, followed by the offending row indexes
+    Raises:
+        ValueError: If any value fails the predicate
+    """
+    raise_column_errors(column_error(values, is_valid, message))
+
+
+def check_positive_columns(message: str, *columns: List[float]) -> None:
+    """
+    Validate that every value in some numeric columns is positive
+    Args:
+        message (str): Error message, followed by the offending row indexes
+        *columns (List[float]): The columns, all describing the same rows
+    Raises:
+        ValueError: If any value is not positive
+    """
+    raise_column_errors(positive_columns_error(message, *columns))
+
+
+def check_same_length(*columns: List[Any]) -> None:
+    """
+    Validate that columns describing the same rows have equal lengths
+    Args:
+        *columns (List[Any]): The columns
+    Raises:
+        ValueError: If the lengths differ
+    """
+    if len({len(column) for column in columns}) > 1:
+        raise ValueError("All columns must have the same length")
+
+
+@contextmanager
+def gc_paused() -> Iterator[None]:
+    """
+    Pause the cyclic garbage collector while allocating many acyclic objects
+    Without this, allocation-triggered collections rescan the growing list of new objects and
+    dominate bulk construction time.
+    Yields:
+        None
+    """
+    gc_was_enabled = gc.isenabled()
+    gc.disable()
+    try:
+        yield
+    finally:
+        if gc_was_enabled:
+            gc.enable()
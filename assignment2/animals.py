@@ -0,0 +1,228 @@
+# Animal class hierarchy and sound processing
+from __future__ import annotations
+
+from abc import ABC, abstractmethod
+import operator
+
+from ._common import cached_description, column_error, described_attribute, gc_paused, raise_column_errors
+
+TYPE_CHECKING = False
+if TYPE_CHECKING:
+    from typing import IO, Callable, Dict, Iterable, Iterator, List, Tuple
+
+
+# Abstract base class to ensure make_sound method is implemented
+class Animal(ABC):
+    __slots__ = ('_name', '_age', '_description')
+
+    name = described_attribute('name')
+    age = described_attribute('age')
+
+    def __init__(self, name: str, age: int):
+        """
+        Initialize an Animal with basic attributes
+        Args:
+            name (str): The name of the animal
+            age (int): The age of the animal
+        Raises:
+            ValueError: If age is negative or name is empty
+        """
+        if not name.strip():
+            raise ValueError("Name cannot be empty")
+        if age < 0:
+            raise ValueError("Age cannot be negative")
+        self._name = name
+        self._age = age
+        self._description = None
+
+    @classmethod
+    def from_records(cls, records: Iterable[Tuple[str, int]]) -> List["Animal"]:
+        """
+        Build many animals from (name, age) records, validating each column once
+        Args:
+            records (Iterable[Tuple[str, int]]): Name and age of each animal
+        Returns:
+            List[Animal]: Instances of the class the method is called on, in record order
+        Raises:
+            ValueError: If names are empty or ages negative, listing every bad row
+        """
+        records = list(records)
+        names = [name for name, _ in records]
+        ages = [age for _, age in records]
+        raise_column_errors(
+            column_error(names, str.strip, "Name cannot be empty"),
+            column_error(ages, lambda age: age >= 0, "Age cannot be negative")
+            if ages and min(ages) < 0 else None)
+        new = cls.__new__
+        animals = []
+        with gc_paused():
+            for name, age in records:
+                animal = new(cls)
+                animal._name = name
+                animal._age = age
+                animal._description = None
+                animals.append(animal)
+        return animals
+
+    @abstractmethod
+    def make_sound(self) -> str:
+        """
+        Abstract method to make animal-specific sound
+        Returns:
+            str: The sound made by the animal
+        """
+        pass
+
+    @cached_description
+    def get_description(self) -> str:
+        """
+        Get description of the animal
+        Returns:
+            str: Description including name and age
+        """
+        return f"{self.__class__.__name__} named {self.name}, age {self.age}"
+
+# Dog class inheriting from Animal
+class Dog(Animal):
+    __slots__ = ()
+
+    def make_sound(self) -> str:
+        """
+        Implement make_sound for Dog
+        Returns:
+            str: Dog-specific sound
+        """
+        return f"{self.name} says: Woof! Woof!"
+
+# Cat class inheriting from Animal
+class Cat(Animal):
+    __slots__ = ()
+
+    def make_sound(self) -> str:
+        """
+        Implement make_sound for Cat
+        Returns:
+            str: Cat-specific sound
+        """
+        return f"{self.name} says: Meow!"
+
+# Function to process sound of any animal
+def process_sound(sound_object: Animal) -> str:
+    """
+    Process the sound of an animal object using polymorphism
+    Args:
+        sound_object (Animal): Object that implements make_sound method
+    Returns:
+        str: Formatted string describing the animal and its sound
+    Raises:
+        AttributeError: If the object doesn't have make_sound method
+    """
+    try:
+        sound = sound_object.make_sound()
+        return f"{sound_object.get_description()} makes sound: {sound}"
+    except AttributeError:
+        raise AttributeError("Object must have a make_sound method")
+
+# Classes whose process_sound output depends only on name and age, so it can be templated,
+# with the methods each template reproduces
+TEMPLATED_SOUND_CLASSES: Dict[type, Tuple[Callable, Callable]] = {
+    cls: (cls.make_sound, cls.get_description) for cls in (Dog, Cat)
+}
+_process_sound = process_sound
+
+
+def _is_templated(cls: type) -> bool:
+    """
+    Check whether process_sound lines for a class can come from a template
+    Args:
+        cls (type): The class of the objects
+    Returns:
+        bool: True for a templated class whose methods and process_sound have not been
+            replaced since, e.g. by Instrumentation
+    """
+    return (TEMPLATED_SOUND_CLASSES.get(cls) == (getattr(cls, 'make_sound'), getattr(cls, 'get_description'))
+            and process_sound is _process_sound)
+
+
+def _sound_formatter(cls: type) -> Callable[[Animal], str]:
+    """
+    Validate a class for process_sounds and build the function formatting its lines
+    Args:
+        cls (type): The class of the objects
+    Returns:
+        Callable[[Animal], str]: Function returning the process_sound line for an object
+    Raises:
+        AttributeError: If the class lacks make_sound or get_description
+    """
+    if not (callable(getattr(cls, 'make_sound', None)) and callable(getattr(cls, 'get_description', None))):
+        raise AttributeError("Object must have a make_sound method")
+    if not _is_templated(cls):
+        return process_sound
+
+    import re
+
+    # Render one line for a probe with marker values to find the literal text around the fields
+    name_marker, age_marker = "\x00name\x00", "\x00age\x00"
+    probe = cls.__new__(cls)
+    probe._name = name_marker
+    probe._age = age_marker
+    probe._description = None
+    pieces = re.split(f"({name_marker}|{age_marker})", process_sound(probe))
+    literals, markers = pieces[::2], pieces[1::2]
+    if markers == [name_marker, age_marker, name_marker]:
+        # The Dog/Cat layout: "<Class> named <name>, age <age> makes sound: <name> says: ..."
+        head, after_name, after_age, tail = literals
+        return lambda animal: f"{head}{animal._name}{after_name}{animal._age}{after_age}{animal._name}{tail}"
+    template = "%s".join(literal.replace("%", "%%") for literal in literals)
+    fields = [operator.attrgetter('_name' if marker == name_marker else '_age') for marker in markers]
+    return lambda animal: template % tuple(field(animal) for field in fields)
+
+
+def process_sounds(animals: Iterable[Animal]) -> Iterator[str]:
+    """
+    Lazily produce the process_sound line for every animal
+    Classes are validated once, and Dog/Cat lines come from cached per-class templates
+    unless their methods have been replaced.
+    Args:
+        animals (Iterable[Animal]): Objects that implement make_sound
+    Yields:
+        str: Formatted string describing each animal and its sound
+    Raises:
+        AttributeError: If an object doesn't have a make_sound method
+    """
+    formatters: Dict[type, Callable[[Animal], str]] = {}
+    for animal in animals:
+        cls = type(animal)
+        formatter = formatters.get(cls)
+        if formatter is None:
+            formatter = formatters[cls] = _sound_formatter(cls)
+        yield formatter(animal)
+
+
+def write_sounds(animals: Iterable[Animal], sink: IO[str], batch_size: int = 1024) -> int:
+    """
+    Stream process_sound lines into a text buffer or file in batches
+    Args:
+        animals (Iterable[Animal]): Objects that implement make_sound
+        sink (IO[str]): Object with a write method, such as a file or io.StringIO
+        batch_size (int): Lines joined per write call (default: 1024)
+    Returns:
+        int: Number of lines written
+    Raises:
+        ValueError: If batch_size is not positive
+        AttributeError: If an object doesn't have a make_sound method
+    """
+    if batch_size <= 0:
+        raise ValueError("Batch size must be positive")
+    count = 0
+    batch: List[str] = []
+    for line in process_sounds(animals):
+        batch.append(line)
+        if len(batch) == batch_size:
+            sink.write("\n".join(batch) + "\n")
+            count += batch_size
+            batch.clear()
+    if batch:
+        sink.write("\n".join(batch) + "\n")
+        count += len(batch)
+    return count
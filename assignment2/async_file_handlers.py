@@ -0,0 +1,188 @@
+# Non-blocking counterparts of the file handlers, for use with asyncio
+from __future__ import annotations
+
+from abc import ABC, abstractmethod
+import asyncio
+from concurrent.futures import ThreadPoolExecutor
+
+from .file_handlers import BinaryFileHandler, FileHandler, TextFileHandler
+
+TYPE_CHECKING = False
+if TYPE_CHECKING:
+    from typing import Any, Callable, Iterable, List, Optional
+
+
+# Abstract base class for non-blocking file handlers
+class AsyncFileHandler(ABC):
+    # Thread pool shared by every async handler, created on first use
+    _executor: Optional[ThreadPoolExecutor] = None
+    max_workers = 32
+
+    def __init__(self, filename: str):
+        """
+        Initialize an AsyncFileHandler around the matching blocking handler
+        Args:
+            filename (str): The name of the file to handle
+        Raises:
+            ValueError: If filename is empty
+        """
+        self.handler = self.create_handler(filename)
+        self.filename = self.handler.filename
+
+    @abstractmethod
+    def create_handler(self, filename: str) -> FileHandler:
+        """
+        Abstract method to create the blocking handler doing the actual I/O
+        Args:
+            filename (str): The name of the file to handle
+        Returns:
+            FileHandler: The blocking handler
+        """
+        pass
+
+    @abstractmethod
+    async def read(self) -> Any:
+        """
+        Abstract method to read content from the file without blocking the event loop
+        Returns:
+            Any: The content read from the file
+        """
+        pass
+
+    @abstractmethod
+    async def write(self, content: Any) -> None:
+        """
+        Abstract method to write content to the file without blocking the event loop
+        Args:
+            content (Any): The content to write to the file
+        """
+        pass
+
+    @classmethod
+    def get_executor(cls) -> ThreadPoolExecutor:
+        """
+        Get the shared, bounded executor used for blocking file I/O
+        Returns:
+            ThreadPoolExecutor: The shared executor
+        """
+        if AsyncFileHandler._executor is None:
+            AsyncFileHandler._executor = ThreadPoolExecutor(
+                max_workers=cls.max_workers, thread_name_prefix="AsyncFileHandler")
+        return AsyncFileHandler._executor
+
+    async def _run(self, function: Callable, *args: Any) -> Any:
+        """
+        Run a blocking call on the shared executor
+        Args:
+            function (Callable): The blocking function to run
+            *args (Any): Arguments passed to the function
+        Returns:
+            Any: The function's return value
+        """
+        loop = asyncio.get_running_loop()
+        return await loop.run_in_executor(self.get_executor(), function, *args)
+
+    @classmethod
+    async def gather_read(cls, paths: Iterable[str], max_concurrency: int = 16) -> List[Any]:
+        """
+        Read many files concurrently with at most max_concurrency reads in flight
+        Args:
+            paths (Iterable[str]): Names of the files to read
+            max_concurrency (int): Maximum number of simultaneous reads
+        Returns:
+            List[Any]: Contents of the files, in the order of paths
+        Raises:
+            ValueError: If max_concurrency is not positive or a filename is empty
+        """
+        if max_concurrency <= 0:
+            raise ValueError("max_concurrency must be positive")
+        handlers = [cls(path) for path in paths]
+        semaphore = asyncio.Semaphore(max_concurrency)
+
+        async def bounded_read(handler: AsyncFileHandler) -> Any:
+            async with semaphore:
+                return await handler.read()
+
+        return await asyncio.gather(*(bounded_read(handler) for handler in handlers))
+
+    def get_file_info(self) -> str:
+        """
+        Get information about the file
+        Returns:
+            str: Description of the file and its handler
+        """
+        return f"{self.__class__.__name__} handling file: {self.filename}"
+
+
+# Async counterpart of TextFileHandler
+class AsyncTextFileHandler(AsyncFileHandler):
+    def create_handler(self, filename: str) -> TextFileHandler:
+        """
+        Create the blocking text handler
+        Args:
+            filename (str): The name of the file to handle
+        Returns:
+            TextFileHandler: The blocking handler
+        """
+        return TextFileHandler(filename)
+
+    async def read(self) -> str:
+        """
+        Read content from a text file on the shared executor
+        Returns:
+            str: The content of the text file
+        Raises:
+            FileNotFoundError: If the file does not exist
+            IOError: If there's an error reading the file
+        """
+        return await self._run(self.handler.read)
+
+    async def write(self, content: str) -> None:
+        """
+        Write content to a text file on the shared executor
+        Args:
+            content (str): The text content to write
+        Raises:
+            TypeError: If content is not a string
+            IOError: If there's an error writing to the file
+        """
+        if not isinstance(content, str):
+            raise TypeError("Content must be a string for AsyncTextFileHandler")
+        await self._run(self.handler.write, content)
+
+
+# Async counterpart of BinaryFileHandler
+class AsyncBinaryFileHandler(AsyncFileHandler):
+    def create_handler(self, filename: str) -> BinaryFileHandler:
+        """
+        Create the blocking binary handler
+        Args:
+            filename (str): The name of the file to handle
+        Returns:
+            BinaryFileHandler: The blocking handler
+        """
+        return BinaryFileHandler(filename)
+
+    async def read(self) -> bytes:
+        """
+        Read content from a binary file on the shared executor
+        Returns:
+            bytes: The content of the binary file
+        Raises:
+            FileNotFoundError: If the file does not exist
+            IOError: If there's an error reading the file
+        """
+        return await self._run(self.handler.read)
+
+    async def write(self, content: bytes) -> None:
+        """
+        Write content to a binary file on the shared executor
+        Args:
+            content (bytes): The binary content to write
+        Raises:
+            TypeError: If content is not bytes
+            IOError: If there's an error writing to the file
+        """
+        if not isinstance(content, bytes):
+            raise TypeError("Content must be bytes for AsyncBinaryFileHandler")
+        await self._run(self.handler.write, content)
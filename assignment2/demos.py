@@ -0,0 +1,256 @@
+# Demonstrations of each class hierarchy, run by "python -m assignment2" or "Assignment 2.py"
+from __future__ import annotations
+
+import os
+
+# process_sound is called through its module, so instrumentation patches of it are seen
+from . import animals as animal_module
+from .animals import Animal, Cat, Dog
+from .file_handlers import BinaryFileHandler, TextFileHandler
+from .shapes import BorderedRectangle, Circle, Rectangle, ShapeArray, calculate_total_area
+from .vehicles import Bike, Car, Fleet
+
+TYPE_CHECKING = False
+if TYPE_CHECKING:
+    from typing import List
+
+
+# Demonstration of the vehicle class hierarchy
+def vehicle_demo():
+    # Create instances of Car and Bike
+    my_car = Car("Toyota", "Camry", 2023, 4)
+    my_bike = Bike("Harley-Davidson", "Sportster", 2022, True)
+
+    # Demonstrate method calls for Car
+    print("Car Demonstration:")
+    print(my_car.get_description())
+    print(my_car.start_engine())
+    print(my_car.stop_engine())
+    print()
+
+    # Demonstrate method calls for Bike
+    print("Bike Demonstration:")
+    print(my_bike.get_description())
+    print(my_bike.start_engine())
+    print(my_bike.stop_engine())
+    print()
+
+    # Demonstrate polymorphism
+    vehicles = [my_car, my_bike]
+    print("Polymorphic Behavior:")
+    for vehicle in vehicles:
+        print(f"{vehicle.__class__.__name__}: {vehicle.get_description()}")
+        print(f"{vehicle.__class__.__name__}: {vehicle.start_engine()}")
+        print()
+
+    # Demonstrate indexed lookup in a fleet
+    fleet = Fleet(vehicles)
+    my_bike.stop_engine()
+    print("Fleet Query (running Toyotas from 2022 onwards):")
+    for vehicle in fleet.query(brand="Toyota", year_min=2022, is_running=True):
+        print(vehicle.get_description())
+
+
+# Demonstration of the shape hierarchy and total area calculation
+def shape_demo():
+    try:
+        # Create a list of different shapes
+        shapes = [
+            Circle(5.0),           # Circle with radius 5
+            Rectangle(4.0, 6.0),   # Rectangle with width 4, height 6
+            Circle(2.5),           # Circle with radius 2.5
+            Rectangle(3.0, 8.0)    # Rectangle with width 3, height 8
+        ]
+
+        # Print individual shape information and areas
+        print("Individual Shape Details:")
+        print("-" * 50)
+        for shape in shapes:
+            print(f"{shape.get_description()}")
+            print(f"Area: {shape.calculate_area():.2f} square units")
+            print()
+
+        # Calculate and display total area
+        total = calculate_total_area(shapes)
+        print("-" * 50)
+        print(f"Total Area of All Shapes: {total:.2f} square units")
+
+        # Calculate the same total from the columnar ShapeArray
+        shape_array = ShapeArray(shapes)
+        print(f"Total Area via ShapeArray: {calculate_total_area(shape_array):.2f} square units")
+
+        # Demonstrate error handling
+        print("\nTesting Error Handling:")
+        try:
+            invalid_circle = Circle(-1)  # Should raise ValueError
+        except ValueError as e:
+            print(f"Error: {e}")
+
+        try:
+            invalid_rectangle = Rectangle(0, 5)  # Should raise ValueError
+        except ValueError as e:
+            print(f"Error: {e}")
+
+    except Exception as e:
+        print(f"An unexpected error occurred: {e}")
+
+
+# Demonstration of the StyledShape and BorderedRectangle classes
+def bordered_rectangle_demo():
+    try:
+        # Create instances of Rectangle with different parameters
+        rect1 = BorderedRectangle(5.0, 3.0, "Blue", 2.0)
+        rect2 = BorderedRectangle(4.0, 6.0, "Red")
+
+        # Demonstrate the functionality
+        print("Rectangle 1 Demonstration:")
+        print(rect1.get_description())
+        print(f"Area: {rect1.calculate_area():.2f} square units")
+        print()
+
+        print("Rectangle 2 Demonstration:")
+        print(rect2.get_description())
+        print(f"Area: {rect2.calculate_area():.2f} square units")
+        print()
+
+        # Demonstrate error handling
+        print("Testing Error Handling:")
+        try:
+            invalid_rect = BorderedRectangle(-1, 5, "Green")  # Should raise ValueError
+        except ValueError as e:
+            print(f"Error creating rectangle: {e}")
+
+        try:
+            invalid_rect = BorderedRectangle(2, 3, "Yellow", -1)  # Should raise ValueError
+        except ValueError as e:
+            print(f"Error creating rectangle: {e}")
+
+    except Exception as e:
+        print(f"An unexpected error occurred: {e}")
+
+
+# Demonstration of polymorphic sound processing
+def animal_demo():
+    try:
+        # Create instances of Dog and Cat
+        animals: List[Animal] = [
+            Dog("Rex", 5),
+            Cat("Whiskers", 3),
+            Dog("Buddy", 2),
+            Cat("Luna", 4)
+        ]
+
+        # Process sounds for all animals
+        print("Processing Animal Sounds:")
+        print("-" * 50)
+        for animal in animals:
+            print(animal_module.process_sound(animal))
+        print()
+
+        # Demonstrate error handling with invalid input
+        print("Testing Error Handling:")
+        class InvalidAnimal:
+            pass
+
+        try:
+            invalid_animal = InvalidAnimal()
+            animal_module.process_sound(invalid_animal)  # Should raise AttributeError
+        except AttributeError as e:
+            print(f"Error: {e}")
+
+        try:
+            invalid_dog = Dog("", 3)  # Should raise ValueError (empty name)
+        except ValueError as e:
+            print(f"Error: {e}")
+
+        try:
+            invalid_cat = Cat("Misty", -1)  # Should raise ValueError (negative age)
+        except ValueError as e:
+            print(f"Error: {e}")
+
+    except Exception as e:
+        print(f"An unexpected error occurred: {e}")
+
+
+# Demonstration of the file handler system
+def file_handler_demo():
+    try:
+        # Create temporary files for demonstration
+        text_file = "example.txt"
+        binary_file = "example.bin"
+
+        # Create instances of file handlers
+        text_handler = TextFileHandler(text_file)
+        binary_handler = BinaryFileHandler(binary_file)
+
+        # Demonstrate text file handling
+        print("Text File Handler Demonstration:")
+        print(text_handler.get_file_info())
+
+        # Write to text file
+        text_content = "Hello, this is a text file!"
+        text_handler.write(text_content)
+        print(f"Written to text file: {text_content}")
+
+        # Read from text file
+        text_read = text_handler.read()
+        print(f"Read from text file: {text_read}")
+        print()
+
+        # Demonstrate binary file handling
+        print("Binary File Handler Demonstration:")
+        print(binary_handler.get_file_info())
+
+        # Write to binary file
+        binary_content = b"Binary data \x00\x01\x02"
+        binary_handler.write(binary_content)
+        print(f"Written to binary file: {binary_content}")
+
+        # Read from binary file
+        binary_read = binary_handler.read()
+        print(f"Read from binary file: {binary_read}")
+        print()
+
+        # Demonstrate error handling
+        print("Testing Error Handling:")
+
+        # Try to create handler with empty filename
+        try:
+            invalid_handler = TextFileHandler("")
+        except ValueError as e:
+            print(f"Error: {e}")
+
+        # Try to write wrong content type
+        try:
+            text_handler.write(123)  # Should raise TypeError
+        except TypeError as e:
+            print(f"Error: {e}")
+
+        try:
+            binary_handler.write("Not bytes")  # Should raise TypeError
+        except TypeError as e:
+            print(f"Error: {e}")
+
+        # Try to read non-existent file
+        try:
+            invalid_text_handler = TextFileHandler("nonexistent.txt")
+            invalid_text_handler.read()
+        except FileNotFoundError as e:
+            print(f"Error: {e}")
+
+    except Exception as e:
+        print(f"An unexpected error occurred: {e}")
+    finally:
+        # Clean up temporary files
+        for file in [text_file, binary_file]:
+            if os.path.exists(file):
+                os.remove(file)
+                print(f"Cleaned up file: {file}")
+
+
+def main():
+    """
+    Run every demonstration in order
+    """
+    for demo in (vehicle_demo, shape_demo, bordered_rectangle_demo, animal_demo, file_handler_demo):
+        demo()
@@ -0,0 +1,422 @@
+# Opt-in log of engine start/stop transitions with uptime queries across a fleet
+from __future__ import annotations
+
+from array import array
+from bisect import bisect_left, bisect_right
+from collections import Counter
+from contextlib import contextmanager
+import math
+import threading
+import time
+
+from .vehicles import Vehicle
+
+TYPE_CHECKING = False
+if TYPE_CHECKING:
+    from typing import Callable, ClassVar, Dict, Iterator, List, Optional, Tuple
+
+
+# Append-only, bounded log of engine state transitions stored column by column
+class EngineLog:
+    # The log currently installed on Vehicle.is_running, if any
+    _active: ClassVar[Optional["EngineLog"]] = None
+
+    def __init__(self, max_events: int = 1_000_000, max_age: Optional[float] = None,
+                 chunk_size: int = 4096, clock: Callable[[], float] = time.time):
+        """
+        Initialize an empty EngineLog
+        Events are kept in chunks of three parallel columns: timestamp ('d'), vehicle code ('I')
+        and new state (one byte), and again per vehicle as timestamp and state, so each event
+        costs 22 bytes. When retention is exceeded the oldest whole chunk is dropped, and the
+        state each vehicle had at that point is kept, so queries stay exact for any time after
+        the horizon. A vehicle left with no retained events and a stopped engine is forgotten
+        then, so the log does not keep every vehicle it ever saw alive.
+        Args:
+            max_events (int): Number of events retained before the oldest chunk is dropped
+                (default: 1,000,000)
+            max_age (Optional[float]): Seconds of history retained behind the newest event, or
+                None to limit by count only (default: None)
+            chunk_size (int): Events per chunk, the unit of eviction (default: 4096)
+            clock (Callable[[], float]): Source of timestamps in seconds (default: time.time)
+        Raises:
+            ValueError: If max_events or chunk_size is not positive or max_age is negative
+        """
+        if max_events <= 0 or chunk_size <= 0:
+            raise ValueError("max_events and chunk_size must be positive")
+        if max_age is not None and max_age < 0:
+            raise ValueError("max_age cannot be negative")
+        self.max_events = max_events
+        self.max_age = max_age
+        self.chunk_size = chunk_size
+        self.clock = clock
+        self.dropped = 0
+        self._lock = threading.Lock()
+        self._original: Optional[property] = None
+        self.clear()
+
+    def clear(self) -> None:
+        """
+        Drop every event and forget every vehicle; the dropped counter is kept
+        """
+        with self._lock:
+            self._times: List[array] = []
+            self._codes: List[array] = []
+            self._states: List[bytearray] = []
+            # Last timestamp of each chunk, for finding the chunk holding a time
+            self._lasts: List[float] = []
+            # Vehicles by code, None for forgotten ones, whose codes are reused from _free
+            self._vehicles: List[Optional[Vehicle]] = []
+            self._index: Dict[Vehicle, int] = {}
+            self._free: List[int] = []
+            # Retained timestamps and states of each vehicle, for per-vehicle binary searches
+            self._history: List[Optional[Tuple[array, bytearray]]] = []
+            # State of each vehicle just before the oldest retained event
+            self._base = bytearray()
+            self._last_time = float('-inf')
+
+    @property
+    def vehicles(self) -> List[Vehicle]:
+        """
+        Vehicles the log currently knows about
+        Returns:
+            List[Vehicle]: Vehicles with retained events or running at the horizon, in code order
+        """
+        with self._lock:
+            return [vehicle for vehicle in self._vehicles if vehicle is not None]
+
+    @property
+    def enabled(self) -> bool:
+        return self._original is not None
+
+    def enable(self) -> None:
+        """
+        Start recording every engine state change of every Vehicle
+        Until disable() is called, Vehicle.is_running is replaced by a property that also
+        records real transitions, so disabled logging adds no cost.
+        Raises:
+            RuntimeError: If this or another EngineLog is already recording
+        """
+        if EngineLog._active is not None:
+            raise RuntimeError("An EngineLog is already recording")
+        original = vars(Vehicle)['is_running']
+        get_running, set_running, record = original.fget, original.fset, self.record
+
+        def set_running_logged(vehicle: Vehicle, value: bool) -> None:
+            if value != vehicle._is_running:
+                set_running(vehicle, value)
+                record(vehicle, bool(value))
+
+        self._original = original
+        EngineLog._active = self
+        Vehicle.is_running = property(get_running, set_running_logged, doc=original.__doc__)
+
+    def disable(self) -> None:
+        """
+        Restore Vehicle.is_running; recorded events are kept
+        """
+        if self._original is not None:
+            Vehicle.is_running = self._original
+            self._original = None
+            EngineLog._active = None
+
+    @contextmanager
+    def recording(self) -> Iterator["EngineLog"]:
+        """
+        Record engine state changes for the duration of a with block
+        Yields:
+            EngineLog: This log
+        """
+        self.enable()
+        try:
+            yield self
+        finally:
+            self.disable()
+
+    def record(self, vehicle: Vehicle, running: bool, timestamp: Optional[float] = None) -> None:
+        """
+        Append one transition, e.g. when replaying an external log
+        Args:
+            vehicle (Vehicle): The vehicle whose engine state changed
+            running (bool): Its new state
+            timestamp (Optional[float]): Time of the change (default: now, from clock)
+        Raises:
+            ValueError: If timestamp is earlier than the last recorded event
+        """
+        with self._lock:
+            if timestamp is None:
+                # Clocks such as time.time can step back; keep the log ordered regardless
+                timestamp = max(self.clock(), self._last_time)
+            elif timestamp < self._last_time:
+                raise ValueError("Timestamps must not decrease")
+            if not self._times or len(self._times[-1]) == self.chunk_size:
+                self._times.append(array('d'))
+                self._codes.append(array('I'))
+                self._states.append(bytearray())
+                self._lasts.append(timestamp)
+                self._evict(timestamp)
+            # Looked up after eviction, which may have just forgotten this vehicle
+            code = self._index.get(vehicle)
+            if code is None:
+                code = self._add_vehicle(vehicle, running)
+            self._times[-1].append(timestamp)
+            self._codes[-1].append(code)
+            self._states[-1].append(running)
+            self._lasts[-1] = timestamp
+            self._last_time = timestamp
+            times, states = self._history[code]
+            times.append(timestamp)
+            states.append(running)
+
+    def _add_vehicle(self, vehicle: Vehicle, running: bool) -> int:
+        """
+        Give a vehicle a code, reusing the code of a forgotten vehicle if there is one
+        Args:
+            vehicle (Vehicle): The vehicle logged for the first time
+            running (bool): Its first logged state
+        Returns:
+            int: Its code
+        """
+        # Only transitions are logged, so before this one it was in the other state
+        if self._free:
+            code = self._free.pop()
+            self._vehicles[code] = vehicle
+            self._history[code] = (array('d'), bytearray())
+            self._base[code] = not running
+        else:
+            code = len(self._vehicles)
+            self._vehicles.append(vehicle)
+            self._history.append((array('d'), bytearray()))
+            self._base.append(not running)
+        self._index[vehicle] = code
+        return code
+
+    def _evict(self, now: float) -> None:
+        """
+        Drop the oldest chunks beyond the retention limits, folding them into the base states
+        and forgetting vehicles left with no events and a stopped engine
+        Args:
+            now (float): Timestamp of the newest event
+        """
+        max_chunks = max(1, -(-self.max_events // self.chunk_size))
+        while len(self._times) > 1 and (
+                len(self._times) > max_chunks
+                or (self.max_age is not None and self._lasts[0] < now - self.max_age)):
+            base = self._base
+            for code, state in dict(zip(self._codes[0], self._states[0])).items():
+                base[code] = state
+            for code, count in Counter(self._codes[0]).items():
+                times, states = self._history[code]
+                del times[:count], states[:count]
+                if not times and not base[code]:
+                    del self._index[self._vehicles[code]]
+                    self._vehicles[code] = None
+                    self._history[code] = None
+                    self._free.append(code)
+            self.dropped += len(self._times[0])
+            del self._times[0], self._codes[0], self._states[0], self._lasts[0]
+
+    def __len__(self) -> int:
+        return sum(map(len, self._times))
+
+    @property
+    def horizon(self) -> Optional[float]:
+        """
+        Time of the oldest retained event; queries before it see the state at the horizon
+        Returns:
+            Optional[float]: The timestamp, or None if the log is empty
+        """
+        return self._times[0][0] if self._times else None
+
+    def _position(self, t: float) -> Tuple[int, int]:
+        """
+        Locate the first event at or after a time
+        Args:
+            t (float): The time
+        Returns:
+            Tuple[int, int]: Chunk number and index within it; the chunk number equals the
+                number of chunks if every event is earlier
+        """
+        chunk = bisect_left(self._lasts, t)
+        if chunk == len(self._times):
+            return chunk, 0
+        return chunk, bisect_left(self._times[chunk], t)
+
+    def _events(self, start: float, end: float) -> Iterator[Tuple[array, array, bytearray]]:
+        """
+        Iterate over the events in [start, end) as column slices, one per chunk
+        Args:
+            start (float): Start of the window
+            end (float): End of the window
+        Yields:
+            Tuple[array, array, bytearray]: Timestamps, vehicle codes and states
+        """
+        first_chunk, first = self._position(start)
+        last_chunk, last = self._position(end)
+        for chunk in range(first_chunk, min(last_chunk + 1, len(self._times))):
+            lo = first if chunk == first_chunk else 0
+            hi = last if chunk == last_chunk else len(self._times[chunk])
+            if lo < hi:
+                yield self._times[chunk][lo:hi], self._codes[chunk][lo:hi], self._states[chunk][lo:hi]
+
+    def _states_at(self, t: float) -> bytearray:
+        """
+        Get the engine state of every known vehicle just before a time
+        Args:
+            t (float): The time
+        Returns:
+            bytearray: State per vehicle code
+        """
+        latest: Dict[int, int] = {}
+        for _, codes, states in self._events(float('-inf'), t):
+            # Building the dict in C keeps the last state per code
+            latest.update(zip(codes, states))
+        current = bytearray(self._base)
+        for code, state in latest.items():
+            current[code] = state
+        return current
+
+    def running_at(self, t: float) -> List[Vehicle]:
+        """
+        Get the vehicles whose engines were running at a time
+        Args:
+            t (float): The time; events at exactly t are included
+        Returns:
+            List[Vehicle]: The running vehicles, in code order
+        """
+        with self._lock:
+            states = self._states_at(_just_after(t))
+            vehicles = self._vehicles
+            # Forgotten codes have a stopped base state and no events
+            return [vehicles[code] for code, state in enumerate(states) if state]
+
+    def is_running_at(self, vehicle: Vehicle, t: float) -> bool:
+        """
+        Check whether a vehicle's engine was running at a time
+        Args:
+            vehicle (Vehicle): The vehicle
+            t (float): The time; events at exactly t are included
+        Returns:
+            bool: Its state, or False for a vehicle the log does not know
+        """
+        with self._lock:
+            code = self._index.get(vehicle)
+            if code is None:
+                return False
+            times, states = self._history[code]
+            position = bisect_right(times, t)
+            return bool(states[position - 1] if position else self._base[code])
+
+    def fleet_uptime(self, start: float, end: float) -> Dict[Vehicle, float]:
+        """
+        Total running time of every vehicle within a window, in one pass over its events
+        Args:
+            start (float): Start of the window
+            end (float): End of the window
+        Returns:
+            Dict[Vehicle, float]: Seconds each known vehicle was running in the window
+        Raises:
+            ValueError: If end is before start
+        """
+        if end < start:
+            raise ValueError("End of the window cannot be before its start")
+        with self._lock:
+            states = self._states_at(start)
+            uptime = [0.0] * len(states)
+            # Start of the current running period of each vehicle, if it is running
+            since = [start if state else None for state in states]
+            for times, codes, new_states in self._events(start, end):
+                for timestamp, code, state in zip(times, codes, new_states):
+                    if state:
+                        since[code] = timestamp
+                    elif since[code] is not None:
+                        uptime[code] += timestamp - since[code]
+                        since[code] = None
+            for code, began in enumerate(since):
+                if began is not None:
+                    uptime[code] += end - began
+            return {vehicle: seconds for vehicle, seconds in zip(self._vehicles, uptime)
+                    if vehicle is not None}
+
+    def uptime(self, vehicle: Vehicle, start: float, end: float) -> float:
+        """
+        Total running time of one vehicle within a window, from its own events only
+        Args:
+            vehicle (Vehicle): The vehicle
+            start (float): Start of the window
+            end (float): End of the window
+        Returns:
+            float: Seconds it was running in the window, or 0.0 for a vehicle the log does not know
+        Raises:
+            ValueError: If end is before start
+        """
+        if end < start:
+            raise ValueError("End of the window cannot be before its start")
+        with self._lock:
+            code = self._index.get(vehicle)
+            if code is None:
+                return 0.0
+            times, states = self._history[code]
+            first, last = bisect_left(times, start), bisect_left(times, end)
+            running = states[first - 1] if first else self._base[code]
+            since = start if running else None
+            total = 0.0
+            for timestamp, state in zip(times[first:last], states[first:last]):
+                if state:
+                    since = timestamp
+                elif since is not None:
+                    total += timestamp - since
+                    since = None
+            if since is not None:
+                total += end - since
+            return total
+
+    def transitions_per_hour(self, start: float, end: float, bucket_seconds: float = 3600.0) -> List[int]:
+        """
+        Count the transitions of the whole fleet in consecutive buckets of a window
+        Each count is a difference of two binary searches, so the cost does not depend on
+        the number of events.
+        Args:
+            start (float): Start of the first bucket
+            end (float): End of the window; the last bucket may be partial
+            bucket_seconds (float): Length of each bucket (default: 3600.0, one hour)
+        Returns:
+            List[int]: Number of starts and stops per bucket
+        Raises:
+            ValueError: If end is before start or bucket_seconds is not positive
+        """
+        if end < start:
+            raise ValueError("End of the window cannot be before its start")
+        if bucket_seconds <= 0:
+            raise ValueError("Bucket length must be positive")
+        with self._lock:
+            buckets = max(1, math.ceil((end - start) / bucket_seconds))
+            edges = [min(start + k * bucket_seconds, end) for k in range(buckets + 1)]
+            positions = [self._count_before(edge) for edge in edges]
+            return [after - before for before, after in zip(positions, positions[1:])]
+
+    def _count_before(self, t: float) -> int:
+        chunk, index = self._position(t)
+        # Every chunk but the newest is full
+        return chunk * self.chunk_size + index if chunk < len(self._times) else len(self)
+
+    def stats(self) -> Dict[str, float]:
+        """
+        Get log counters
+        Returns:
+            Dict[str, float]: Retained and dropped events, known vehicles, chunks, approximate
+                bytes used by the columns and the horizon
+        """
+        with self._lock:
+            events = len(self)
+            return {"events": events, "dropped": self.dropped, "vehicles": len(self._index),
+                    "chunks": len(self._times), "bytes": events * 22 + len(self._base),
+                    "horizon": self.horizon}
+
+
+def _just_after(t: float) -> float:
+    # Smallest float above t, so that a window ending there includes events at exactly t
+    return math.nextafter(t, math.inf)
+
+
+# Log shared by callers that do not need their own
+ENGINE_LOG = EngineLog()
@@ -0,0 +1,1141 @@
+# File handler class hierarchy: caching, streaming, compression, bulk copy and batched writes
+from __future__ import annotations
+
+from abc import ABC, abstractmethod
+import bz2
+from collections import OrderedDict
+from contextlib import contextmanager
+import errno
+import gzip
+import lzma
+import mmap
+import os
+import stat
+import sys
+import threading
+import time
+import zlib
+
+TYPE_CHECKING = False
+if TYPE_CHECKING:
+    from typing import IO, Any, Callable, Dict, Iterable, Iterator, List, Optional, Tuple
+
+try:
+    from compression import zstd  # Standard library from Python 3.14
+except ImportError:
+    zstd = None
+
+
+# Thread-safe LRU cache of file contents with a byte budget
+class ReadCache:
+    def __init__(self, max_bytes: int = 64 * 1024 * 1024):
+        """
+        Initialize a ReadCache
+        Args:
+            max_bytes (int): Total size of cached contents before evicting (default: 64 MiB)
+        Raises:
+            ValueError: If max_bytes is negative
+        """
+        if max_bytes < 0:
+            raise ValueError("Cache size cannot be negative")
+        self.max_bytes = max_bytes
+        self.current_bytes = 0
+        self.hits = 0
+        self.misses = 0
+        self.evictions = 0
+        # Maps (path, handler class) to (mtime_ns, size, content, cost); the class is part of
+        # the key because handlers decode the same file differently (e.g. gzip vs raw bytes)
+        self._entries: "OrderedDict[Tuple[str, type], Tuple[int, int, Any, int]]" = OrderedDict()
+        self._lock = threading.Lock()
+
+    def get(self, handler: "FileHandler", loader: Callable[[], Any]) -> Any:
+        """
+        Return the cached content for a handler's file, loading it if missing or stale
+        Args:
+            handler (FileHandler): Handler whose file is read
+            loader (Callable[[], Any]): Function reading the file without the cache
+        Returns:
+            Any: The content of the file
+        Raises:
+            FileNotFoundError: If the file does not exist
+            IOError: If there's an error reading the file
+        """
+        key = (os.path.abspath(handler.filename), type(handler))
+        try:
+            file_stat = os.stat(key[0])
+        except OSError:
+            # Let the loader raise the handler's usual error
+            self.invalidate(handler.filename)
+            return loader()
+
+        with self._lock:
+            entry = self._entries.get(key)
+            if entry is not None and entry[0] == file_stat.st_mtime_ns and entry[1] == file_stat.st_size:
+                self._entries.move_to_end(key)
+                self.hits += 1
+                return entry[2]
+            self.misses += 1
+
+        # Stat was taken before loading, so a concurrent change makes the entry stale, never wrong
+        content = loader()
+        cost = sys.getsizeof(content)
+        with self._lock:
+            self._discard(key)
+            if cost <= self.max_bytes:
+                self._entries[key] = (file_stat.st_mtime_ns, file_stat.st_size, content, cost)
+                self.current_bytes += cost
+                while self.current_bytes > self.max_bytes:
+                    _, evicted = self._entries.popitem(last=False)
+                    self.current_bytes -= evicted[3]
+                    self.evictions += 1
+        return content
+
+    def invalidate(self, filename: str) -> None:
+        """
+        Drop any cached content for a file
+        Args:
+            filename (str): The name of the file
+        """
+        path = os.path.abspath(filename)
+        with self._lock:
+            for key in [key for key in self._entries if key[0] == path]:
+                self._discard(key)
+
+    def clear(self) -> None:
+        """
+        Drop all cached contents, keeping the counters
+        """
+        with self._lock:
+            self._entries.clear()
+            self.current_bytes = 0
+
+    def _discard(self, key: Tuple[str, type]) -> None:
+        entry = self._entries.pop(key, None)
+        if entry is not None:
+            self.current_bytes -= entry[3]
+
+    def stats(self) -> Dict[str, int]:
+        """
+        Get cache counters
+        Returns:
+            Dict[str, int]: Hits, misses, evictions, entries and bytes in use
+        """
+        with self._lock:
+            return {"hits": self.hits, "misses": self.misses, "evictions": self.evictions,
+                    "entries": len(self._entries), "bytes": self.current_bytes}
+
+
+# Abstract base class for file handlers
+class FileHandler(ABC):
+    # Per-subclass settings used by the streaming methods
+    file_kind = "Generic"
+    binary = False
+    content_type: type = object
+    content_description = "an object"
+    default_chunk_size = 64 * 1024
+
+    def __init__(self, filename: str, cache: Optional[ReadCache] = None):
+        """
+        Initialize a FileHandler with a filename
+        Args:
+            filename (str): The name of the file to handle
+            cache (Optional[ReadCache]): Cache shared by handlers to serve repeated reads
+        Raises:
+            ValueError: If filename is empty
+        """
+        if not filename.strip():
+            raise ValueError("Filename cannot be empty")
+        self.filename = filename
+        self.cache = cache
+
+    @abstractmethod
+    def read(self) -> Any:
+        """
+        Abstract method to read content from the file
+        Returns:
+            Any: The content read from the file
+        """
+        pass
+
+    @abstractmethod
+    def write(self, content: Any) -> None:
+        """
+        Abstract method to write content to the file
+        Args:
+            content (Any): The content to write to the file
+        """
+        pass
+
+    def get_file_info(self) -> str:
+        """
+        Get information about the file
+        Returns:
+            str: Description of the file and its handler
+        """
+        return f"{self.__class__.__name__} handling file: {self.filename}"
+
+    def _read_through_cache(self, loader: Callable[[], Any]) -> Any:
+        """
+        Read via the cache when one is configured
+        Args:
+            loader (Callable[[], Any]): Function reading the file without the cache
+        Returns:
+            Any: The content of the file
+        """
+        if self.cache is None:
+            return loader()
+        return self.cache.get(self, loader)
+
+    def _invalidate_cache(self) -> None:
+        """
+        Drop this file from the cache after it is written
+        """
+        if self.cache is not None:
+            self.cache.invalidate(self.filename)
+
+    def _open(self, mode: str) -> IO:
+        """
+        Open the handled file in text or binary mode as appropriate
+        Args:
+            mode (str): 'r', 'w' or 'a'
+        Returns:
+            IO: The opened file object
+        """
+        if self.binary:
+            return open(self.filename, mode + 'b')
+        return open(self.filename, mode, encoding='utf-8')
+
+    def _stream(self, read_items) -> Iterator[Any]:
+        """
+        Yield items produced from the open file, wrapping errors like read()
+        Args:
+            read_items (Callable): Function taking the open file and returning an iterator
+        Yields:
+            Any: Items produced by read_items
+        Raises:
+            FileNotFoundError: If the file does not exist
+            IOError: If there's an error reading the file
+        """
+        try:
+            with self._open('r') as file:
+                yield from read_items(file)
+        except FileNotFoundError:
+            raise FileNotFoundError(f"{self.file_kind} file {self.filename} not found")
+        except IOError as e:
+            raise IOError(f"Error reading {self.file_kind.lower()} file {self.filename}: {str(e)}")
+
+    def iter_chunks(self, size: int = 0) -> Iterator[Any]:
+        """
+        Read the file lazily in chunks of at most size characters or bytes
+        Args:
+            size (int): Chunk size (default: default_chunk_size)
+        Yields:
+            Any: Successive chunks of the file
+        Raises:
+            ValueError: If size is negative
+            FileNotFoundError: If the file does not exist
+            IOError: If there's an error reading the file
+        """
+        if size < 0:
+            raise ValueError("Chunk size cannot be negative")
+        size = size or self.default_chunk_size
+        return self._stream(lambda file: iter(lambda: file.read(size), file.read(0)))
+
+    def iter_lines(self) -> Iterator[Any]:
+        """
+        Read the file lazily one line at a time
+        Yields:
+            Any: Successive lines of the file, including line endings
+        Raises:
+            FileNotFoundError: If the file does not exist
+            IOError: If there's an error reading the file
+        """
+        return self._stream(iter)
+
+    def write_stream(self, chunks: Iterable[Any], append: bool = False) -> int:
+        """
+        Write an iterable of chunks to the file without materializing it
+        If a chunk has the wrong type or producing or writing one fails, the partly written file
+        is removed, or an appended one is truncated back to its previous length.
+        Args:
+            chunks (Iterable[Any]): Chunks of content to write
+            append (bool): Append to the file instead of truncating it
+        Returns:
+            int: Number of characters or bytes written
+        Raises:
+            TypeError: If a chunk has the wrong content type
+            IOError: If there's an error writing to the file
+        """
+        written = 0
+        self._invalidate_cache()
+        original_size = None
+        if append:
+            try:
+                original_size = os.path.getsize(self.filename)
+            except FileNotFoundError:
+                pass
+        file = None
+        try:
+            with self._open('a' if append else 'w') as file:
+                for chunk in chunks:
+                    if not isinstance(chunk, self.content_type):
+                        raise TypeError(f"Content must be {self.content_description} "
+                                        f"for {self.__class__.__name__}")
+                    written += file.write(chunk)
+        except Exception as e:
+            if file is not None:
+                _undo_write(self.filename, original_size)
+                self._invalidate_cache()
+            if isinstance(e, IOError):
+                raise IOError(f"Error writing to {self.file_kind.lower()} file {self.filename}: {str(e)}")
+            raise
+        return written
+
+
+# Concrete class for handling text files
+class TextFileHandler(FileHandler):
+    file_kind = "Text"
+    content_type = str
+    content_description = "a string"
+
+    def read(self) -> str:
+        """
+        Read content from a text file, through the cache if one is configured
+        Returns:
+            str: The content of the text file
+        Raises:
+            FileNotFoundError: If the file does not exist
+            IOError: If there's an error reading the file
+        """
+        return self._read_through_cache(self._read_file)
+
+    def _read_file(self) -> str:
+        """
+        Read content from a text file, bypassing the cache
+        Returns:
+            str: The content of the text file
+        Raises:
+            FileNotFoundError: If the file does not exist
+            IOError: If there's an error reading the file
+        """
+        try:
+            with open(self.filename, 'r', encoding='utf-8') as file:
+                return file.read()
+        except FileNotFoundError:
+            raise FileNotFoundError(f"Text file {self.filename} not found")
+        except IOError as e:
+            raise IOError(f"Error reading text file {self.filename}: {str(e)}")
+
+    def write(self, content: str) -> None:
+        """
+        Write content to a text file
+        Args:
+            content (str): The text content to write
+        Raises:
+            TypeError: If content is not a string
+            IOError: If there's an error writing to the file
+        """
+        if not isinstance(content, str):
+            raise TypeError("Content must be a string for TextFileHandler")
+        self._invalidate_cache()
+        try:
+            with open(self.filename, 'w', encoding='utf-8') as file:
+                file.write(content)
+        except IOError as e:
+            raise IOError(f"Error writing to text file {self.filename}: {str(e)}")
+
+    def batch_writer(self, **options: Any) -> "BatchTextWriter":
+        """
+        Open a buffered writer that keeps this file open across many writes
+        Args:
+            **options (Any): Options passed to BatchTextWriter
+        Returns:
+            BatchTextWriter: The writer, usable as a context manager
+        """
+        return BatchTextWriter(self, **options)
+
+
+# Concrete class for handling binary files
+class BinaryFileHandler(FileHandler):
+    file_kind = "Binary"
+    binary = True
+    content_type = bytes
+    content_description = "bytes"
+
+    def read(self) -> bytes:
+        """
+        Read content from a binary file, through the cache if one is configured
+        Returns:
+            bytes: The content of the binary file
+        Raises:
+            FileNotFoundError: If the file does not exist
+            IOError: If there's an error reading the file
+        """
+        return self._read_through_cache(self._read_file)
+
+    def _read_file(self) -> bytes:
+        """
+        Read content from a binary file, bypassing the cache
+        Returns:
+            bytes: The content of the binary file
+        Raises:
+            FileNotFoundError: If the file does not exist
+            IOError: If there's an error reading the file
+        """
+        try:
+            with open(self.filename, 'rb') as file:
+                return file.read()
+        except FileNotFoundError:
+            raise FileNotFoundError(f"Binary file {self.filename} not found")
+        except IOError as e:
+            raise IOError(f"Error reading binary file {self.filename}: {str(e)}")
+
+    @contextmanager
+    def read_mapped(self) -> Iterator[memoryview]:
+        """
+        Memory-map the binary file for zero-copy, random-access reads
+        Slices taken from the view must be released before the block exits.
+        Yields:
+            memoryview: Read-only view over the file contents
+        Raises:
+            FileNotFoundError: If the file does not exist
+            IOError: If there's an error mapping the file
+        """
+        try:
+            file = open(self.filename, 'rb')
+        except FileNotFoundError:
+            raise FileNotFoundError(f"Binary file {self.filename} not found")
+        except IOError as e:
+            raise IOError(f"Error reading binary file {self.filename}: {str(e)}")
+
+        with file:
+            if os.fstat(file.fileno()).st_size == 0:
+                # Empty files cannot be mapped
+                yield memoryview(b"")
+                return
+            try:
+                mapped = mmap.mmap(file.fileno(), 0, access=mmap.ACCESS_READ)
+            except (OSError, ValueError) as e:
+                raise IOError(f"Error reading binary file {self.filename}: {str(e)}")
+            view = memoryview(mapped)
+            try:
+                yield view
+            finally:
+                view.release()
+                mapped.close()
+
+    def write(self, content: bytes) -> None:
+        """
+        Write content to a binary file
+        Args:
+            content (bytes): The binary content to write
+        Raises:
+            TypeError: If content is not bytes
+            IOError: If there's an error writing to the file
+        """
+        if not isinstance(content, bytes):
+            raise TypeError("Content must be bytes for BinaryFileHandler")
+        self._invalidate_cache()
+        try:
+            with open(self.filename, 'wb') as file:
+                file.write(content)
+        except IOError as e:
+            raise IOError(f"Error writing to binary file {self.filename}: {str(e)}")
+
+
+# Abstract base class for handlers that compress the file transparently
+class CompressedFileHandler(FileHandler):
+    binary = True
+    content_type = bytes
+    content_description = "bytes"
+    # Exceptions raised by the codec for corrupt or truncated data
+    codec_errors: tuple = (EOFError,)
+
+    def __init__(self, filename: str, cache: Optional[ReadCache] = None, level: Optional[int] = None):
+        """
+        Initialize a CompressedFileHandler
+        Args:
+            filename (str): The name of the file to handle
+            cache (Optional[ReadCache]): Cache shared by handlers to serve repeated reads
+            level (Optional[int]): Compression level (default: the codec's default)
+        Raises:
+            ValueError: If filename is empty
+        """
+        super().__init__(filename, cache)
+        self.level = level
+
+    @abstractmethod
+    def _open_codec(self, mode: str) -> IO:
+        """
+        Open the file through the codec
+        Args:
+            mode (str): 'rb', 'wb' or 'ab'
+        Returns:
+            IO: Binary file object that compresses on write and decompresses on read
+        """
+        pass
+
+    def _open(self, mode: str) -> IO:
+        """
+        Open the handled file through the codec, so streaming reads and writes
+        compress and decompress one chunk at a time
+        Args:
+            mode (str): 'r', 'w' or 'a'
+        Returns:
+            IO: The opened file object
+        """
+        return self._open_codec(mode + 'b')
+
+    def _stream(self, read_items) -> Iterator[Any]:
+        """
+        Yield items from the decompressed file, reporting corrupt data as an IOError
+        Args:
+            read_items (Callable): Function taking the open file and returning an iterator
+        Yields:
+            Any: Items produced by read_items
+        Raises:
+            FileNotFoundError: If the file does not exist
+            IOError: If there's an error reading or decompressing the file
+        """
+        try:
+            yield from super()._stream(read_items)
+        except self.codec_errors as e:
+            raise IOError(f"Error reading {self.file_kind.lower()} file {self.filename}: {str(e)}")
+
+    def read(self) -> bytes:
+        """
+        Read and decompress the file, through the cache if one is configured
+        Use iter_chunks() or iter_lines() to avoid holding the decompressed content in memory.
+        Returns:
+            bytes: The decompressed content
+        Raises:
+            FileNotFoundError: If the file does not exist
+            IOError: If there's an error reading or decompressing the file
+        """
+        return self._read_through_cache(lambda: b"".join(self.iter_chunks()))
+
+    def write(self, content: bytes) -> None:
+        """
+        Compress content and write it to the file
+        Args:
+            content (bytes): The binary content to write
+        Raises:
+            TypeError: If content is not bytes
+            IOError: If there's an error writing to the file
+        """
+        if not isinstance(content, bytes):
+            raise TypeError(f"Content must be bytes for {self.__class__.__name__}")
+        self.write_stream((content,))
+
+
+# Concrete class for gzip-compressed files
+class GzipFileHandler(CompressedFileHandler):
+    file_kind = "Gzip"
+    codec_errors = (EOFError, zlib.error)
+
+    def _open_codec(self, mode: str) -> IO:
+        return gzip.open(self.filename, mode, compresslevel=9 if self.level is None else self.level)
+
+
+# Concrete class for bzip2-compressed files
+class Bz2FileHandler(CompressedFileHandler):
+    file_kind = "Bzip2"
+
+    def _open_codec(self, mode: str) -> IO:
+        return bz2.open(self.filename, mode, compresslevel=9 if self.level is None else self.level)
+
+
+# Concrete class for xz/lzma-compressed files
+class LzmaFileHandler(CompressedFileHandler):
+    file_kind = "LZMA"
+    codec_errors = (EOFError, lzma.LZMAError)
+
+    def _open_codec(self, mode: str) -> IO:
+        # Presets only apply when compressing
+        preset = self.level if 'r' not in mode else None
+        return lzma.open(self.filename, mode, preset=preset)
+
+
+# Concrete class for Zstandard-compressed files, available when the standard library has zstd
+class ZstdFileHandler(CompressedFileHandler):
+    file_kind = "Zstandard"
+    codec_errors = (EOFError, zstd.ZstdError) if zstd is not None else (EOFError,)
+
+    def _open_codec(self, mode: str) -> IO:
+        if zstd is None:
+            raise IOError("Zstandard support requires Python 3.14 or later")
+        return zstd.open(self.filename, mode, level=self.level if 'r' not in mode else None)
+
+
+# Chooses a handler class for a file from its magic bytes or its extension
+class HandlerRegistry:
+    def __init__(self, default: type = BinaryFileHandler):
+        """
+        Initialize an empty HandlerRegistry
+        Args:
+            default (type): Handler class used when nothing matches
+        """
+        self.default = default
+        self._by_extension: Dict[str, type] = {}
+        self._by_magic: List[Tuple[bytes, type]] = []
+        self._magic_length = 0
+
+    def register(self, handler_class: type, extensions: Iterable[str] = (), magic: Optional[bytes] = None) -> None:
+        """
+        Register a handler class for file extensions and/or a magic byte prefix
+        Args:
+            handler_class (type): FileHandler subclass to register
+            extensions (Iterable[str]): Extensions such as ".gz" or ".tar.gz", matched case-insensitively
+            magic (Optional[bytes]): Bytes every file of this kind starts with
+        Raises:
+            TypeError: If handler_class is not a FileHandler subclass
+            ValueError: If magic is empty
+        """
+        if not (isinstance(handler_class, type) and issubclass(handler_class, FileHandler)):
+            raise TypeError("Handler class must be a FileHandler subclass")
+        for extension in extensions:
+            self._by_extension[extension.lower()] = handler_class
+        if magic is not None:
+            if not magic:
+                raise ValueError("Magic bytes cannot be empty")
+            self._by_magic.append((magic, handler_class))
+            # Longest prefixes first so a more specific signature wins
+            self._by_magic.sort(key=lambda entry: len(entry[0]), reverse=True)
+            self._magic_length = max(self._magic_length, len(magic))
+
+    def handler_class_for(self, filename: str) -> type:
+        """
+        Find the handler class for a file
+        Existing files are identified by their first bytes; otherwise, or when no signature
+        matches, the longest registered extension that the filename ends with decides.
+        Args:
+            filename (str): The name of the file
+        Returns:
+            type: The handler class
+        """
+        if self._by_magic:
+            try:
+                with open(filename, 'rb') as file:
+                    head = file.read(self._magic_length)
+            except OSError:
+                head = b""
+            for magic, handler_class in self._by_magic:
+                if head.startswith(magic):
+                    return handler_class
+        name = os.path.basename(filename).lower()
+        position = name.find('.')
+        while position != -1:
+            handler_class = self._by_extension.get(name[position:])
+            if handler_class is not None:
+                return handler_class
+            position = name.find('.', position + 1)
+        return self.default
+
+    def open(self, filename: str, **options: Any) -> FileHandler:
+        """
+        Create the appropriate handler for a file
+        Args:
+            filename (str): The name of the file
+            **options (Any): Options passed to the handler, such as cache
+        Returns:
+            FileHandler: The handler
+        Raises:
+            ValueError: If filename is empty
+        """
+        return self.handler_class_for(filename)(filename, **options)
+
+
+HANDLER_REGISTRY = HandlerRegistry()
+HANDLER_REGISTRY.register(TextFileHandler, ('.txt', '.csv', '.log', '.md', '.json'))
+HANDLER_REGISTRY.register(BinaryFileHandler, ('.bin', '.dat'))
+HANDLER_REGISTRY.register(GzipFileHandler, ('.gz', '.tgz'), b"\x1f\x8b")
+HANDLER_REGISTRY.register(Bz2FileHandler, ('.bz2', '.tbz2'), b"BZh")
+HANDLER_REGISTRY.register(LzmaFileHandler, ('.xz', '.lzma', '.txz'), b"\xfd7zXZ\x00")
+if zstd is not None:
+    HANDLER_REGISTRY.register(ZstdFileHandler, ('.zst', '.tzst'), b"\x28\xb5\x2f\xfd")
+
+
+def open_handler(filename: str, **options: Any) -> FileHandler:
+    """
+    Create the appropriate handler for a file using the default registry
+    Args:
+        filename (str): The name of the file
+        **options (Any): Options passed to the handler, such as cache
+    Returns:
+        FileHandler: The handler
+    """
+    return HANDLER_REGISTRY.open(filename, **options)
+
+
+# Counting limit on the bytes buffered by all copy workers together
+class ByteBudget:
+    def __init__(self, limit: int):
+        """
+        Initialize a ByteBudget
+        Args:
+            limit (int): Maximum number of bytes held at once
+        Raises:
+            ValueError: If limit is not positive
+        """
+        if limit <= 0:
+            raise ValueError("Byte budget must be positive")
+        self.limit = limit
+        self._used = 0
+        self._condition = threading.Condition()
+
+    def acquire(self, size: int) -> int:
+        """
+        Block until size bytes fit in the budget, then reserve them
+        A request larger than the whole budget waits until nothing else is held.
+        Args:
+            size (int): Number of bytes to reserve
+        Returns:
+            int: Number of bytes reserved, to pass to release()
+        """
+        with self._condition:
+            while self._used and self._used + size > self.limit:
+                self._condition.wait()
+            self._used += size
+        return size
+
+    def release(self, size: int) -> None:
+        """
+        Return bytes reserved by acquire()
+        Args:
+            size (int): Number of bytes to release
+        """
+        with self._condition:
+            self._used -= size
+            self._condition.notify_all()
+
+    @property
+    def used(self) -> int:
+        return self._used
+
+
+# Outcome of one copy job
+class CopyResult:
+    __slots__ = ('source', 'destination', 'size', 'seconds', 'method', 'error')
+
+    def __init__(self, source: Any, destination: Any, size: int = 0, seconds: float = 0.0,
+                 method: str = "", error: Optional[BaseException] = None):
+        """
+        Initialize a CopyResult
+        Args:
+            source (Any): Handler the job read from, or the filename if it could not be resolved
+            destination (Any): Handler the job wrote to, or the filename if it could not be resolved
+            size (int): Bytes or characters written
+            seconds (float): Wall-clock duration of the job
+            method (str): 'copy_file_range', 'sendfile', 'read_write' or 'stream'
+            error (Optional[BaseException]): Exception that stopped the job, if any
+        """
+        self.source = source
+        self.destination = destination
+        self.size = size
+        self.seconds = seconds
+        self.method = method
+        self.error = error
+
+    @property
+    def ok(self) -> bool:
+        return self.error is None
+
+    @property
+    def throughput(self) -> float:
+        """
+        Bytes or characters written per second
+        Returns:
+            float: The job's throughput (0.0 for instantaneous jobs)
+        """
+        return self.size / self.seconds if self.seconds > 0 else 0.0
+
+    def get_summary(self) -> str:
+        """
+        Describe the job's outcome
+        Returns:
+            str: One-line summary of the job
+        """
+        route = f"{getattr(self.source, 'filename', self.source)} -> " \
+                f"{getattr(self.destination, 'filename', self.destination)}"
+        if self.error is not None:
+            return f"{route}: failed ({self.error})"
+        return (f"{route}: {self.size} written in {self.seconds * 1000:.2f} ms "
+                f"({self.throughput / 1024 ** 2:.1f} MB/s, {self.method})")
+
+
+# Errors meaning a zero-copy system call is unavailable for this pair of files
+ZERO_COPY_FALLBACK_ERRORS = {errno.ENOSYS, errno.EXDEV, errno.EINVAL, errno.EOPNOTSUPP,
+                             errno.ENOTSUP, errno.ENOTSOCK, errno.EPERM, errno.EBADF}
+ZERO_COPY_BLOCK = 64 * 1024 * 1024
+
+
+# Thread pool copying and transforming many files at once
+class BulkCopyEngine:
+    def __init__(self, max_workers: int = 8, max_in_flight: int = 64 * 1024 * 1024, chunk_size: int = 1024 * 1024):
+        """
+        Initialize a BulkCopyEngine
+        Args:
+            max_workers (int): Number of jobs run concurrently
+            max_in_flight (int): Maximum bytes buffered in Python by all jobs together
+            chunk_size (int): Buffer size for copies that cannot use zero-copy system calls
+        Raises:
+            ValueError: If a limit is not positive
+        """
+        if max_workers <= 0 or chunk_size <= 0:
+            raise ValueError("max_workers and chunk_size must be positive")
+        self.max_workers = max_workers
+        self.chunk_size = chunk_size
+        self.budget = ByteBudget(max_in_flight)
+
+    def run(self, jobs: Iterable[Tuple[Any, Any, Optional[Callable]]]) -> List[CopyResult]:
+        """
+        Run copy jobs on a thread pool
+        Each job is (source, destination, transform). Source and destination are handlers or
+        filenames, which are resolved with open_handler(). Without a transform, plain files are
+        copied by the kernel and compressed files are recompressed chunk by chunk; with one,
+        transform(source_handler) returns the chunks to write, e.g. a filtered iter_lines().
+        A failed job does not stop the others.
+        Args:
+            jobs (Iterable[Tuple[Any, Any, Optional[Callable]]]): The jobs to run
+        Returns:
+            List[CopyResult]: Results in the order of jobs
+        """
+        from concurrent.futures import ThreadPoolExecutor
+
+        jobs = list(jobs)
+        with ThreadPoolExecutor(max_workers=self.max_workers, thread_name_prefix="BulkCopyEngine") as executor:
+            return list(executor.map(lambda job: self._run_job(*job), jobs))
+
+    @staticmethod
+    def _resolve(handler: Any) -> FileHandler:
+        return handler if isinstance(handler, FileHandler) else open_handler(handler)
+
+    def _run_job(self, source: Any, destination: Any, transform: Optional[Callable]) -> CopyResult:
+        """
+        Run one job, capturing its timing and any error, including unresolvable handlers
+        A destination that was partially written when the job failed is removed by the write
+        path that opened it; one the job never opened is left untouched.
+        Returns:
+            CopyResult: The job's outcome
+        """
+        result = CopyResult(source, destination)
+        start = time.perf_counter()
+        try:
+            result.source = source = self._resolve(source)
+            result.destination = destination = self._resolve(destination)
+            if not os.path.exists(source.filename):
+                raise FileNotFoundError(f"{source.file_kind} file {source.filename} not found")
+            if os.path.exists(destination.filename) and os.path.samefile(source.filename, destination.filename):
+                raise ValueError(f"Cannot copy {source.filename} onto itself")
+            source_compressed = isinstance(source, CompressedFileHandler)
+            destination_compressed = isinstance(destination, CompressedFileHandler)
+            if transform is None and not source_compressed and not destination_compressed:
+                result.size, result.method = self._copy_raw(source, destination)
+            elif transform is None:
+                # Untransformed copies move the decoded bytes, whatever the handlers' content types
+                reader = source if source_compressed else BinaryFileHandler(source.filename)
+                writer = destination
+                if not destination_compressed:
+                    destination._invalidate_cache()
+                    writer = BinaryFileHandler(destination.filename)
+                result.size = writer.write_stream(self._metered(reader.iter_chunks(self.chunk_size)))
+                result.method = "stream"
+            else:
+                result.size = destination.write_stream(self._metered(transform(source)))
+                result.method = "stream"
+        except Exception as e:
+            result.error = e
+        result.seconds = time.perf_counter() - start
+        return result
+
+    def _metered(self, chunks: Iterable[Any]) -> Iterator[Any]:
+        """
+        Reserve budget for each chunk before it is produced and hold it until it has been written
+        Args:
+            chunks (Iterable[Any]): Chunks produced for the destination
+        Yields:
+            Any: The same chunks
+        """
+        iterator = iter(chunks)
+        while True:
+            reserved = self.budget.acquire(self.chunk_size)
+            try:
+                try:
+                    chunk = next(iterator)
+                except StopIteration:
+                    return
+                if len(chunk) > reserved:
+                    # A transform produced an oversized chunk; account for all of it
+                    self.budget.release(reserved)
+                    reserved = self.budget.acquire(len(chunk))
+                yield chunk
+            finally:
+                self.budget.release(reserved)
+
+    def _copy_raw(self, source: FileHandler, destination: FileHandler) -> Tuple[int, str]:
+        """
+        Copy the file's bytes unchanged, preferring zero-copy system calls
+        Returns:
+            Tuple[int, str]: Bytes copied and the method that finished the copy
+        Raises:
+            FileNotFoundError: If the source file does not exist
+            IOError: If there's an error copying the file
+        """
+        destination._invalidate_cache()
+        try:
+            source_file = open(source.filename, 'rb')
+        except FileNotFoundError:
+            raise FileNotFoundError(f"{source.file_kind} file {source.filename} not found")
+        destination_file = None
+        try:
+            with source_file, open(destination.filename, 'wb') as destination_file:
+                return self._copy_descriptors(source_file.fileno(), destination_file.fileno())
+        except Exception as e:
+            if destination_file is not None:
+                _undo_write(destination.filename)
+            if isinstance(e, IOError):
+                raise IOError(f"Error copying {source.filename} to {destination.filename}: {str(e)}")
+            raise
+
+    def _copy_descriptors(self, source_fd: int, destination_fd: int) -> Tuple[int, str]:
+        """
+        Copy from source_fd to destination_fd with copy_file_range, then sendfile,
+        then a buffered read/write loop, falling back when a call is unsupported
+        Returns:
+            Tuple[int, str]: Bytes copied and the method that finished the copy
+        """
+        copied = 0
+        if hasattr(os, 'copy_file_range'):
+            try:
+                while True:
+                    sent = os.copy_file_range(source_fd, destination_fd, ZERO_COPY_BLOCK, copied, copied)
+                    if sent == 0:
+                        return copied, "copy_file_range"
+                    copied += sent
+            except OSError as e:
+                if e.errno not in ZERO_COPY_FALLBACK_ERRORS:
+                    raise
+        # Explicit offsets above left the file positions untouched
+        os.lseek(destination_fd, copied, os.SEEK_SET)
+        if hasattr(os, 'sendfile'):
+            try:
+                while True:
+                    sent = os.sendfile(destination_fd, source_fd, copied, ZERO_COPY_BLOCK)
+                    if sent == 0:
+                        return copied, "sendfile"
+                    copied += sent
+            except OSError as e:
+                if e.errno not in ZERO_COPY_FALLBACK_ERRORS:
+                    raise
+        os.lseek(source_fd, copied, os.SEEK_SET)
+        os.lseek(destination_fd, copied, os.SEEK_SET)
+        while True:
+            reserved = self.budget.acquire(self.chunk_size)
+            try:
+                block = os.read(source_fd, self.chunk_size)
+                if not block:
+                    return copied, "read_write"
+                view = memoryview(block)
+                while view:
+                    view = view[os.write(destination_fd, view):]
+                copied += len(block)
+            finally:
+                self.budget.release(reserved)
+
+
+def bulk_copy(jobs: Iterable[Tuple[Any, Any, Optional[Callable]]], **options: Any) -> List[CopyResult]:
+    """
+    Run copy jobs with a BulkCopyEngine
+    Args:
+        jobs (Iterable[Tuple[Any, Any, Optional[Callable]]]): (source, destination, transform) jobs
+        **options (Any): Options passed to BulkCopyEngine
+    Returns:
+        List[CopyResult]: Results in the order of jobs
+    """
+    return BulkCopyEngine(**options).run(jobs)
+
+
+def _undo_write(filename: str, original_size: Optional[int] = None) -> None:
+    """
+    Discard a failed write, ignoring errors since the write's own error is being reported
+    Args:
+        filename (str): Path of the file that was being written
+        original_size (Optional[int]): Length to truncate an appended file back to, or None to
+            remove the file
+    """
+    try:
+        if original_size is None:
+            os.remove(filename)
+        else:
+            os.truncate(filename, original_size)
+    except OSError:
+        pass
+
+
+def _create_temporary(filename: str) -> Tuple[int, str]:
+    """
+    Create an empty temporary file beside a file, to be renamed over it
+    The file is created with mode 0o666 like open() does, so the kernel applies the umask
+    without it having to be read, which is only possible by changing it for the whole process.
+    Args:
+        filename (str): Path of the file the temporary file will replace
+    Returns:
+        Tuple[int, str]: Descriptor opened for writing, and the temporary file's path
+    """
+    directory, name = os.path.split(os.path.abspath(filename))
+    while True:
+        temp_name = os.path.join(directory, f".tmp-{os.urandom(6).hex()}{name}")
+        try:
+            return os.open(temp_name, os.O_WRONLY | os.O_CREAT | os.O_EXCL, 0o666), temp_name
+        except FileExistsError:
+            continue
+
+
+# Buffered writer that keeps a text file open across many writes
+class BatchTextWriter:
+    # Supported fsync policies
+    FSYNC_NEVER = "never"
+    FSYNC_ON_FLUSH = "flush"
+    FSYNC_ON_CLOSE = "close"
+
+    def __init__(self, handler: TextFileHandler, atomic: bool = False, buffer_size: int = 64 * 1024,
+                 flush_interval: float = 1.0, fsync: str = FSYNC_ON_CLOSE):
+        """
+        Initialize a BatchTextWriter for the file of a TextFileHandler
+        Args:
+            handler (TextFileHandler): Handler naming the target file
+            atomic (bool): Write to a temporary file and rename it over the target on close
+                (default: False, which appends to the target)
+            buffer_size (int): Characters buffered before flushing (default: 64 KiB)
+            flush_interval (float): Seconds after which a write triggers a flush (default: 1.0)
+            fsync (str): When to fsync: "never", "flush" or "close" (default: "close")
+        Raises:
+            ValueError: If buffer_size or flush_interval is negative or fsync is unknown
+            IOError: If the file cannot be opened
+        """
+        if buffer_size < 0 or flush_interval < 0:
+            raise ValueError("Buffer size and flush interval cannot be negative")
+        if fsync not in (self.FSYNC_NEVER, self.FSYNC_ON_FLUSH, self.FSYNC_ON_CLOSE):
+            raise ValueError(f"Unknown fsync policy: {fsync}")
+        self.handler = handler
+        self.atomic = atomic
+        self.buffer_size = buffer_size
+        self.flush_interval = flush_interval
+        self.fsync = fsync
+        self._buffer: List[str] = []
+        self._buffered = 0
+        self._last_flush = time.monotonic()
+        self._temp_name: Optional[str] = None
+        try:
+            if atomic:
+                fd, self._temp_name = _create_temporary(handler.filename)
+                self._file = open(fd, 'w', encoding='utf-8')
+                try:
+                    # The rename keeps the temporary file's mode, so match the file it replaces
+                    os.chmod(self._temp_name, stat.S_IMODE(os.stat(handler.filename).st_mode))
+                except FileNotFoundError:
+                    pass
+            else:
+                self._file = open(handler.filename, 'a', encoding='utf-8')
+        except IOError as e:
+            if self._temp_name is not None:
+                _undo_write(self._temp_name)
+            raise IOError(f"Error writing to text file {handler.filename}: {str(e)}")
+
+    @property
+    def closed(self) -> bool:
+        """
+        Whether the writer has been closed or discarded
+        Returns:
+            bool: True once the underlying file is closed
+        """
+        return self._file.closed
+
+    def write(self, content: str) -> None:
+        """
+        Buffer content, flushing once the size or time threshold is reached
+        Args:
+            content (str): The text content to write
+        Raises:
+            TypeError: If content is not a string
+            ValueError: If the writer is closed
+            IOError: If there's an error writing to the file
+        """
+        if not isinstance(content, str):
+            raise TypeError("Content must be a string for BatchTextWriter")
+        if self.closed:
+            raise ValueError("BatchTextWriter is closed")
+        self._buffer.append(content)
+        self._buffered += len(content)
+        if (self._buffered >= self.buffer_size
+                or time.monotonic() - self._last_flush >= self.flush_interval):
+            self.flush()
+
+    def flush(self) -> None:
+        """
+        Write buffered content to the file, fsyncing under the "flush" policy
+        Raises:
+            IOError: If there's an error writing to the file
+        """
+        try:
+            if self._buffer:
+                self._file.write("".join(self._buffer))
+                self._buffer.clear()
+                self._buffered = 0
+            self._file.flush()
+            if self.fsync == self.FSYNC_ON_FLUSH:
+                os.fsync(self._file.fileno())
+        except IOError as e:
+            raise IOError(f"Error writing to text file {self.handler.filename}: {str(e)}")
+        self._last_flush = time.monotonic()
+
+    def close(self) -> None:
+        """
+        Flush and close the file, renaming the temporary file into place in atomic mode
+        Raises:
+            IOError: If there's an error writing or renaming the file
+        """
+        if self.closed:
+            return
+        try:
+            self.flush()
+            if self.fsync != self.FSYNC_NEVER:
+                os.fsync(self._file.fileno())
+        except BaseException:
+            self.discard()
+            raise
+        self._file.close()
+        if self._temp_name is not None:
+            try:
+                os.replace(self._temp_name, self.handler.filename)
+                if self.fsync != self.FSYNC_NEVER and hasattr(os, "O_DIRECTORY"):
+                    # Persist the rename itself
+                    dir_fd = os.open(os.path.dirname(os.path.abspath(self.handler.filename)), os.O_DIRECTORY)
+                    try:
+                        os.fsync(dir_fd)
+                    finally:
+                        os.close(dir_fd)
+            except OSError as e:
+                raise IOError(f"Error writing to text file {self.handler.filename}: {str(e)}")
+            self._temp_name = None
+
+    def discard(self) -> None:
+        """
+        Close the file without publishing it; in atomic mode the target is left untouched
+        """
+        self._buffer.clear()
+        self._buffered = 0
+        self._file.close()
+        if self._temp_name is not None:
+            if os.path.exists(self._temp_name):
+                os.remove(self._temp_name)
+            self._temp_name = None
+
+    def __enter__(self) -> "BatchTextWriter":
+        return self
+
+    def __exit__(self, exc_type, exc_value, traceback) -> None:
+        if exc_type is not None and self.atomic:
+            self.discard()
+        else:
+            self.close()
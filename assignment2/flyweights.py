@@ -0,0 +1,436 @@
+# Shared immutable specs for shapes and vehicles that repeat many times
+from __future__ import annotations
+
+import threading
+from collections import OrderedDict
+
+from ._common import check_same_length, gc_paused
+from .shapes import BorderedRectangle, Circle, Rectangle
+from .vehicles import Bike, Car
+
+TYPE_CHECKING = False
+if TYPE_CHECKING:
+    from typing import Any, Dict, Iterable, List, Tuple, Type
+
+# Constructor arguments that make up the spec of each supported class, in order
+SPEC_FIELDS: Dict[type, Tuple[str, ...]] = {
+    Circle: ("radius",),
+    Rectangle: ("width", "height"),
+    BorderedRectangle: ("width", "height", "color", "border_width"),
+    Car: ("brand", "model", "year", "num_doors"),
+    Bike: ("brand", "model", "year", "has_sidecar"),
+}
+
+
+def _key(cls: type, args: Tuple[Any, ...]) -> Tuple[Any, ...]:
+    """
+    Build the intern table key of a spec
+    Args:
+        cls (type): The spec's class
+        args (Tuple[Any, ...]): Its constructor arguments
+    Returns:
+        Tuple[Any, ...]: The class, the arguments and their types, since equal values such as
+            4 and 4.0 format differently
+    """
+    return (cls, *args, *map(type, args))
+
+
+# Immutable spec shared by every shape or vehicle with the same constructor arguments
+class Spec:
+    __slots__ = ('cls', 'args', '_fields', '_description', '_hash')
+
+    def __init__(self, cls: type, args: Tuple[Any, ...], prototype: Any):
+        """
+        Initialize a Spec from a freshly built, validated instance of its class
+        Args:
+            cls (type): The class the spec describes, a key of SPEC_FIELDS
+            args (Tuple[Any, ...]): Constructor arguments in SPEC_FIELDS order
+            prototype (Any): cls(*args), used once to derive the cached values
+        """
+        object.__setattr__(self, 'cls', cls)
+        object.__setattr__(self, 'args', args)
+        object.__setattr__(self, '_fields', SPEC_FIELDS[cls])
+        object.__setattr__(self, '_description', prototype.get_description())
+        object.__setattr__(self, '_hash', hash((cls, args)))
+
+    def __getattr__(self, name: str) -> Any:
+        # Only called for names that are not slots, i.e. the spec's fields
+        if name.startswith('_'):
+            raise AttributeError(name)
+        try:
+            return self.args[self._fields.index(name)]
+        except ValueError:
+            raise AttributeError(f"{type(self).__name__} has no attribute {name!r}") from None
+
+    def __setattr__(self, name: str, value: Any) -> None:
+        raise AttributeError(f"{type(self).__name__} is shared and cannot be modified")
+
+    def __delattr__(self, name: str) -> None:
+        raise AttributeError(f"{type(self).__name__} is shared and cannot be modified")
+
+    def __eq__(self, other: object) -> bool:
+        if not isinstance(other, Spec):
+            return NotImplemented
+        return self.cls is other.cls and _key(self.cls, self.args) == _key(other.cls, other.args)
+
+    def __hash__(self) -> int:
+        return self._hash
+
+    # Specs are immutable, so copies are the spec itself and unpickling interns again
+    def __copy__(self) -> "Spec":
+        return self
+
+    def __deepcopy__(self, memo: Dict[int, Any]) -> "Spec":
+        return self
+
+    def __reduce__(self) -> Tuple[Any, ...]:
+        return _intern_shared, (self.cls, *self.args)
+
+    def __repr__(self) -> str:
+        fields = ", ".join(f"{name}={value!r}" for name, value in zip(self._fields, self.args))
+        return f"{type(self).__name__}({self.cls.__name__}: {fields})"
+
+    def get_description(self) -> str:
+        """
+        Get the description of the described object, computed once per spec
+        Returns:
+            str: The same text as cls(*args).get_description()
+        """
+        return self._description
+
+    def create(self, *args: Any, **kwargs: Any) -> Any:
+        """
+        Build a full, independent instance of the spec's class
+        Args:
+            *args (Any): Further constructor arguments after the spec's own, e.g. x and y of a Circle
+            **kwargs (Any): Further constructor keyword arguments
+        Returns:
+            Any: A new cls(*self.args, *args, **kwargs)
+        """
+        return self.cls(*self.args, *args, **kwargs)
+
+
+# Spec subclass inheriting from Spec for shapes, with the area computed once
+class ShapeSpec(Spec):
+    __slots__ = ('_area',)
+
+    def __init__(self, cls: type, args: Tuple[Any, ...], prototype: Any):
+        """
+        Initialize a ShapeSpec
+        Args:
+            cls (type): Circle, Rectangle or BorderedRectangle
+            args (Tuple[Any, ...]): Constructor arguments in SPEC_FIELDS order
+            prototype (Any): cls(*args), used once to derive the cached values
+        """
+        super().__init__(cls, args, prototype)
+        object.__setattr__(self, '_area', prototype.calculate_area())
+
+    def calculate_area(self) -> float:
+        """
+        Get the area of the described shape, computed once per spec
+        Returns:
+            float: The same value as cls(*args).calculate_area()
+        """
+        return self._area
+
+
+# Spec subclass inheriting from Spec for vehicles, with the engine messages computed once
+class VehicleSpec(Spec):
+    __slots__ = ('_start_message', '_stop_message')
+
+    def __init__(self, cls: type, args: Tuple[Any, ...], prototype: Any):
+        """
+        Initialize a VehicleSpec
+        Args:
+            cls (type): Car or Bike
+            args (Tuple[Any, ...]): Constructor arguments in SPEC_FIELDS order
+            prototype (Any): cls(*args), used once to derive the cached values
+        """
+        super().__init__(cls, args, prototype)
+        # Formatting only: running start_engine would be an engine transition
+        object.__setattr__(self, '_start_message', prototype.start_message())
+        object.__setattr__(self, '_stop_message', prototype.stop_message())
+
+
+# Vehicle whose engine state is its own while its spec is shared
+#
+# A SharedVehicle is deliberately not a Vehicle: it has no fleet or description slots, and
+# is_running is a plain attribute. Fleet rejects it, EngineLog does not record it and
+# dump_objects cannot serialize it; start_all/stop_all work on it through start_engine and
+# stop_engine. Call to_vehicle() for a full Car or Bike where those are needed.
+class SharedVehicle:
+    # Two slots per vehicle; everything else lives on the shared spec
+    __slots__ = ('spec', 'is_running')
+
+    def __init__(self, spec: VehicleSpec):
+        """
+        Initialize a SharedVehicle with its engine stopped
+        Args:
+            spec (VehicleSpec): The vehicle's shared spec
+        """
+        self.spec = spec
+        self.is_running = False
+
+    def __getattr__(self, name: str) -> Any:
+        # brand, model, year and the class-specific field come from the spec
+        if name.startswith('_'):
+            raise AttributeError(name)
+        return getattr(self.spec, name)
+
+    def start_engine(self) -> str:
+        """
+        Start this vehicle's engine
+        Returns:
+            str: The same message as the spec's class start_engine
+        """
+        self.is_running = True
+        return self.spec._start_message
+
+    def stop_engine(self) -> str:
+        """
+        Stop this vehicle's engine
+        Returns:
+            str: The same message as the spec's class stop_engine
+        """
+        self.is_running = False
+        return self.spec._stop_message
+
+    def get_description(self) -> str:
+        """
+        Get the vehicle's description
+        Returns:
+            str: The spec's description
+        """
+        return self.spec._description
+
+    def to_vehicle(self) -> Any:
+        """
+        Build a full Car or Bike with this vehicle's spec and engine state
+        Returns:
+            Vehicle: A new, independent vehicle
+        """
+        vehicle = self.spec.create()
+        vehicle.is_running = self.is_running
+        return vehicle
+
+
+# Factory handing out one shared spec per distinct set of constructor arguments
+class SpecFactory:
+    def __init__(self, max_size: int = 65536):
+        """
+        Initialize a SpecFactory
+        Args:
+            max_size (int): Number of specs kept in the intern table before evicting the oldest
+                (default: 65536)
+        Raises:
+            ValueError: If max_size is not positive
+        """
+        if max_size <= 0:
+            raise ValueError("Intern table size must be positive")
+        self.max_size = max_size
+        self.hits = 0
+        self.misses = 0
+        self.evictions = 0
+        # Maps _key(cls, args) to its spec, oldest first; hits do not reorder it, so the fast
+        # paths below are a single lookup and an evicted spec is simply interned again
+        self._specs: "OrderedDict[Tuple[Any, ...], Spec]" = OrderedDict()
+        self._lock = threading.Lock()
+
+    def intern(self, cls: Type[Any], *args: Any) -> Spec:
+        """
+        Get the shared spec for a class and its constructor arguments, validating only new specs
+        Args:
+            cls (Type[Any]): A class in SPEC_FIELDS
+            *args (Any): Its constructor arguments in SPEC_FIELDS order
+        Returns:
+            Spec: A ShapeSpec or VehicleSpec, the same object for equal arguments while it stays
+                in the table
+        Raises:
+            TypeError: If cls is not supported or the number of arguments is wrong
+            ValueError: If the arguments are invalid for cls
+        """
+        spec = self._specs.get(_key(cls, args))
+        if spec is None:
+            return self._add(cls, args)
+        self.hits += 1
+        return spec
+
+    def _add(self, cls: Type[Any], args: Tuple[Any, ...]) -> Spec:
+        """
+        Validate a new spec and add it to the intern table
+        Args:
+            cls (Type[Any]): A class in SPEC_FIELDS
+            args (Tuple[Any, ...]): Its constructor arguments in SPEC_FIELDS order
+        Returns:
+            Spec: The new spec, or the one another thread added first
+        Raises:
+            TypeError: If cls is not supported or the number of arguments is wrong
+            ValueError: If the arguments are invalid for cls
+        """
+        fields = SPEC_FIELDS.get(cls)
+        if fields is None:
+            raise TypeError(f"No spec is defined for {cls.__name__}")
+        if len(args) != len(fields):
+            raise TypeError(f"{cls.__name__} spec takes {len(fields)} arguments: {', '.join(fields)}")
+        # Building the prototype runs the class's own validation
+        prototype = cls(*args)
+        spec_class = VehicleSpec if cls in (Car, Bike) else ShapeSpec
+        spec = spec_class(cls, args, prototype)
+        specs = self._specs
+        with self._lock:
+            self.misses += 1
+            existing = specs.setdefault(_key(cls, args), spec)
+            if existing is spec:
+                while len(specs) > self.max_size:
+                    specs.popitem(last=False)
+                    self.evictions += 1
+            return existing
+
+    def intern_columns(self, cls: Type[Any], *columns: Iterable[Any]) -> List[Spec]:
+        """
+        Get the shared specs for many objects given one column per constructor argument
+        Args:
+            cls (Type[Any]): A class in SPEC_FIELDS
+            *columns (Iterable[Any]): Values of each of its constructor arguments, in SPEC_FIELDS order
+        Returns:
+            List[Spec]: One spec per row, in column order; equal rows get the same spec object
+        Raises:
+            TypeError: If cls is not supported or the number of columns is wrong
+            ValueError: If columns differ in length or a row is invalid for cls
+        """
+        columns = tuple(list(column) for column in columns)
+        check_same_length(*columns)
+        # Each distinct row goes through intern once; repeats are a lookup in this local table.
+        # Rows need their types in the key only if a column mixes types, such as 4 and 4.0
+        mixed = any(len(set(map(type, column))) > 1 for column in columns)
+        batch: Dict[Tuple[Any, ...], Spec] = {}
+        lookup = batch.get
+        result: List[Spec] = []
+        append = result.append
+        with gc_paused():
+            for row in zip(*columns):
+                key = (*row, *map(type, row)) if mixed else row
+                spec = lookup(key)
+                if spec is None:
+                    spec = batch[key] = self.intern(cls, *row)
+                append(spec)
+        with self._lock:
+            self.hits += len(result) - len(batch)
+        return result
+
+    # The per-class methods repeat intern's lookup inline, skipping its argument packing
+
+    def circle(self, radius: float) -> ShapeSpec:
+        """
+        Get the shared spec of a circle
+        Args:
+            radius (float): The radius of the circle
+        Returns:
+            ShapeSpec: The circle's spec
+        """
+        spec = self._specs.get((Circle, radius, type(radius)))
+        if spec is None:
+            return self._add(Circle, (radius,))
+        self.hits += 1
+        return spec
+
+    def rectangle(self, width: float, height: float) -> ShapeSpec:
+        """
+        Get the shared spec of a rectangle
+        Args:
+            width (float): The width of the rectangle
+            height (float): The height of the rectangle
+        Returns:
+            ShapeSpec: The rectangle's spec
+        """
+        spec = self._specs.get((Rectangle, width, height, type(width), type(height)))
+        if spec is None:
+            return self._add(Rectangle, (width, height))
+        self.hits += 1
+        return spec
+
+    def bordered_rectangle(self, width: float, height: float, color: str = "Unknown",
+                           border_width: float = 1.0) -> ShapeSpec:
+        """
+        Get the shared spec of a bordered rectangle
+        Args:
+            width (float): The width of the rectangle
+            height (float): The height of the rectangle
+            color (str): The color of the shape (default: "Unknown")
+            border_width (float): The width of the border (default: 1.0)
+        Returns:
+            ShapeSpec: The rectangle's spec
+        """
+        spec = self._specs.get((BorderedRectangle, width, height, color, border_width,
+                                type(width), type(height), type(color), type(border_width)))
+        if spec is None:
+            return self._add(BorderedRectangle, (width, height, color, border_width))
+        self.hits += 1
+        return spec
+
+    def car(self, brand: str, model: str, year: int, num_doors: int) -> SharedVehicle:
+        """
+        Create a car with its own engine state and a shared spec
+        Args:
+            brand (str): The manufacturer of the car
+            model (str): The model name of the car
+            year (int): The manufacturing year
+            num_doors (int): Number of doors in the car
+        Returns:
+            SharedVehicle: A new vehicle with its engine stopped
+        """
+        spec = self._specs.get((Car, brand, model, year, num_doors,
+                                type(brand), type(model), type(year), type(num_doors)))
+        if spec is None:
+            spec = self._add(Car, (brand, model, year, num_doors))
+        else:
+            self.hits += 1
+        return SharedVehicle(spec)
+
+    def bike(self, brand: str, model: str, year: int, has_sidecar: bool) -> SharedVehicle:
+        """
+        Create a bike with its own engine state and a shared spec
+        Args:
+            brand (str): The manufacturer of the bike
+            model (str): The model name of the bike
+            year (int): The manufacturing year
+            has_sidecar (bool): Whether the bike has a sidecar
+        Returns:
+            SharedVehicle: A new vehicle with its engine stopped
+        """
+        spec = self._specs.get((Bike, brand, model, year, has_sidecar,
+                                type(brand), type(model), type(year), type(has_sidecar)))
+        if spec is None:
+            spec = self._add(Bike, (brand, model, year, has_sidecar))
+        else:
+            self.hits += 1
+        return SharedVehicle(spec)
+
+    def __len__(self) -> int:
+        return len(self._specs)
+
+    def clear(self) -> None:
+        """
+        Drop all interned specs, keeping the counters; specs already handed out stay valid
+        """
+        with self._lock:
+            self._specs.clear()
+
+    def stats(self) -> Dict[str, int]:
+        """
+        Get intern table counters
+        Returns:
+            Dict[str, int]: Hits, misses, evictions, entries and the table's size limit; hits skip
+                the lock, so under heavy concurrent use they may be slightly undercounted
+        """
+        with self._lock:
+            return {"hits": self.hits, "misses": self.misses, "evictions": self.evictions,
+                    "entries": len(self._specs), "max_size": self.max_size}
+
+
+# Factory shared by callers that do not need their own intern table
+SPEC_FACTORY = SpecFactory()
+
+
+def _intern_shared(cls: Type[Any], *args: Any) -> Spec:
+    return SPEC_FACTORY.intern(cls, *args)
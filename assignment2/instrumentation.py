@@ -0,0 +1,275 @@
+# Opt-in call count, latency and bytes-moved instrumentation for the class hierarchies
+from __future__ import annotations
+
+from contextlib import contextmanager
+import functools
+import threading
+import time
+
+TYPE_CHECKING = False
+if TYPE_CHECKING:
+    from typing import Any, Callable, Dict, Iterable, Iterator, List, Optional, Tuple
+
+    from .file_handlers import TextFileHandler
+
+
+# Call count, latency histogram and bytes moved for one method of one class
+class MethodStats:
+    __slots__ = ('calls', 'errors', 'total_ns', 'max_ns', 'bytes', 'histogram')
+
+    # Bucket k counts calls taking less than 2**k nanoseconds
+    BUCKETS = 64
+
+    def __init__(self):
+        """
+        Initialize empty MethodStats
+        """
+        self.calls = 0
+        self.errors = 0
+        self.total_ns = 0
+        self.max_ns = 0
+        self.bytes = 0
+        self.histogram = [0] * (self.BUCKETS + 1)
+
+    def record(self, elapsed_ns: int, size: int, failed: bool) -> None:
+        """
+        Add one call to the statistics
+        Args:
+            elapsed_ns (int): Duration of the call in nanoseconds
+            size (int): Bytes or characters the call moved
+            failed (bool): Whether the call raised
+        """
+        self.calls += 1
+        self.errors += failed
+        self.total_ns += elapsed_ns
+        if elapsed_ns > self.max_ns:
+            self.max_ns = elapsed_ns
+        self.bytes += size
+        self.histogram[min(elapsed_ns.bit_length(), self.BUCKETS)] += 1
+
+    def quantile(self, fraction: float) -> int:
+        """
+        Estimate a latency quantile from the histogram
+        Args:
+            fraction (float): Quantile between 0 and 1, e.g. 0.99
+        Returns:
+            int: Upper bound in nanoseconds of the bucket holding the quantile
+        """
+        target = fraction * self.calls
+        seen = 0
+        for bucket, count in enumerate(self.histogram):
+            seen += count
+            if count and seen >= target:
+                return min(1 << bucket, self.max_ns)
+        return self.max_ns
+
+    def to_dict(self) -> Dict[str, Any]:
+        """
+        Export the statistics as JSON-compatible data
+        Returns:
+            Dict[str, Any]: The statistics, with the non-empty histogram buckets keyed by upper bound
+        """
+        return {
+            "calls": self.calls,
+            "errors": self.errors,
+            "total_ns": self.total_ns,
+            "mean_ns": self.total_ns // self.calls if self.calls else 0,
+            "p50_ns": self.quantile(0.5),
+            "p99_ns": self.quantile(0.99),
+            "max_ns": self.max_ns,
+            "bytes": self.bytes,
+            "histogram": {f"<{1 << bucket}ns": count for bucket, count in enumerate(self.histogram) if count},
+        }
+
+
+# File handler methods whose calls record the bytes or characters they move
+MOVED_SIZE_METHODS = frozenset(('read', 'write', 'write_stream'))
+
+
+def _moved_size(name: str, args: tuple, result: Any) -> int:
+    """
+    Bytes or characters moved by an instrumented file handler call
+    Args:
+        name (str): Method name
+        args (tuple): Positional arguments, including self
+        result (Any): The method's return value
+    Returns:
+        int: The size, or 0 for methods that move no content
+    """
+    if name == 'read' and isinstance(result, (str, bytes)):
+        return len(result)
+    if name == 'write' and len(args) > 1 and isinstance(args[1], (str, bytes)):
+        return len(args[1])
+    if name == 'write_stream' and isinstance(result, int):
+        return result
+    return 0
+
+
+# Opt-in layer that wraps methods to record MethodStats per class and method
+#
+# While disabled the original functions are in place, so there is no overhead at all.
+class Instrumentation:
+    def __init__(self):
+        """
+        Initialize a disabled Instrumentation with no statistics
+        """
+        self._stats: Dict[Tuple[Any, str], MethodStats] = {}
+        self._patched: List[Tuple[Any, str, Any]] = []
+        self._lock = threading.Lock()
+        # Calls in progress on each thread, so super() calls are not counted twice
+        self._active = threading.local()
+
+    @property
+    def enabled(self) -> bool:
+        return bool(self._patched)
+
+    @staticmethod
+    def default_targets() -> Dict[Any, Tuple[str, ...]]:
+        """
+        The methods instrumented when enable() is called without targets
+        This imports every hierarchy, so it is only called when instrumentation is enabled.
+        Returns:
+            Dict[Any, Tuple[str, ...]]: Method names by class or module
+        """
+        from . import animals, file_handlers, shapes, vehicles
+
+        return {
+            vehicles.Vehicle: ('start_engine', 'stop_engine'),
+            shapes.Shape: ('calculate_area',),
+            shapes.StyledShape: ('calculate_area',),
+            animals.Animal: ('make_sound',),
+            animals: ('process_sound',),
+            file_handlers.FileHandler: ('read', 'write', 'write_stream'),
+        }
+
+    def enable(self, targets: Optional[Dict[Any, Iterable[str]]] = None) -> None:
+        """
+        Start recording calls to the target methods
+        A class target covers the methods it and all its subclasses define; a module
+        target covers module-level functions. Calls are attributed to type(self).
+        Args:
+            targets (Optional[Dict[Any, Iterable[str]]]): Method names by class or module
+                (default: default_targets())
+        Raises:
+            RuntimeError: If instrumentation is already enabled
+        """
+        if self.enabled:
+            raise RuntimeError("Instrumentation is already enabled")
+        if targets is None:
+            targets = self.default_targets()
+        for owner, names in targets.items():
+            if isinstance(owner, type):
+                owners, pending = [], [owner]
+                while pending:
+                    cls = pending.pop()
+                    if cls not in owners:
+                        owners.append(cls)
+                        pending.extend(cls.__subclasses__())
+            else:
+                owners = [owner]
+            for name in names:
+                for target in owners:
+                    original = vars(target).get(name)
+                    if callable(original) and not getattr(original, '__isabstractmethod__', False):
+                        self._patched.append((target, name, original))
+                        setattr(target, name, self._wrap(target, name, original))
+
+    def disable(self) -> None:
+        """
+        Restore the original methods; recorded statistics are kept
+        """
+        while self._patched:
+            target, name, original = self._patched.pop()
+            setattr(target, name, original)
+
+    @contextmanager
+    def recording(self, targets: Optional[Dict[Any, Iterable[str]]] = None) -> Iterator["Instrumentation"]:
+        """
+        Enable instrumentation for the duration of a with block
+        Args:
+            targets (Optional[Dict[Any, Iterable[str]]]): Passed to enable()
+        Yields:
+            Instrumentation: This instrumentation
+        """
+        self.enable(targets)
+        try:
+            yield self
+        finally:
+            self.disable()
+
+    def _wrap(self, target: Any, name: str, original: Callable) -> Callable:
+        """
+        Build the recording wrapper for one method or function
+        Args:
+            target (Any): Class or module defining the function
+            name (str): Attribute name of the function
+            original (Callable): The function to wrap
+        Returns:
+            Callable: The wrapper
+        """
+        is_method = isinstance(target, type)
+        measures_size = name in MOVED_SIZE_METHODS
+        stats, lock, active = self._stats, self._lock, self._active
+
+        @functools.wraps(original)
+        def wrapper(*args: Any, **kwargs: Any) -> Any:
+            owner = type(args[0]) if is_method and args else target
+            key = (owner, name)
+            calls = getattr(active, 'calls', None)
+            if calls is None:
+                calls = active.calls = set()
+            if key in calls:
+                return original(*args, **kwargs)
+            calls.add(key)
+            failed = True
+            result = None
+            start = time.perf_counter_ns()
+            try:
+                result = original(*args, **kwargs)
+                failed = False
+                return result
+            finally:
+                elapsed = time.perf_counter_ns() - start
+                calls.discard(key)
+                size = _moved_size(name, args, result) if measures_size and not failed else 0
+                with lock:
+                    entry = stats.get(key)
+                    if entry is None:
+                        entry = stats[key] = MethodStats()
+                    entry.record(elapsed, size, failed)
+
+        return wrapper
+
+    def snapshot(self) -> List[Dict[str, Any]]:
+        """
+        Export the statistics recorded so far, slowest total time first
+        Returns:
+            List[Dict[str, Any]]: One JSON-compatible entry per class and method
+        """
+        with self._lock:
+            entries = [dict(owner=getattr(owner, '__qualname__', owner.__name__), method=name, **entry.to_dict())
+                       for (owner, name), entry in self._stats.items()]
+        entries.sort(key=lambda entry: entry["total_ns"], reverse=True)
+        return entries
+
+    def export(self, handler: TextFileHandler) -> None:
+        """
+        Write a snapshot to a file as JSON
+        Args:
+            handler (TextFileHandler): Handler for the destination file
+        Raises:
+            IOError: If there's an error writing to the file
+        """
+        import json
+
+        handler.write(json.dumps(self.snapshot(), indent=2))
+
+    def reset(self) -> None:
+        """
+        Discard the statistics recorded so far
+        """
+        with self._lock:
+            self._stats.clear()
+
+
+INSTRUMENTATION = Instrumentation()
@@ -0,0 +1,399 @@
+# Columnar store of person profile records
+from __future__ import annotations
+
+from array import array
+import functools
+
+from ._common import check_same_length, column_error, gc_paused, positive_columns_error, raise_column_errors
+
+TYPE_CHECKING = False
+if TYPE_CHECKING:
+    from typing import IO, Any, Callable, Dict, Iterable, Iterator, List, Optional, Tuple, Union
+
+    from .file_handlers import TextFileHandler
+
+# Profile fields in export order, with the array type code of each numeric column;
+# None marks a dictionary-encoded string column
+PERSON_FIELDS: Tuple[Tuple[str, Optional[str]], ...] = (
+    ("name", None),
+    ("age", 'H'),
+    ("gender", None),
+    ("height", 'd'),
+    ("weight", 'd'),
+    ("skin_color", None),
+    ("nationality", None),
+    ("occupation", None),
+    ("university", None),
+    ("marital_status", None),
+    ("language", None),
+    ("favourite_language", None),
+    ("hobby", None),
+    ("favourite_color", None),
+    ("blood_type", None),
+)
+
+
+# Values each numeric column type can hold, for error messages
+TYPE_CODE_LIMITS: Dict[str, str] = {'H': "a whole number from 0 to 65535", 'd': "a number"}
+
+
+def _fits(type_code: str, value: Any) -> bool:
+    """
+    Check whether a value can be stored in an array of a type
+    Args:
+        type_code (str): The array type code
+        value (Any): The value
+    Returns:
+        bool: True if the array accepts the value
+    """
+    try:
+        array(type_code, (value,))
+    except (TypeError, OverflowError):
+        return False
+    return True
+
+
+def _numeric_columns(values: Dict[str, List[Any]]) -> Dict[str, array]:
+    """
+    Pack the numeric columns into arrays, so every value is checked before any is stored
+    Args:
+        values (Dict[str, List[Any]]): Values of each field, keyed by field name
+    Returns:
+        Dict[str, array]: One array per numeric field
+    Raises:
+        ValueError: If a value does not fit its column or a height or weight is not positive,
+            listing every bad row of every column
+    """
+    numbers: Dict[str, array] = {}
+    errors: List[Optional[str]] = []
+    for name, type_code in PERSON_FIELDS:
+        if type_code is None:
+            continue
+        try:
+            numbers[name] = array(type_code, values[name])
+        except (TypeError, OverflowError):
+            errors.append(column_error(values[name], functools.partial(_fits, type_code),
+                                       f"{name.capitalize()} must be {TYPE_CODE_LIMITS[type_code]}"))
+    for name in ("height", "weight"):
+        if name in numbers:
+            errors.append(positive_columns_error(f"{name.capitalize()} must be positive", numbers[name]))
+    raise_column_errors(*errors)
+    return numbers
+
+
+def _csv_quote(value: str) -> str:
+    """
+    Quote a CSV field the way the csv module does by default
+    Args:
+        value (str): The field
+    Returns:
+        str: The field, quoted if it contains a comma, quote or line break
+    """
+    if ',' in value or '"' in value or '\n' in value or '\r' in value:
+        return '"' + value.replace('"', '""') + '"'
+    return value
+
+
+# String column storing each distinct value once and a compact code per row
+class DictionaryColumn:
+    __slots__ = ('values', 'codes', '_index')
+
+    def __init__(self, values: Iterable[str] = ()):
+        """
+        Initialize a DictionaryColumn, optionally from an iterable of strings
+        Args:
+            values (Iterable[str]): Values of the rows
+        """
+        # Distinct values, indexed by code
+        self.values: List[str] = []
+        self.codes = array('I')
+        self._index: Dict[str, int] = {}
+        self.extend(values)
+
+    def encode(self, value: str) -> int:
+        """
+        Get the code for a value, adding it to the dictionary if it is new
+        Args:
+            value (str): The value to encode
+        Returns:
+            int: The value's code
+        """
+        code = self._index.get(value)
+        if code is None:
+            code = self._index[value] = len(self.values)
+            self.values.append(value)
+        return code
+
+    def append(self, value: str) -> None:
+        self.codes.append(self.encode(value))
+
+    def extend(self, values: Iterable[str]) -> None:
+        self.codes.extend(map(self.encode, values))
+
+    def __getitem__(self, row: int) -> str:
+        return self.values[self.codes[row]]
+
+    def __iter__(self) -> Iterator[str]:
+        return map(self.values.__getitem__, self.codes)
+
+    def __len__(self) -> int:
+        return len(self.codes)
+
+
+# Table of person profiles stored column by column
+class PersonTable:
+    FIELDS = tuple(name for name, _ in PERSON_FIELDS)
+    NUMERIC_FIELDS = tuple(name for name, type_code in PERSON_FIELDS if type_code is not None)
+
+    def __init__(self):
+        """
+        Initialize an empty PersonTable
+        """
+        self.columns: Dict[str, Union[array, DictionaryColumn]] = {
+            name: DictionaryColumn() if type_code is None else array(type_code)
+            for name, type_code in PERSON_FIELDS
+        }
+
+    @classmethod
+    def from_records(cls, records: Iterable[Dict[str, Any]]) -> "PersonTable":
+        """
+        Build a table from profile dictionaries, validating each column once
+        Args:
+            records (Iterable[Dict[str, Any]]): Profiles with a value for every field in FIELDS
+        Returns:
+            PersonTable: The table, in record order
+        Raises:
+            ValueError: If a record is missing a field or a value is invalid, listing every bad row
+        """
+        columns: Dict[str, List[Any]] = {name: [] for name in cls.FIELDS}
+        appends = [(name, columns[name].append) for name in cls.FIELDS]
+        with gc_paused():
+            for row, record in enumerate(records):
+                try:
+                    for name, append in appends:
+                        append(record[name])
+                except KeyError as e:
+                    raise ValueError(f"Record is missing field {e} (row {row})")
+        return cls.from_columns(**columns)
+
+    @classmethod
+    def from_columns(cls, **columns: Iterable[Any]) -> "PersonTable":
+        """
+        Build a table directly from one iterable per field
+        Args:
+            **columns (Iterable[Any]): Values of each field in FIELDS, keyed by field name
+        Returns:
+            PersonTable: The table
+        Raises:
+            ValueError: If a field is missing or unknown, columns differ in length, or a value is
+                invalid, listing every bad row
+        """
+        if set(columns) != set(cls.FIELDS):
+            raise ValueError(f"Columns must be exactly: {', '.join(cls.FIELDS)}")
+        values = {name: list(column) for name, column in columns.items()}
+        check_same_length(*values.values())
+        numbers = _numeric_columns(values)
+        table = cls()
+        for name, column in table.columns.items():
+            column.extend(numbers.get(name, values[name]))
+        return table
+
+    def append(self, record: Dict[str, Any]) -> None:
+        """
+        Add a single profile to the table
+        Every value is checked and encoded before any column grows, so a rejected record
+        leaves the table unchanged.
+        Args:
+            record (Dict[str, Any]): Profile with a value for every field in FIELDS
+        Raises:
+            ValueError: If the record is missing a field or a value is invalid
+        """
+        missing = [name for name in self.FIELDS if name not in record]
+        if missing:
+            raise ValueError(f"Record is missing fields: {', '.join(missing)}")
+        numbers = _numeric_columns({name: [record[name]] for name in self.NUMERIC_FIELDS})
+        codes = [(column.codes, column.encode(record[name]))
+                 for name, column in self.columns.items() if name not in numbers]
+        for name, number in numbers.items():
+            self.columns[name].extend(number)
+        for column_codes, code in codes:
+            column_codes.append(code)
+
+    def __len__(self) -> int:
+        return len(self.columns["age"])
+
+    def row(self, index: int) -> Dict[str, Any]:
+        """
+        Get one profile as a dictionary
+        Args:
+            index (int): Row number
+        Returns:
+            Dict[str, Any]: The profile
+        Raises:
+            IndexError: If index is out of range
+        """
+        return {name: column[index] for name, column in self.columns.items()}
+
+    def iter_rows(self, start: int = 0, stop: Optional[int] = None) -> Iterator[Tuple[Any, ...]]:
+        """
+        Iterate over a range of rows as tuples in FIELDS order
+        Args:
+            start (int): First row (default: 0)
+            stop (Optional[int]): Row to stop before (default: the end of the table)
+        Yields:
+            Tuple[Any, ...]: One tuple per row
+        """
+        parts = []
+        for column in self.columns.values():
+            if isinstance(column, DictionaryColumn):
+                parts.append(map(column.values.__getitem__, column.codes[start:stop]))
+            else:
+                parts.append(column[start:stop])
+        return zip(*parts)
+
+    def group_count(self, by: str) -> Dict[str, int]:
+        """
+        Count the rows for each value of a string field
+        Args:
+            by (str): String field to group by, e.g. "nationality"
+        Returns:
+            Dict[str, int]: Number of rows per value
+        Raises:
+            ValueError: If by is not a string field
+        """
+        groups = self._string_column(by)
+        counts = [0] * len(groups.values)
+        for code in groups.codes:
+            counts[code] += 1
+        return {value: count for value, count in zip(groups.values, counts) if count}
+
+    def group_mean(self, value: str, by: str) -> Dict[str, float]:
+        """
+        Average a numeric field for each value of a string field in one pass over both columns
+        Args:
+            value (str): Numeric field to average, e.g. "height"
+            by (str): String field to group by, e.g. "university"
+        Returns:
+            Dict[str, float]: Mean per group
+        Raises:
+            ValueError: If value is not a numeric field or by is not a string field
+        """
+        if value not in self.NUMERIC_FIELDS:
+            raise ValueError(f"{value} is not a numeric field")
+        groups = self._string_column(by)
+        sums = [0.0] * len(groups.values)
+        counts = [0] * len(groups.values)
+        for code, number in zip(groups.codes, self.columns[value]):
+            sums[code] += number
+            counts[code] += 1
+        return {group: total / count for group, total, count in zip(groups.values, sums, counts) if count}
+
+    def _string_column(self, name: str) -> DictionaryColumn:
+        column = self.columns.get(name)
+        if not isinstance(column, DictionaryColumn):
+            raise ValueError(f"{name} is not a string field")
+        return column
+
+    def _render(self, batch_size: int, field_format: Callable[[str], str], quote: Callable[[str], str],
+                row_format: str) -> Iterator[str]:
+        """
+        Render the rows in batches, formatting each distinct string value only once
+        Args:
+            batch_size (int): Rows rendered per chunk
+            field_format (Callable[[str], str]): Maps a field name to a %-format for its values
+            quote (Callable[[str], str]): Renders a string value
+            row_format (str): %-format wrapping the comma-joined fields of a row
+        Yields:
+            str: Successive chunks of rendered rows
+        Raises:
+            ValueError: If batch_size is not positive
+        """
+        if batch_size <= 0:
+            raise ValueError("Batch size must be positive")
+        renderers = []
+        for name, column in self.columns.items():
+            template = field_format(name)
+            if isinstance(column, DictionaryColumn):
+                rendered = [template % quote(value) for value in column.values]
+                renderers.append((rendered.__getitem__, column.codes))
+            else:
+                renderers.append((template.__mod__, column))
+        for start in range(0, len(self), batch_size):
+            stop = start + batch_size
+            fields = [map(render, values[start:stop]) for render, values in renderers]
+            yield "".join([row_format % ",".join(row) for row in zip(*fields)])
+
+    def iter_csv(self, batch_size: int = 4096) -> Iterator[str]:
+        """
+        Lazily render the table as CSV with a header row
+        Args:
+            batch_size (int): Rows rendered per chunk (default: 4096)
+        Yields:
+            str: Successive chunks of CSV text
+        Raises:
+            ValueError: If batch_size is not positive
+        """
+        yield ",".join(self.FIELDS) + "\n"
+        yield from self._render(batch_size, lambda name: "%s", _csv_quote, "%s\n")
+
+    def iter_jsonl(self, batch_size: int = 4096) -> Iterator[str]:
+        """
+        Lazily render the table as JSON Lines, one object per row
+        Args:
+            batch_size (int): Rows rendered per chunk (default: 4096)
+        Yields:
+            str: Successive chunks of JSON Lines text
+        Raises:
+            ValueError: If batch_size is not positive
+        """
+        import json
+
+        yield from self._render(batch_size, lambda name: json.dumps(name) + ":%s",
+                                lambda value: json.dumps(value, ensure_ascii=False), "{%s}\n")
+
+    def write_csv(self, sink: IO[str], batch_size: int = 4096) -> int:
+        """
+        Stream the table as CSV into a text buffer or file
+        Args:
+            sink (IO[str]): Object with a write method, such as a file or io.StringIO
+            batch_size (int): Rows per write call (default: 4096)
+        Returns:
+            int: Number of rows written, excluding the header
+        """
+        for chunk in self.iter_csv(batch_size):
+            sink.write(chunk)
+        return len(self)
+
+    def write_jsonl(self, sink: IO[str], batch_size: int = 4096) -> int:
+        """
+        Stream the table as JSON Lines into a text buffer or file
+        Args:
+            sink (IO[str]): Object with a write method, such as a file or io.StringIO
+            batch_size (int): Rows per write call (default: 4096)
+        Returns:
+            int: Number of rows written
+        """
+        for chunk in self.iter_jsonl(batch_size):
+            sink.write(chunk)
+        return len(self)
+
+    def export(self, handler: TextFileHandler, format: str = "csv", batch_size: int = 4096) -> int:
+        """
+        Stream the table into a file through a text file handler
+        Args:
+            handler (TextFileHandler): Handler for the destination file
+            format (str): "csv" or "jsonl" (default: "csv")
+            batch_size (int): Rows per chunk (default: 4096)
+        Returns:
+            int: Number of characters written
+        Raises:
+            ValueError: If format is unknown
+            IOError: If there's an error writing to the file
+        """
+        if format == "csv":
+            chunks = self.iter_csv(batch_size)
+        elif format == "jsonl":
+            chunks = self.iter_jsonl(batch_size)
+        else:
+            raise ValueError(f"Unknown export format: {format}")
+        return handler.write_stream(chunks)
@@ -0,0 +1,276 @@
+# Compact binary snapshots of vehicles, shapes and animals
+from __future__ import annotations
+
+import struct
+
+from .animals import Cat, Dog
+from .shapes import BorderedRectangle, Circle, Rectangle
+from .vehicles import Bike, Car, Vehicle
+
+TYPE_CHECKING = False
+if TYPE_CHECKING:
+    from typing import Any, Callable, Dict, Iterable, Iterator, List, Optional, Tuple
+
+    from .file_handlers import BinaryFileHandler
+
+
+# Compact binary snapshot format for vehicles, shapes and animals
+#
+# Layout: header, fixed-width records, string table, footer. Every record has the same size,
+# so record N starts at SNAPSHOT_HEADER.size + N * SNAPSHOT_RECORD.size. Strings (brands, models,
+# colors, names) are stored once in the string table and referenced by index.
+SNAPSHOT_MAGIC = b"A2SN"
+SNAPSHOT_VERSION = 1
+SNAPSHOT_HEADER = struct.Struct('<4sHH')  # magic, version, record size
+# tag, flags, two string indexes, two integers, four floats
+SNAPSHOT_RECORD = struct.Struct('<BBxxIIii4d')
+SNAPSHOT_FOOTER = struct.Struct('<QQQ4s')  # record count, string table offset, string count, magic
+SNAPSHOT_STRING_LENGTH = struct.Struct('<I')
+
+# Record flags
+FLAG_RUNNING = 1
+FLAG_SIDECAR = 2
+
+# Attributes stored in 32-bit signed and in float record fields, checked when a record fails to pack
+SNAPSHOT_INTEGER_FIELDS = ('year', 'num_doors', 'age')
+SNAPSHOT_FLOAT_FIELDS = ('radius', 'width', 'height', 'border_width', 'x', 'y')
+
+
+def _snapshot_codecs() -> Tuple[Dict[type, Tuple[int, Callable]], Dict[int, Callable]]:
+    """
+    Build the per-class record encoders and per-tag decoders
+    Encoders take (object, string index function) and return the record fields after the tag.
+    Decoders take (record fields, string list) and return the object.
+    Returns:
+        Tuple[Dict[type, Tuple[int, Callable]], Dict[int, Callable]]: Encoders by class, decoders by tag
+    """
+    def running(vehicle: Vehicle) -> int:
+        return FLAG_RUNNING if vehicle.is_running else 0
+
+    def with_state(vehicle: Vehicle, flags: int) -> Vehicle:
+        vehicle._is_running = bool(flags & FLAG_RUNNING)
+        return vehicle
+
+    encoders = {
+        Car: (1, lambda o, index: (running(o), index(o.brand), index(o.model), o.year, o.num_doors,
+                                   0.0, 0.0, 0.0, 0.0)),
+        Bike: (2, lambda o, index: (running(o) | (FLAG_SIDECAR if o.has_sidecar else 0),
+                                    index(o.brand), index(o.model), o.year, 0, 0.0, 0.0, 0.0, 0.0)),
+        Circle: (3, lambda o, index: (0, 0, 0, 0, 0, o.radius, o.x, o.y, 0.0)),
+        Rectangle: (4, lambda o, index: (0, 0, 0, 0, 0, o.width, o.height, o.x, o.y)),
+        BorderedRectangle: (5, lambda o, index: (0, index(o.color), 0, 0, 0, o.width, o.height, o.border_width, 0.0)),
+        Dog: (6, lambda o, index: (0, index(o.name), 0, o.age, 0, 0.0, 0.0, 0.0, 0.0)),
+        Cat: (7, lambda o, index: (0, index(o.name), 0, o.age, 0, 0.0, 0.0, 0.0, 0.0)),
+    }
+    decoders = {
+        1: lambda f, strings: with_state(Car(strings[f[2]], strings[f[3]], f[4], f[5]), f[1]),
+        2: lambda f, strings: with_state(Bike(strings[f[2]], strings[f[3]], f[4], bool(f[1] & FLAG_SIDECAR)), f[1]),
+        3: lambda f, strings: Circle(f[6], f[7], f[8]),
+        4: lambda f, strings: Rectangle(f[6], f[7], f[8], f[9]),
+        5: lambda f, strings: BorderedRectangle(f[6], f[7], strings[f[2]], f[8]),
+        6: lambda f, strings: Dog(strings[f[2]], f[4]),
+        7: lambda f, strings: Cat(strings[f[2]], f[4]),
+    }
+    return encoders, decoders
+
+
+SNAPSHOT_ENCODERS, SNAPSHOT_DECODERS = _snapshot_codecs()
+
+
+def _invalid_field(obj: Any, error: struct.error) -> ValueError:
+    """
+    Explain why the record of an object could not be packed
+    Args:
+        obj (Any): The object being encoded
+        error (struct.error): The packing error
+    Returns:
+        ValueError: An error naming the attribute that does not fit its record field
+    """
+    name = type(obj).__name__
+    for field in SNAPSHOT_INTEGER_FIELDS:
+        value = getattr(obj, field, 0)
+        if not isinstance(value, int) or not -2 ** 31 <= value < 2 ** 31:
+            return ValueError(f"Cannot serialize {name} with {field}={value!r}: "
+                              f"{field} must be an integer from -2**31 to 2**31 - 1")
+    for field in SNAPSHOT_FLOAT_FIELDS:
+        value = getattr(obj, field, 0.0)
+        if not isinstance(value, (int, float)):
+            return ValueError(f"Cannot serialize {name} with {field}={value!r}: {field} must be a number")
+    return ValueError(f"Cannot serialize {name}: {error}")
+
+
+def encode_objects(objects: Iterable[Any], batch_size: int = 4096) -> Iterator[bytes]:
+    """
+    Lazily encode objects into the snapshot format
+    Args:
+        objects (Iterable[Any]): Car, Bike, Circle, Rectangle, BorderedRectangle, Dog and Cat objects
+        batch_size (int): Records packed into each yielded chunk (default: 4096)
+    Yields:
+        bytes: Successive chunks of the snapshot
+    Raises:
+        TypeError: If an object's class is not supported
+        ValueError: If an attribute does not fit its record field, e.g. a float age or year
+    """
+    strings: Dict[str, int] = {}
+
+    def index(value: str) -> int:
+        position = strings.get(value)
+        if position is None:
+            position = strings[value] = len(strings)
+        return position
+
+    yield SNAPSHOT_HEADER.pack(SNAPSHOT_MAGIC, SNAPSHOT_VERSION, SNAPSHOT_RECORD.size)
+    pack = SNAPSHOT_RECORD.pack
+    count = 0
+    batch = bytearray()
+    for obj in objects:
+        codec = SNAPSHOT_ENCODERS.get(type(obj))
+        if codec is None:
+            raise TypeError(f"Cannot serialize {type(obj).__name__} objects")
+        tag, encode = codec
+        try:
+            batch += pack(tag, *encode(obj, index))
+        except struct.error as e:
+            raise _invalid_field(obj, e) from None
+        count += 1
+        if count % batch_size == 0:
+            yield bytes(batch)
+            batch.clear()
+    yield bytes(batch)
+
+    table = bytearray()
+    for value in strings:
+        encoded = value.encode('utf-8')
+        table += SNAPSHOT_STRING_LENGTH.pack(len(encoded)) + encoded
+    yield bytes(table)
+    table_offset = SNAPSHOT_HEADER.size + count * SNAPSHOT_RECORD.size
+    yield SNAPSHOT_FOOTER.pack(count, table_offset, len(strings), SNAPSHOT_MAGIC)
+
+
+def dump_objects(objects: Iterable[Any], handler: BinaryFileHandler, batch_size: int = 4096) -> int:
+    """
+    Stream objects into a snapshot file
+    Args:
+        objects (Iterable[Any]): Objects supported by encode_objects
+        handler (BinaryFileHandler): Handler for the destination file
+        batch_size (int): Records per write (default: 4096)
+    Returns:
+        int: Number of bytes written
+    Raises:
+        TypeError: If an object's class is not supported
+        ValueError: If an attribute does not fit its record field, e.g. a float age or year
+        IOError: If there's an error writing the file
+    """
+    return handler.write_stream(encode_objects(objects, batch_size))
+
+
+# Random-access reader over a memory-mapped snapshot file
+class SnapshotReader:
+    def __init__(self, handler: BinaryFileHandler):
+        """
+        Initialize a SnapshotReader; use it as a context manager to map the file
+        Args:
+            handler (BinaryFileHandler): Handler for the snapshot file
+        """
+        self.handler = handler
+        self._mapping = None
+        self._view: Optional[memoryview] = None
+        self._count = 0
+        self._strings: List[str] = []
+
+    def __enter__(self) -> "SnapshotReader":
+        """
+        Map the file and decode its string table; records are decoded only on access
+        Returns:
+            SnapshotReader: This reader
+        Raises:
+            FileNotFoundError: If the file does not exist
+            ValueError: If the file is not a snapshot
+        """
+        self._mapping = self.handler.read_mapped()
+        view = self._mapping.__enter__()
+        try:
+            self._open(view)
+        except BaseException:
+            self._mapping.__exit__(None, None, None)
+            raise
+        self._view = view
+        return self
+
+    def _open(self, view: memoryview) -> None:
+        filename = self.handler.filename
+        if len(view) < SNAPSHOT_HEADER.size + SNAPSHOT_FOOTER.size:
+            raise ValueError(f"File {filename} is not an object snapshot")
+        magic, version, record_size = SNAPSHOT_HEADER.unpack_from(view, 0)
+        count, table_offset, string_count, end_magic = SNAPSHOT_FOOTER.unpack_from(
+            view, len(view) - SNAPSHOT_FOOTER.size)
+        if magic != SNAPSHOT_MAGIC or end_magic != SNAPSHOT_MAGIC:
+            raise ValueError(f"File {filename} is not an object snapshot")
+        if version != SNAPSHOT_VERSION or record_size != SNAPSHOT_RECORD.size:
+            raise ValueError(f"Unsupported snapshot version {version} in {filename}")
+        strings = []
+        offset = table_offset
+        for _ in range(string_count):
+            (length,) = SNAPSHOT_STRING_LENGTH.unpack_from(view, offset)
+            offset += SNAPSHOT_STRING_LENGTH.size
+            strings.append(str(view[offset:offset + length], 'utf-8'))
+            offset += length
+        self._count = count
+        self._strings = strings
+
+    def __exit__(self, exc_type, exc_value, traceback) -> None:
+        self._view = None
+        self._mapping.__exit__(exc_type, exc_value, traceback)
+        self._mapping = None
+
+    def __len__(self) -> int:
+        return self._count
+
+    def __getitem__(self, index: int) -> Any:
+        """
+        Decode record N without touching the others
+        Args:
+            index (int): Record number (negative values count from the end)
+        Returns:
+            Any: The decoded object
+        Raises:
+            IndexError: If index is out of range
+            ValueError: If the reader is not open
+        """
+        if self._view is None:
+            raise ValueError("SnapshotReader is not open")
+        if index < 0:
+            index += self._count
+        if not 0 <= index < self._count:
+            raise IndexError("Snapshot record index out of range")
+        fields = SNAPSHOT_RECORD.unpack_from(self._view, SNAPSHOT_HEADER.size + index * SNAPSHOT_RECORD.size)
+        return SNAPSHOT_DECODERS[fields[0]](fields, self._strings)
+
+    def __iter__(self) -> Iterator[Any]:
+        """
+        Decode the records in order
+        Yields:
+            Any: The decoded objects
+        """
+        if self._view is None:
+            raise ValueError("SnapshotReader is not open")
+        unpack_from, strings, view = SNAPSHOT_RECORD.unpack_from, self._strings, self._view
+        for offset in range(SNAPSHOT_HEADER.size, SNAPSHOT_HEADER.size + self._count * SNAPSHOT_RECORD.size,
+                            SNAPSHOT_RECORD.size):
+            fields = unpack_from(view, offset)
+            yield SNAPSHOT_DECODERS[fields[0]](fields, strings)
+
+
+def load_objects(handler: BinaryFileHandler) -> Iterator[Any]:
+    """
+    Stream objects back out of a snapshot file
+    Args:
+        handler (BinaryFileHandler): Handler for the snapshot file
+    Yields:
+        Any: The decoded objects, in the order they were written
+    Raises:
+        FileNotFoundError: If the file does not exist
+        ValueError: If the file is not a snapshot
+    """
+    with SnapshotReader(handler) as reader:
+        yield from reader
@@ -0,0 +1,1044 @@
+# Shape class hierarchies, columnar shape storage, spatial index and area totals
+from __future__ import annotations
+
+from abc import ABC, abstractmethod
+from array import array
+import heapq
+import math
+import operator
+
+from ._common import (cached_description, check_positive_columns, check_same_length, column_error,
+                      described_attribute, gc_paused, positive_columns_error, raise_column_errors,
+                      state_without)
+
+TYPE_CHECKING = False
+if TYPE_CHECKING:
+    from typing import Any, Dict, Iterable, Iterator, List, Optional, Set, Tuple, Union
+
+
+def positive_dimension(name: str, message: str) -> property:
+    """
+    Create a validated property stored in the slot "_<name>" that marks the shape's area dirty
+    Args:
+        name (str): The public attribute name
+        message (str): Error message when a non-positive value is assigned
+    Returns:
+        property: The attribute descriptor
+    """
+    slot = '_' + name
+
+    def set_value(self, value: float) -> None:
+        if value <= 0:
+            raise ValueError(message)
+        setattr(self, slot, value)
+        self._dimensions_changed()
+
+    return property(operator.attrgetter(slot), set_value, doc=f"The {name} of the shape")
+
+
+def _required_bounds(shape: "Shape") -> Tuple[float, float, float, float]:
+    """
+    Get the bounding box of a shape that must be positioned
+    Args:
+        shape (Shape): The shape
+    Returns:
+        Tuple[float, float, float, float]: (min_x, min_y, max_x, max_y)
+    Raises:
+        TypeError: If the shape has no bounds
+    """
+    bounds = shape.get_bounds()
+    if bounds is None:
+        raise TypeError(f"{type(shape).__name__} has no bounds; override get_bounds to position it")
+    return bounds
+
+
+# Abstract base class for shapes
+class Shape(ABC):
+    # Cached area (None when dirty), the ShapeCollection holding the shape, and its position
+    __slots__ = ('_area', '_collection', 'x', 'y')
+
+    def _dimensions_changed(self) -> None:
+        """
+        Mark the cached area dirty and update the owning collection's total
+        """
+        self._area = None
+        if self._collection is not None:
+            self._collection._refresh(self)
+
+    def __getstate__(self) -> Tuple[Optional[Dict[str, Any]], Dict[str, Any]]:
+        # A pickled or copied shape is not a member of the collection, so it does not carry it
+        return state_without(self, '_collection')
+
+    @abstractmethod
+    def calculate_area(self) -> float:
+        """
+        Abstract method to calculate the area of a shape
+        Returns:
+            float: The area of the shape
+        """
+        pass
+
+    def get_description(self) -> str:
+        """
+        Abstract method to get shape description
+        Returns:
+            str: Description of the shape
+        """
+        pass
+
+    def get_bounds(self) -> Optional[Tuple[float, float, float, float]]:
+        """
+        Get the axis-aligned bounding box of the positioned shape
+        Coordinates are optional, so shapes that do not override this have no bounds and
+        cannot be placed in a SpatialIndex.
+        Returns:
+            Optional[Tuple[float, float, float, float]]: (min_x, min_y, max_x, max_y), or None
+        """
+        return None
+
+    def intersects(self, min_x: float, min_y: float, max_x: float, max_y: float) -> bool:
+        """
+        Check whether the shape overlaps an axis-aligned region (exact for rectangles)
+        Args:
+            min_x (float): Left edge of the region
+            min_y (float): Bottom edge of the region
+            max_x (float): Right edge of the region
+            max_y (float): Top edge of the region
+        Returns:
+            bool: True if the shape and region overlap or touch
+        Raises:
+            TypeError: If the shape has no bounds
+        """
+        left, bottom, right, top = _required_bounds(self)
+        return left <= max_x and min_x <= right and bottom <= max_y and min_y <= top
+
+    def distance_to(self, x: float, y: float) -> float:
+        """
+        Get the distance from a point to the shape (exact for rectangles)
+        Args:
+            x (float): X coordinate of the point
+            y (float): Y coordinate of the point
+        Returns:
+            float: 0.0 if the point is inside the shape, otherwise the distance to its edge
+        Raises:
+            TypeError: If the shape has no bounds
+        """
+        left, bottom, right, top = _required_bounds(self)
+        return math.hypot(max(left - x, 0.0, x - right), max(bottom - y, 0.0, y - top))
+
+# Circle class inheriting from Shape
+class Circle(Shape):
+    __slots__ = ('_radius',)
+
+    radius = positive_dimension('radius', "Radius must be positive")
+
+    def __init__(self, radius: float, x: float = 0.0, y: float = 0.0):
+        """
+        Initialize a Circle with radius
+        Args:
+            radius (float): The radius of the circle
+            x (float): X coordinate of the centre (default: 0.0)
+            y (float): Y coordinate of the centre (default: 0.0)
+        """
+        if radius <= 0:
+            raise ValueError("Radius must be positive")
+        self._radius = radius
+        self._area: Optional[float] = None
+        self._collection: Optional["ShapeCollection"] = None
+        self.x = x
+        self.y = y
+
+    @classmethod
+    def from_arrays(cls, radii: Iterable[float], xs: Optional[Iterable[float]] = None,
+                    ys: Optional[Iterable[float]] = None) -> List["Circle"]:
+        """
+        Build many circles, validating each column once instead of each object
+        Args:
+            radii (Iterable[float]): Radii of the circles
+            xs (Optional[Iterable[float]]): X coordinates of the centres (default: all 0.0)
+            ys (Optional[Iterable[float]]): Y coordinates of the centres (default: all 0.0)
+        Returns:
+            List[Circle]: The circles, in column order
+        Raises:
+            ValueError: If columns differ in length or radii are non-positive, listing every bad row
+        """
+        radii = list(radii)
+        xs = [0.0] * len(radii) if xs is None else list(xs)
+        ys = [0.0] * len(radii) if ys is None else list(ys)
+        check_same_length(radii, xs, ys)
+        check_positive_columns("Radius must be positive", radii)
+        new = cls.__new__
+        circles = []
+        with gc_paused():
+            for radius, x, y in zip(radii, xs, ys):
+                circle = new(cls)
+                circle._radius = radius
+                circle._area = None
+                circle._collection = None
+                circle.x = x
+                circle.y = y
+                circles.append(circle)
+        return circles
+
+    def calculate_area(self) -> float:
+        """
+        Calculate the area of the circle (πr²), cached until the radius changes
+        Returns:
+            float: Area of the circle
+        """
+        area = self._area
+        if area is None:
+            area = self._area = math.pi * self._radius ** 2
+        return area
+
+    def get_description(self) -> str:
+        """
+        Get description of the circle
+        Returns:
+            str: Description including radius
+        """
+        return f"Circle with radius {self.radius:.2f}"
+
+    def get_bounds(self) -> Tuple[float, float, float, float]:
+        """
+        Get the bounding box of the circle
+        Returns:
+            Tuple[float, float, float, float]: (min_x, min_y, max_x, max_y)
+        """
+        radius = self._radius
+        return (self.x - radius, self.y - radius, self.x + radius, self.y + radius)
+
+    def intersects(self, min_x: float, min_y: float, max_x: float, max_y: float) -> bool:
+        """
+        Check whether the circle overlaps an axis-aligned region
+        Args:
+            min_x (float): Left edge of the region
+            min_y (float): Bottom edge of the region
+            max_x (float): Right edge of the region
+            max_y (float): Top edge of the region
+        Returns:
+            bool: True if the circle and region overlap or touch
+        """
+        # Distance from the centre to the closest point of the region
+        dx = max(min_x - self.x, 0.0, self.x - max_x)
+        dy = max(min_y - self.y, 0.0, self.y - max_y)
+        return dx * dx + dy * dy <= self._radius * self._radius
+
+    def distance_to(self, x: float, y: float) -> float:
+        """
+        Get the distance from a point to the circle
+        Args:
+            x (float): X coordinate of the point
+            y (float): Y coordinate of the point
+        Returns:
+            float: 0.0 if the point is inside the circle, otherwise the distance to its edge
+        """
+        return max(math.hypot(x - self.x, y - self.y) - self._radius, 0.0)
+
+# Rectangle class inheriting from Shape
+class Rectangle(Shape):
+    __slots__ = ('_width', '_height')
+
+    width = positive_dimension('width', "Width and height must be positive")
+    height = positive_dimension('height', "Width and height must be positive")
+
+    def __init__(self, width: float, height: float, x: float = 0.0, y: float = 0.0):
+        """
+        Initialize a Rectangle with width and height
+        Args:
+            width (float): The width of the rectangle
+            height (float): The height of the rectangle
+            x (float): X coordinate of the bottom-left corner (default: 0.0)
+            y (float): Y coordinate of the bottom-left corner (default: 0.0)
+        """
+        if width <= 0 or height <= 0:
+            raise ValueError("Width and height must be positive")
+        self._width = width
+        self._height = height
+        self._area: Optional[float] = None
+        self._collection: Optional["ShapeCollection"] = None
+        self.x = x
+        self.y = y
+
+    @classmethod
+    def from_arrays(cls, widths: Iterable[float], heights: Iterable[float],
+                    xs: Optional[Iterable[float]] = None,
+                    ys: Optional[Iterable[float]] = None) -> List["Rectangle"]:
+        """
+        Build many rectangles, validating each column once instead of each object
+        Args:
+            widths (Iterable[float]): Widths of the rectangles
+            heights (Iterable[float]): Heights of the rectangles
+            xs (Optional[Iterable[float]]): X coordinates of the bottom-left corners (default: all 0.0)
+            ys (Optional[Iterable[float]]): Y coordinates of the bottom-left corners (default: all 0.0)
+        Returns:
+            List[Rectangle]: The rectangles, in column order
+        Raises:
+            ValueError: If columns differ in length or sides are non-positive, listing every bad row
+        """
+        widths, heights = list(widths), list(heights)
+        xs = [0.0] * len(widths) if xs is None else list(xs)
+        ys = [0.0] * len(widths) if ys is None else list(ys)
+        check_same_length(widths, heights, xs, ys)
+        check_positive_columns("Width and height must be positive", widths, heights)
+        new = cls.__new__
+        rectangles = []
+        with gc_paused():
+            for width, height, x, y in zip(widths, heights, xs, ys):
+                rectangle = new(cls)
+                rectangle._width = width
+                rectangle._height = height
+                rectangle._area = None
+                rectangle._collection = None
+                rectangle.x = x
+                rectangle.y = y
+                rectangles.append(rectangle)
+        return rectangles
+
+    def calculate_area(self) -> float:
+        """
+        Calculate the area of the rectangle (width * height), cached until a side changes
+        Returns:
+            float: Area of the rectangle
+        """
+        area = self._area
+        if area is None:
+            area = self._area = self._width * self._height
+        return area
+
+    def get_description(self) -> str:
+        """
+        Get description of the rectangle
+        Returns:
+            str: Description including width and height
+        """
+        return f"Rectangle with width {self.width:.2f} and height {self.height:.2f}"
+
+    def get_bounds(self) -> Tuple[float, float, float, float]:
+        """
+        Get the bounding box of the rectangle
+        Returns:
+            Tuple[float, float, float, float]: (min_x, min_y, max_x, max_y)
+        """
+        return (self.x, self.y, self.x + self._width, self.y + self._height)
+
+# Columnar container storing circles and rectangles in typed arrays
+class ShapeArray:
+    # Kind codes stored in the order array
+    CIRCLE = 0
+    RECTANGLE = 1
+
+    def __init__(self, shapes: Iterable[Shape] = ()):
+        """
+        Initialize a ShapeArray, optionally from an iterable of shapes
+        Args:
+            shapes (Iterable[Shape]): Circle and Rectangle objects to store
+        Raises:
+            TypeError: If a shape is not a Circle or Rectangle
+        """
+        self.radii = array('d')
+        self.widths = array('d')
+        self.heights = array('d')
+        self.kinds = array('B')
+        # Positions of all shapes in insertion order
+        self.xs = array('d')
+        self.ys = array('d')
+        for shape in shapes:
+            self.append(shape)
+
+    @classmethod
+    def from_columns(cls, radii: Iterable[float] = (), widths: Iterable[float] = (),
+                     heights: Iterable[float] = (), xs: Optional[Iterable[float]] = None,
+                     ys: Optional[Iterable[float]] = None) -> "ShapeArray":
+        """
+        Build a ShapeArray directly from columns of dimensions
+        Args:
+            radii (Iterable[float]): Radii of the circles
+            widths (Iterable[float]): Widths of the rectangles
+            heights (Iterable[float]): Heights of the rectangles
+            xs (Optional[Iterable[float]]): X coordinates, circles first (default: all 0.0)
+            ys (Optional[Iterable[float]]): Y coordinates, circles first (default: all 0.0)
+        Returns:
+            ShapeArray: Circles first, followed by rectangles
+        Raises:
+            ValueError: If a dimension is non-positive or a column has the wrong length
+        """
+        shape_array = cls()
+        shape_array.radii = array('d', radii)
+        shape_array.widths = array('d', widths)
+        shape_array.heights = array('d', heights)
+        if len(shape_array.widths) != len(shape_array.heights):
+            raise ValueError("Widths and heights must have the same length")
+        if shape_array.radii and min(shape_array.radii) <= 0:
+            raise ValueError("Radius must be positive")
+        if shape_array.widths and (min(shape_array.widths) <= 0 or min(shape_array.heights) <= 0):
+            raise ValueError("Width and height must be positive")
+        shape_array.kinds = array('B', [cls.CIRCLE]) * len(shape_array.radii)
+        shape_array.kinds.extend(array('B', [cls.RECTANGLE]) * len(shape_array.widths))
+        count = len(shape_array.kinds)
+        shape_array.xs = array('d', [0.0]) * count if xs is None else array('d', xs)
+        shape_array.ys = array('d', [0.0]) * count if ys is None else array('d', ys)
+        if len(shape_array.xs) != count or len(shape_array.ys) != count:
+            raise ValueError("Coordinates must be given for every shape")
+        return shape_array
+
+    def append(self, shape: Shape) -> None:
+        """
+        Add a single shape to the array
+        Args:
+            shape (Shape): A Circle or Rectangle
+        Raises:
+            TypeError: If the shape is not a Circle or Rectangle
+        """
+        if isinstance(shape, Circle):
+            self.radii.append(shape.radius)
+            self.kinds.append(self.CIRCLE)
+        elif isinstance(shape, Rectangle):
+            self.widths.append(shape.width)
+            self.heights.append(shape.height)
+            self.kinds.append(self.RECTANGLE)
+        else:
+            raise TypeError("ShapeArray only supports Circle and Rectangle shapes")
+        self.xs.append(shape.x)
+        self.ys.append(shape.y)
+
+    def to_shapes(self) -> List[Shape]:
+        """
+        Convert the stored columns back into shape objects
+        Returns:
+            List[Shape]: Circle and Rectangle objects in insertion order
+        """
+        radii = iter(self.radii)
+        dimensions = zip(self.widths, self.heights)
+        shapes: List[Shape] = []
+        for kind, x, y in zip(self.kinds, self.xs, self.ys):
+            if kind == self.CIRCLE:
+                shapes.append(Circle(next(radii), x, y))
+            else:
+                width, height = next(dimensions)
+                shapes.append(Rectangle(width, height, x, y))
+        return shapes
+
+    def calculate_areas(self) -> array:
+        """
+        Calculate the area of every stored shape in one batched pass
+        Returns:
+            array: Areas in insertion order
+        """
+        circle_areas = iter(map(operator.mul, self.radii, self.radii))
+        rectangle_areas = iter(map(operator.mul, self.widths, self.heights))
+        return array('d', [math.pi * next(circle_areas) if kind == self.CIRCLE else next(rectangle_areas)
+                           for kind in self.kinds])
+
+    def calculate_total_area(self, compensated: bool = False, workers: int = 1,
+                             chunk_size: int = 1_000_000) -> float:
+        """
+        Calculate the total area of all stored shapes without per-object dispatch
+        Args:
+            compensated (bool): Sum the per-shape areas with math.fsum (default: False)
+            workers (int): Processes summing column chunks in parallel; above 1 implies compensated
+            chunk_size (int): Values per column chunk sent to a worker (default: 1,000,000)
+        Returns:
+            float: Sum of areas of all shapes
+        """
+        if workers > 1:
+            from concurrent.futures import ProcessPoolExecutor
+
+            radius_chunks = _split(self.radii, chunk_size)
+            width_chunks = _split(self.widths, chunk_size)
+            height_chunks = _split(self.heights, chunk_size)
+            jobs = [(radii, array('d'), array('d')) for radii in radius_chunks]
+            jobs += [(array('d'), widths, heights) for widths, heights in zip(width_chunks, height_chunks)]
+            with ProcessPoolExecutor(max_workers=workers) as pool:
+                return _combine_partials(pool.map(_column_chunk_sum, *zip(*jobs)) if jobs else [])
+        if compensated:
+            return _combine_partials([_column_chunk_sum(self.radii, self.widths, self.heights)])
+        circle_total = math.pi * sum(map(operator.mul, self.radii, self.radii))
+        rectangle_total = sum(map(operator.mul, self.widths, self.heights))
+        return circle_total + rectangle_total
+
+    def __len__(self) -> int:
+        return len(self.kinds)
+
+# Container keeping a running total of its shapes' areas
+class ShapeCollection:
+    def __init__(self, shapes: Iterable[Shape] = ()):
+        """
+        Initialize a ShapeCollection, optionally with shapes
+        Args:
+            shapes (Iterable[Shape]): Shapes to add
+        """
+        self._areas: Dict[Any, float] = {}  # Shape -> area included in the total
+        self._total_area = 0.0
+        for shape in shapes:
+            self.add(shape)
+
+    @property
+    def total_area(self) -> float:
+        """
+        Running total of the areas of all shapes, maintained incrementally
+        Returns:
+            float: Sum of areas of all shapes
+        """
+        return self._total_area
+
+    def add(self, shape: Shape) -> None:
+        """
+        Add a shape and include its area in the total
+        Args:
+            shape (Shape): A shape with area tracking (Circle or either Rectangle)
+        Raises:
+            TypeError: If the shape does not support area tracking
+            ValueError: If the shape already belongs to a collection
+        """
+        if not hasattr(shape, '_collection'):
+            raise TypeError("ShapeCollection only supports shapes with area tracking")
+        if shape._collection is not None:
+            raise ValueError("Shape already belongs to a collection")
+        area = shape.calculate_area()
+        shape._collection = self
+        self._areas[shape] = area
+        self._total_area += area
+
+    def remove(self, shape: Shape) -> None:
+        """
+        Remove a shape and subtract its area from the total
+        Args:
+            shape (Shape): The shape to remove
+        Raises:
+            KeyError: If the shape is not in this collection
+        """
+        if shape._collection is not self:
+            raise KeyError("Shape is not in this collection")
+        self._total_area -= self._areas.pop(shape)
+        shape._collection = None
+
+    def _refresh(self, shape: Shape) -> None:
+        """
+        Called by a shape whose dimensions changed
+        Args:
+            shape (Shape): The changed shape
+        """
+        area = shape.calculate_area()
+        self._total_area += area - self._areas[shape]
+        self._areas[shape] = area
+
+    def recompute(self) -> float:
+        """
+        Recompute the total exactly, discarding rounding drift from incremental updates
+        Returns:
+            float: Sum of areas of all shapes
+        """
+        self._total_area = math.fsum(self._areas.values())
+        return self._total_area
+
+    def __len__(self) -> int:
+        return len(self._areas)
+
+    def __iter__(self) -> Iterator[Shape]:
+        return iter(self._areas)
+
+    def __contains__(self, shape: object) -> bool:
+        return shape in self._areas
+
+    def __setstate__(self, state: Dict[str, Any]) -> None:
+        # Shapes are pickled without their collection, so an unpickled collection claims them again
+        self.__dict__.update(state)
+        for shape in self._areas:
+            shape._collection = self
+
+# Uniform-grid spatial index over positioned shapes
+class SpatialIndex:
+    def __init__(self, cell_size: float = 1.0):
+        """
+        Initialize an empty SpatialIndex
+        Args:
+            cell_size (float): Width and height of each grid cell (default: 1.0)
+        Raises:
+            ValueError: If cell_size is not positive
+        """
+        if cell_size <= 0:
+            raise ValueError("Cell size must be positive")
+        self.cell_size = cell_size
+        self._cells: Dict[Tuple[int, int], Set[Shape]] = {}
+        self._bounds: Dict[Shape, Tuple[float, float, float, float]] = {}  # Shape -> indexed bounds
+        # Cell coordinates covering every shape ever inserted, bounding the nearest() search
+        self._extent: Optional[Tuple[int, int, int, int]] = None
+
+    @classmethod
+    def bulk_load(cls, shapes: Iterable[Shape], cell_size: Optional[float] = None) -> "SpatialIndex":
+        """
+        Build an index from many shapes, choosing a cell size from their extents if not given
+        Args:
+            shapes (Iterable[Shape]): Positioned shapes to index
+            cell_size (Optional[float]): Grid cell size (default: twice the mean shape extent)
+        Returns:
+            SpatialIndex: The populated index
+        Raises:
+            TypeError: If a shape has no bounds
+        """
+        shapes = list(shapes)
+        bounds = [_required_bounds(shape) for shape in shapes]
+        if cell_size is None:
+            extents = [max(right - left, top - bottom) for left, bottom, right, top in bounds]
+            cell_size = 2 * math.fsum(extents) / len(extents) if extents else 1.0
+        index = cls(cell_size)
+        for shape, shape_bounds in zip(shapes, bounds):
+            index._insert(shape, shape_bounds)
+        return index
+
+    def _cell_range(self, min_x: float, min_y: float, max_x: float, max_y: float) -> Iterator[Tuple[int, int]]:
+        size = self.cell_size
+        for cell_x in range(math.floor(min_x / size), math.floor(max_x / size) + 1):
+            for cell_y in range(math.floor(min_y / size), math.floor(max_y / size) + 1):
+                yield (cell_x, cell_y)
+
+    def _insert(self, shape: Shape, bounds: Tuple[float, float, float, float]) -> None:
+        if shape in self._bounds:
+            raise ValueError("Shape is already in the index")
+        self._bounds[shape] = bounds
+        for cell in self._cell_range(*bounds):
+            self._cells.setdefault(cell, set()).add(shape)
+        size = self.cell_size
+        low_x, low_y = math.floor(bounds[0] / size), math.floor(bounds[1] / size)
+        high_x, high_y = math.floor(bounds[2] / size), math.floor(bounds[3] / size)
+        if self._extent is not None:
+            low_x, low_y = min(low_x, self._extent[0]), min(low_y, self._extent[1])
+            high_x, high_y = max(high_x, self._extent[2]), max(high_y, self._extent[3])
+        self._extent = (low_x, low_y, high_x, high_y)
+
+    def insert(self, shape: Shape) -> None:
+        """
+        Add a shape at its current position
+        Args:
+            shape (Shape): The positioned shape
+        Raises:
+            TypeError: If the shape has no bounds
+            ValueError: If the shape is already in the index
+        """
+        self._insert(shape, _required_bounds(shape))
+
+    def insert_many(self, shapes: Iterable[Shape]) -> None:
+        """
+        Add many shapes at their current positions
+        Args:
+            shapes (Iterable[Shape]): The positioned shapes
+        Raises:
+            TypeError: If a shape has no bounds
+            ValueError: If a shape is already in the index
+        """
+        shapes = list(shapes)
+        for shape, bounds in zip(shapes, [_required_bounds(shape) for shape in shapes]):
+            self._insert(shape, bounds)
+
+    def remove(self, shape: Shape) -> None:
+        """
+        Remove a shape
+        Args:
+            shape (Shape): The shape to remove
+        Raises:
+            KeyError: If the shape is not in the index
+        """
+        for cell in self._cell_range(*self._bounds.pop(shape)):
+            members = self._cells[cell]
+            members.discard(shape)
+            if not members:
+                del self._cells[cell]
+
+    def remove_many(self, shapes: Iterable[Shape]) -> None:
+        """
+        Remove many shapes
+        Args:
+            shapes (Iterable[Shape]): The shapes to remove
+        Raises:
+            KeyError: If a shape is not in the index
+        """
+        for shape in shapes:
+            self.remove(shape)
+
+    def update(self, shape: Shape) -> None:
+        """
+        Re-index a shape after it was moved or resized
+        Args:
+            shape (Shape): The changed shape
+        Raises:
+            KeyError: If the shape is not in the index
+        """
+        self.remove(shape)
+        self.insert(shape)
+
+    def query_region(self, min_x: float, min_y: float, max_x: float, max_y: float) -> List[Shape]:
+        """
+        Find the shapes overlapping an axis-aligned region
+        Args:
+            min_x (float): Left edge of the region
+            min_y (float): Bottom edge of the region
+            max_x (float): Right edge of the region
+            max_y (float): Top edge of the region
+        Returns:
+            List[Shape]: Shapes that overlap or touch the region
+        """
+        if self._extent is None:
+            return []
+        # Only cells inside the occupied extent can hold shapes, however large the region is
+        size = self.cell_size
+        low_x, low_y, high_x, high_y = self._extent
+        low_x, low_y = max(low_x, math.floor(min_x / size)), max(low_y, math.floor(min_y / size))
+        high_x, high_y = min(high_x, math.floor(max_x / size)), min(high_y, math.floor(max_y / size))
+        if low_x > high_x or low_y > high_y:
+            return []
+        candidates: Set[Shape] = set()
+        cells = self._cells
+        if (high_x - low_x + 1) * (high_y - low_y + 1) > len(cells):
+            # Fewer occupied cells than cells in the range: scan the occupied ones instead
+            for (cell_x, cell_y), members in cells.items():
+                if low_x <= cell_x <= high_x and low_y <= cell_y <= high_y:
+                    candidates.update(members)
+        else:
+            for cell_x in range(low_x, high_x + 1):
+                for cell_y in range(low_y, high_y + 1):
+                    members = cells.get((cell_x, cell_y))
+                    if members:
+                        candidates.update(members)
+        return [shape for shape in candidates if shape.intersects(min_x, min_y, max_x, max_y)]
+
+    def total_area_in_region(self, min_x: float, min_y: float, max_x: float, max_y: float,
+                             contained: bool = False) -> float:
+        """
+        Sum the areas of the shapes in a region
+        Args:
+            min_x (float): Left edge of the region
+            min_y (float): Bottom edge of the region
+            max_x (float): Right edge of the region
+            max_y (float): Top edge of the region
+            contained (bool): Count only shapes lying entirely inside the region
+                (default: False, which counts every overlapping shape in full)
+        Returns:
+            float: Sum of the areas of the matching shapes
+        """
+        shapes = self.query_region(min_x, min_y, max_x, max_y)
+        if contained:
+            bounds = self._bounds
+            shapes = [shape for shape in shapes
+                      if min_x <= bounds[shape][0] and min_y <= bounds[shape][1]
+                      and bounds[shape][2] <= max_x and bounds[shape][3] <= max_y]
+        return math.fsum(shape.calculate_area() for shape in shapes)
+
+    def nearest(self, x: float, y: float, count: int = 1) -> List[Shape]:
+        """
+        Find the shapes closest to a point, searching outwards ring by ring of cells
+        Args:
+            x (float): X coordinate of the point
+            y (float): Y coordinate of the point
+            count (int): Number of shapes to return (default: 1)
+        Returns:
+            List[Shape]: Up to count shapes, nearest first
+        """
+        if count <= 0 or not self._cells:
+            return []
+        size = self.cell_size
+        centre_x, centre_y = math.floor(x / size), math.floor(y / size)
+        # Rings before the first and beyond the last reach of the extent hold no occupied cell
+        extent = low_x, low_y, high_x, high_y = self._extent
+        min_ring = max(low_x - centre_x, centre_x - high_x, low_y - centre_y, centre_y - high_y, 0)
+        max_ring = max(centre_x - low_x, high_x - centre_x, centre_y - low_y, high_y - centre_y, 0)
+        seen: Set[Shape] = set()
+        found: List[Tuple[float, int, Shape]] = []
+        for ring in range(min_ring, max_ring + 1):
+            for cell in self._ring(centre_x, centre_y, ring, extent):
+                for shape in self._cells.get(cell, ()):
+                    if shape not in seen:
+                        seen.add(shape)
+                        found.append((shape.distance_to(x, y), id(shape), shape))
+            # Anything not yet seen lies at least ring * cell_size away
+            if len(found) >= count and heapq.nsmallest(count, found)[-1][0] <= ring * size:
+                break
+        return [shape for _, _, shape in heapq.nsmallest(count, found)]
+
+    @staticmethod
+    def _ring(centre_x: int, centre_y: int, ring: int,
+              extent: Tuple[int, int, int, int]) -> Iterator[Tuple[int, int]]:
+        """
+        Yield the cells of a square ring around a centre cell that lie inside an extent
+        Args:
+            centre_x (int): X cell coordinate of the centre
+            centre_y (int): Y cell coordinate of the centre
+            ring (int): Distance of the ring from the centre, in cells
+            extent (Tuple[int, int, int, int]): Lowest and highest cell coordinates to yield
+        Yields:
+            Tuple[int, int]: Cell coordinates
+        """
+        low_x, low_y, high_x, high_y = extent
+        left, right = centre_x - ring, centre_x + ring
+        bottom, top = centre_y - ring, centre_y + ring
+        # Bottom and top rows, clipped to the extent
+        for cell_y in ((bottom,) if ring == 0 else (bottom, top)):
+            if low_y <= cell_y <= high_y:
+                for cell_x in range(max(left, low_x), min(right, high_x) + 1):
+                    yield (cell_x, cell_y)
+        # Left and right columns without their corners, clipped to the extent
+        if ring:
+            for cell_x in (left, right):
+                if low_x <= cell_x <= high_x:
+                    for cell_y in range(max(bottom + 1, low_y), min(top - 1, high_y) + 1):
+                        yield (cell_x, cell_y)
+
+    def __len__(self) -> int:
+        return len(self._bounds)
+
+    def __contains__(self, shape: object) -> bool:
+        return shape in self._bounds
+
+# Helpers for compensated and parallel summation
+def _split(values: Any, chunk_size: int) -> List[Any]:
+    """
+    Split a sequence into consecutive chunks
+    Args:
+        values (Any): A list or array
+        chunk_size (int): Maximum chunk length
+    Returns:
+        List[Any]: The chunks
+    Raises:
+        ValueError: If chunk_size is not positive
+    """
+    if chunk_size <= 0:
+        raise ValueError("Chunk size must be positive")
+    return [values[i:i + chunk_size] for i in range(0, len(values), chunk_size)]
+
+
+def _exact_partials(areas: List[float]) -> Tuple[float, float]:
+    """
+    Represent the exact sum of some areas as a correctly rounded sum plus its rounding error
+    Args:
+        areas (List[float]): The areas (the list is extended in place)
+    Returns:
+        Tuple[float, float]: (sum, remainder) whose exact total equals the areas' exact total
+            to within the rounding of the remainder
+    """
+    total = math.fsum(areas)
+    areas.append(-total)
+    return total, math.fsum(areas)
+
+
+def _shape_chunk_sum(shapes: List[Shape]) -> Tuple[float, float]:
+    """
+    Worker summing the areas of a chunk of shape objects
+    Args:
+        shapes (List[Shape]): The chunk
+    Returns:
+        Tuple[float, float]: Partials from _exact_partials
+    """
+    return _exact_partials([shape.calculate_area() for shape in shapes])
+
+
+def _column_chunk_sum(radii: array, widths: array, heights: array) -> Tuple[float, float]:
+    """
+    Worker summing the areas described by chunks of ShapeArray columns
+    Args:
+        radii (array): Circle radii
+        widths (array): Rectangle widths
+        heights (array): Rectangle heights
+    Returns:
+        Tuple[float, float]: Partials from _exact_partials
+    """
+    # math.pi * (r * r) matches Circle.calculate_area exactly
+    areas = [math.pi * square for square in map(operator.mul, radii, radii)]
+    areas.extend(map(operator.mul, widths, heights))
+    return _exact_partials(areas)
+
+
+def _combine_partials(partials: Iterable[Tuple[float, float]]) -> float:
+    """
+    Combine per-chunk partials into one correctly rounded total, independent of the chunking
+    Args:
+        partials (Iterable[Tuple[float, float]]): Partials from the workers
+    Returns:
+        float: The total
+    """
+    return math.fsum(value for pair in partials for value in pair)
+
+
+# Function to calculate total area of all shapes
+def calculate_total_area(shapes: Union[List[Shape], ShapeArray, ShapeCollection],
+                         compensated: bool = False, workers: int = 1, chunk_size: int = 100_000) -> float:
+    """
+    Calculate the total area of all shapes in the list using polymorphism
+    Args:
+        shapes (Union[List[Shape], ShapeArray, ShapeCollection]): Shape objects, a ShapeArray or a ShapeCollection
+        compensated (bool): Sum with math.fsum so rounding error does not accumulate (default: False)
+        workers (int): Processes summing chunks in parallel; above 1 implies compensated (default: 1)
+        chunk_size (int): Shapes per chunk sent to a worker (default: 100,000)
+    Returns:
+        float: Sum of areas of all shapes
+    """
+    if isinstance(shapes, ShapeArray):
+        return shapes.calculate_total_area(compensated, workers, chunk_size)
+    if isinstance(shapes, ShapeCollection):
+        return shapes.recompute() if compensated or workers > 1 else shapes.total_area
+    if workers > 1:
+        from concurrent.futures import ProcessPoolExecutor
+
+        # Shapes are pickled to the workers; a ShapeArray ships far less data
+        with ProcessPoolExecutor(max_workers=workers) as pool:
+            return _combine_partials(pool.map(_shape_chunk_sum, _split(list(shapes), chunk_size)))
+    if compensated:
+        return _combine_partials([_shape_chunk_sum(list(shapes))])
+    total_area = 0.0
+    for shape in shapes:
+        total_area += shape.calculate_area()
+    return total_area
+
+
+# Abstract base class for shapes with a color and a border
+class StyledShape(ABC):
+    __slots__ = ('_color', '_border_width', '_description')
+
+    color = described_attribute('color')
+    border_width = described_attribute('border_width')
+
+    def __init__(self, color: str = "Unknown", border_width: float = 1.0):
+        """
+        Initialize a Shape with common attributes
+        Args:
+            color (str): The color of the shape (default: "Unknown")
+            border_width (float): The width of the shape's border (default: 1.0)
+        Raises:
+            ValueError: If border_width is negative
+        """
+        if border_width < 0:
+            raise ValueError("Border width cannot be negative")
+        self._color = color
+        self._border_width = border_width
+        self._description = None
+
+    @abstractmethod
+    def calculate_area(self) -> float:
+        """
+        Abstract method to calculate the area of the shape
+        Returns:
+            float: The area of the shape (0.0 in base class as it's abstract)
+        """
+        # Base implementation does nothing but can be called by subclasses
+        return 0.0
+
+    @cached_description
+    def get_description(self) -> str:
+        """
+        Get description of the shape
+        Returns:
+            str: Description including color and border width
+        """
+        return f"Shape with color {self.color} and border width {self.border_width:.2f}"
+
+
+# Derived Rectangle class inheriting from StyledShape
+class BorderedRectangle(StyledShape):
+    __slots__ = ('_width', '_height', '_area', '_collection')
+
+    width = positive_dimension('width', "Width and height must be positive")
+    height = positive_dimension('height', "Width and height must be positive")
+
+    def __init__(self, width: float, height: float, color: str = "Unknown", border_width: float = 1.0):
+        """
+        Initialize a Rectangle with width, height, and inherited attributes
+        Args:
+            width (float): The width of the rectangle
+            height (float): The height of the rectangle
+            color (str): The color of the rectangle (passed to base class)
+            border_width (float): The border width (passed to base class)
+        Raises:
+            ValueError: If width or height is non-positive
+        """
+        # Call the parent class's __init__ using super()
+        super().__init__(color, border_width)
+
+        # Validate rectangle-specific attributes
+        if width <= 0 or height <= 0:
+            raise ValueError("Width and height must be positive")
+        self._width = width
+        self._height = height
+        self._area: Optional[float] = None
+        self._collection: Optional["ShapeCollection"] = None
+
+    @classmethod
+    def from_arrays(cls, widths: Iterable[float], heights: Iterable[float],
+                    colors: Optional[Iterable[str]] = None,
+                    border_widths: Optional[Iterable[float]] = None) -> List["BorderedRectangle"]:
+        """
+        Build many rectangles, validating each column once instead of each object
+        Args:
+            widths (Iterable[float]): Widths of the rectangles
+            heights (Iterable[float]): Heights of the rectangles
+            colors (Optional[Iterable[str]]): Colors of the rectangles (default: all "Unknown")
+            border_widths (Optional[Iterable[float]]): Border widths (default: all 1.0)
+        Returns:
+            List[BorderedRectangle]: The rectangles, in column order
+        Raises:
+            ValueError: If columns differ in length, sides are non-positive or border widths
+                are negative, listing every bad row
+        """
+        widths, heights = list(widths), list(heights)
+        colors = ["Unknown"] * len(widths) if colors is None else list(colors)
+        border_widths = [1.0] * len(widths) if border_widths is None else list(border_widths)
+        check_same_length(widths, heights, colors, border_widths)
+        raise_column_errors(
+            positive_columns_error("Width and height must be positive", widths, heights),
+            column_error(border_widths, lambda border_width: border_width >= 0, "Border width cannot be negative")
+            if border_widths and min(border_widths) < 0 else None)
+        new = cls.__new__
+        rectangles = []
+        with gc_paused():
+            for width, height, color, border_width in zip(widths, heights, colors, border_widths):
+                rectangle = new(cls)
+                rectangle._color = color
+                rectangle._border_width = border_width
+                rectangle._description = None
+                rectangle._width = width
+                rectangle._height = height
+                rectangle._area = None
+                rectangle._collection = None
+                rectangles.append(rectangle)
+        return rectangles
+
+    def _dimensions_changed(self) -> None:
+        """
+        Mark the cached area and description dirty and update the owning collection's total
+        """
+        self._area = None
+        self._description = None
+        if self._collection is not None:
+            self._collection._refresh(self)
+
+    def __getstate__(self) -> Tuple[Optional[Dict[str, Any]], Dict[str, Any]]:
+        return state_without(self, '_collection')
+
+    def calculate_area(self) -> float:
+        """
+        Calculate the area of the rectangle, utilizing the base class method
+        The result is cached until width or height changes.
+        Returns:
+            float: Area of the rectangle (width * height)
+        """
+        if self._area is not None:
+            return self._area
+
+        # Call the parent class's calculate_area method
+        # Note: In this case, it returns 0.0 but demonstrates the use of super()
+        base_area = super().calculate_area()
+
+        # Calculate rectangle-specific area
+        rect_area = self._width * self._height
+
+        # Return the rectangle's area (base_area is 0.0 but included for demonstration)
+        self._area = base_area + rect_area
+        return self._area
+
+    @cached_description
+    def get_description(self) -> str:
+        """
+        Get detailed description of the rectangle
+        Returns:
+            str: Description including width, height, color, and border width
+        """
+        return (f"Rectangle with width {self.width:.2f}, height {self.height:.2f}, "
+                f"color {self.color}, and border width {self.border_width:.2f}")
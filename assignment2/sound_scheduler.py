@@ -0,0 +1,195 @@
+# Single event loop scheduler making large animal populations sound on their own intervals
+from __future__ import annotations
+
+import asyncio
+import heapq
+from itertools import chain, islice
+
+from .animals import Animal, process_sounds
+
+TYPE_CHECKING = False
+if TYPE_CHECKING:
+    from typing import Awaitable, Callable, Dict, Iterable, List, Optional, Tuple
+
+
+# Scheduler driving every animal from one asyncio task and a heap of due ticks
+class SoundScheduler:
+    def __init__(self, sink: Callable[[List[str]], Awaitable[None]], tick_seconds: float = 0.0,
+                 batch_size: int = 4096):
+        """
+        Initialize a SoundScheduler
+        Animals with the same interval that are due at the same tick share a single heap entry,
+        so the agenda holds one entry per (tick, interval) cohort instead of one per animal.
+        Args:
+            sink (Callable[[List[str]], Awaitable[None]]): Coroutine function receiving each batch
+                of process_sound lines, e.g. the put method of a bounded asyncio.Queue; the
+                scheduler waits for it, so a slow sink slows the simulation down
+            tick_seconds (float): Wall-clock length of a tick; 0.0 runs the simulation as fast as
+                the sink accepts lines (default: 0.0)
+            batch_size (int): Maximum number of lines passed to the sink at once (default: 4096)
+        Raises:
+            ValueError: If tick_seconds is negative or batch_size is not positive
+        """
+        if tick_seconds < 0:
+            raise ValueError("Tick length cannot be negative")
+        if batch_size <= 0:
+            raise ValueError("Batch size must be positive")
+        self.sink = sink
+        self.tick_seconds = tick_seconds
+        self.batch_size = batch_size
+        self.current_tick = 0
+        self.sounds = 0
+        self.batches = 0
+        self.sink_wait = 0.0
+        self.max_lag = 0.0
+        # Animals due at each (tick, interval), and a heap of those keys
+        self._cohorts: Dict[Tuple[int, int], List[Animal]] = {}
+        self._agenda: List[Tuple[int, int]] = []
+
+    def _schedule(self, tick: int, interval: int, animals: List[Animal]) -> None:
+        key = (tick, interval)
+        cohort = self._cohorts.get(key)
+        if cohort is None:
+            self._cohorts[key] = animals
+            heapq.heappush(self._agenda, key)
+        elif len(cohort) >= len(animals):
+            cohort.extend(animals)
+        else:
+            # Keep the larger list and copy the smaller one into it
+            animals.extend(cohort)
+            self._cohorts[key] = animals
+
+    def add(self, animal: Animal, interval: int, start: Optional[int] = None) -> None:
+        """
+        Schedule one animal to make a sound every interval ticks
+        Args:
+            animal (Animal): Object that implements make_sound
+            interval (int): Ticks between its sounds
+            start (Optional[int]): Tick of its first sound (default: one interval from now)
+        Raises:
+            ValueError: If interval is not positive or start is in the past
+        """
+        self.add_many((animal,), interval, start)
+
+    def add_many(self, animals: Iterable[Animal], interval: int, start: Optional[int] = None,
+                 spread: bool = False) -> int:
+        """
+        Schedule many animals sharing an interval
+        Args:
+            animals (Iterable[Animal]): Objects that implement make_sound
+            interval (int): Ticks between the sounds of each animal
+            start (Optional[int]): Tick of the first sounds (default: one interval from now)
+            spread (bool): Stagger the animals over the interval's ticks instead of making them all
+                sound at once, one cohort per tick (default: False)
+        Returns:
+            int: Number of animals added
+        Raises:
+            ValueError: If interval is not positive or start is in the past
+        """
+        if interval <= 0:
+            raise ValueError("Interval must be positive")
+        if start is None:
+            start = self.current_tick + interval
+        elif start < self.current_tick:
+            raise ValueError("Start tick cannot be in the past")
+        animals = list(animals)
+        if not animals:
+            return 0
+        if not spread:
+            self._schedule(start, interval, animals)
+        else:
+            for offset in range(min(interval, len(animals))):
+                self._schedule(start + offset, interval, animals[offset::interval])
+        return len(animals)
+
+    def __len__(self) -> int:
+        return sum(map(len, self._cohorts.values()))
+
+    def next_tick(self) -> Optional[int]:
+        """
+        Get the next tick at which any animal is due
+        Returns:
+            Optional[int]: The tick, or None if no animal is scheduled
+        """
+        return self._agenda[0][0] if self._agenda else None
+
+    async def _emit(self, animals: Iterable[Animal]) -> None:
+        """
+        Pass the process_sound lines of the due animals to the sink in batches
+        Args:
+            animals (Iterable[Animal]): The animals due at the current tick
+        Raises:
+            AttributeError: If an object doesn't have a make_sound method
+        """
+        loop = asyncio.get_running_loop()
+        lines = process_sounds(animals)
+        while True:
+            batch = list(islice(lines, self.batch_size))
+            if not batch:
+                return
+            started = loop.time()
+            await self.sink(batch)
+            self.sink_wait += loop.time() - started
+            self.sounds += len(batch)
+            self.batches += 1
+
+    async def run(self, ticks: int) -> int:
+        """
+        Advance the simulation, emitting the sounds of every animal due in the next ticks
+        Ticks at which no animal is due are skipped without waking up.
+        Args:
+            ticks (int): Number of ticks to advance
+        Returns:
+            int: Number of sounds emitted
+        Raises:
+            ValueError: If ticks is negative
+            AttributeError: If an object doesn't have a make_sound method
+        """
+        if ticks < 0:
+            raise ValueError("Ticks cannot be negative")
+        loop = asyncio.get_running_loop()
+        end = self.current_tick + ticks
+        # Wall-clock time of tick 0 for this run
+        origin = loop.time() - self.current_tick * self.tick_seconds
+        emitted = self.sounds
+        agenda = self._agenda
+        while agenda and agenda[0][0] <= end:
+            tick = agenda[0][0]
+            if self.tick_seconds:
+                delay = origin + tick * self.tick_seconds - loop.time()
+                if delay > 0:
+                    await asyncio.sleep(delay)
+                else:
+                    self.max_lag = max(self.max_lag, -delay)
+            else:
+                # Let other tasks, such as the sink's consumer, run between ticks
+                await asyncio.sleep(0)
+            self.current_tick = tick
+            due = []
+            while agenda and agenda[0][0] == tick:
+                key = heapq.heappop(agenda)
+                due.append((key[1], self._cohorts.pop(key)))
+            try:
+                await self._emit(chain.from_iterable(animals for _, animals in due))
+            finally:
+                # Rescheduling can merge lists, so it waits until they have been read
+                for interval, animals in due:
+                    self._schedule(tick + interval, interval, animals)
+        if self.tick_seconds:
+            delay = origin + end * self.tick_seconds - loop.time()
+            if delay > 0:
+                await asyncio.sleep(delay)
+        self.current_tick = end
+        return self.sounds - emitted
+
+    def stats(self) -> Dict[str, float]:
+        """
+        Get scheduler counters
+        Returns:
+            Dict[str, float]: Current tick, scheduled animals and cohorts, sounds and batches
+                emitted, seconds spent waiting for the sink and the largest delay behind the
+                wall clock
+        """
+        return {"tick": self.current_tick, "animals": len(self), "cohorts": len(self._cohorts),
+                "sounds": self.sounds, "batches": self.batches, "sink_wait": self.sink_wait,
+                "max_lag": self.max_lag}
@@ -0,0 +1,412 @@
+# Vehicle class hierarchy and indexed fleet
+from __future__ import annotations
+
+from bisect import bisect_left, bisect_right, insort
+
+from ._common import cached_description, described_attribute, state_without
+
+TYPE_CHECKING = False
+if TYPE_CHECKING:
+    from typing import Any, Dict, Iterable, Iterator, List, Optional, Set, Tuple, Union
+
+
+def _reindex_in_fleet(vehicle: "Vehicle") -> None:
+    """
+    Refresh a vehicle's fleet indexes after its brand, model or year changes
+    Args:
+        vehicle (Vehicle): The changed vehicle
+    """
+    if vehicle._fleet is not None:
+        vehicle._fleet.reindex(vehicle)
+
+
+# Base class for vehicles
+class Vehicle:
+    # Slots keep instances compact (no per-instance __dict__)
+    __slots__ = ('_brand', '_model', '_year', '_is_running', '_fleet', '_description')
+
+    brand = described_attribute('brand', _reindex_in_fleet)
+    model = described_attribute('model', _reindex_in_fleet)
+    year = described_attribute('year', _reindex_in_fleet)
+
+    def __init__(self, brand: str, model: str, year: int):
+        """
+        Initialize a Vehicle with basic attributes
+        Args:
+            brand (str): The manufacturer of the vehicle
+            model (str): The model name of the vehicle
+            year (int): The manufacturing year
+        """
+        self._brand = brand
+        self._model = model
+        self._year = year
+        self._is_running = False
+        self._fleet: Optional["Fleet"] = None
+        self._description = None
+
+    def __getstate__(self) -> Tuple[Optional[Dict[str, Any]], Dict[str, Any]]:
+        # A pickled or copied vehicle is not a member of the fleet, so it does not carry it
+        return state_without(self, '_fleet')
+
+    @property
+    def is_running(self) -> bool:
+        """
+        Whether the engine is running
+        Returns:
+            bool: The engine state
+        """
+        return self._is_running
+
+    @is_running.setter
+    def is_running(self, value: bool) -> None:
+        """
+        Set the engine state, keeping the owning fleet's index up to date
+        Args:
+            value (bool): The new engine state
+        """
+        if value != self._is_running:
+            self._is_running = value
+            if self._fleet is not None:
+                self._fleet._update_running(self)
+
+    def start_engine(self) -> str:
+        """
+        Base method to start the vehicle engine
+        Returns:
+            str: Description of the engine starting
+        """
+        self.is_running = True
+        return self.start_message()
+
+    def stop_engine(self) -> str:
+        """
+        Method to stop the vehicle engine
+        Returns:
+            str: Description of the engine stopping
+        """
+        self.is_running = False
+        return self.stop_message()
+
+    def start_message(self) -> str:
+        """
+        Base method to format the engine start message without changing any state
+        Returns:
+            str: Description of the engine starting
+        """
+        return f"{self.brand} {self.model}'s engine is starting..."
+
+    def stop_message(self) -> str:
+        """
+        Format the engine stop message without changing any state
+        Returns:
+            str: Description of the engine stopping
+        """
+        return f"{self.brand} {self.model}'s engine is stopping..."
+
+    @cached_description
+    def get_description(self) -> str:
+        """
+        Base method to get vehicle description
+        Returns:
+            str: Basic description of the vehicle
+        """
+        return f"This is a {self.year} {self.brand} {self.model} vehicle"
+# Car subclass inheriting from Vehicle
+class Car(Vehicle):
+    __slots__ = ('_num_doors',)
+
+    num_doors = described_attribute('num_doors')
+
+    def __init__(self, brand: str, model: str, year: int, num_doors: int):
+        """
+        Initialize a Car with additional door attribute
+        Args:
+            brand (str): The manufacturer of the car
+            model (str): The model name of the car
+            year (int): The manufacturing year
+            num_doors (int): Number of doors in the car
+        """
+        super().__init__(brand, model, year)
+        self._num_doors = num_doors
+
+    def start_message(self) -> str:
+        """
+        Override start_message to provide car-specific behavior
+        Returns:
+            str: Car-specific engine start description
+        """
+        return f"{self.brand} {self.model}'s V6 engine roars to life!"
+
+    @cached_description
+    def get_description(self) -> str:
+        """
+        Override get_description to include car-specific details
+        Returns:
+            str: Detailed description of the car
+        """
+        return f"This is a {self.year} {self.brand} {self.model} car with {self.num_doors} doors"
+# Bike subclass inheriting from Vehicle
+class Bike(Vehicle):
+    __slots__ = ('_has_sidecar',)
+
+    has_sidecar = described_attribute('has_sidecar')
+
+    def __init__(self, brand: str, model: str, year: int, has_sidecar: bool):
+        """
+        Initialize a Bike with sidecar attribute
+        Args:
+            brand (str): The manufacturer of the bike
+            model (str): The model name of the bike
+            year (int): The manufacturing year
+            has_sidecar (bool): Whether the bike has a sidecar
+        """
+        super().__init__(brand, model, year)
+        self._has_sidecar = has_sidecar
+
+    def start_message(self) -> str:
+        """
+        Override start_message to provide bike-specific behavior
+        Returns:
+            str: Bike-specific engine start description
+        """
+        return f"{self.brand} {self.model}'s motorcycle engine revs up!"
+
+    @cached_description
+    def get_description(self) -> str:
+        """
+        Override get_description to include bike-specific details
+        Returns:
+            str: Detailed description of the bike
+        """
+        sidecar_status = "with" if self.has_sidecar else "without"
+        return f"This is a {self.year} {self.brand} {self.model} motorcycle {sidecar_status} a sidecar"
+# Container for vehicles with secondary indexes for fast lookup
+class Fleet:
+    def __init__(self, vehicles: Iterable[Vehicle] = ()):
+        """
+        Initialize a Fleet, optionally with vehicles
+        Args:
+            vehicles (Iterable[Vehicle]): Vehicles to add
+        """
+        self._vehicles: Dict[Vehicle, tuple] = {}  # Vehicle -> indexed (brand, model, year)
+        self._by_brand: Dict[str, Set[Vehicle]] = {}
+        self._by_model: Dict[str, Set[Vehicle]] = {}
+        self._by_year: Dict[int, Set[Vehicle]] = {}
+        self._years: List[int] = []  # Sorted distinct years, for range queries
+        self._running: Set[Vehicle] = set()
+        for vehicle in vehicles:
+            self.add(vehicle)
+
+    def __setstate__(self, state: Dict[str, Any]) -> None:
+        # Vehicles are pickled without their fleet, so an unpickled fleet claims them again
+        self.__dict__.update(state)
+        for vehicle in self._vehicles:
+            vehicle._fleet = self
+
+    def add(self, vehicle: Vehicle) -> None:
+        """
+        Add a vehicle and index it
+        Args:
+            vehicle (Vehicle): The vehicle to add
+        Raises:
+            TypeError: If vehicle is not a Vehicle
+            ValueError: If the vehicle already belongs to a fleet
+        """
+        if not isinstance(vehicle, Vehicle):
+            raise TypeError("Fleet can only contain Vehicle objects")
+        if vehicle._fleet is not None:
+            raise ValueError("Vehicle already belongs to a fleet")
+        vehicle._fleet = self
+        self._index(vehicle)
+
+    def remove(self, vehicle: Vehicle) -> None:
+        """
+        Remove a vehicle and its index entries
+        Args:
+            vehicle (Vehicle): The vehicle to remove
+        Raises:
+            KeyError: If the vehicle is not in this fleet
+        """
+        if vehicle._fleet is not self:
+            raise KeyError("Vehicle is not in this fleet")
+        self._unindex(vehicle)
+        vehicle._fleet = None
+
+    def reindex(self, vehicle: Vehicle) -> None:
+        """
+        Refresh the index entries of a vehicle (done automatically when brand, model or year is reassigned)
+        Args:
+            vehicle (Vehicle): The vehicle to reindex
+        Raises:
+            KeyError: If the vehicle is not in this fleet
+        """
+        self.remove(vehicle)
+        self.add(vehicle)
+
+    def _index(self, vehicle: Vehicle) -> None:
+        # Remember the indexed keys so removal still works after reassignment
+        keys = (vehicle.brand, vehicle.model, vehicle.year)
+        self._vehicles[vehicle] = keys
+        for index, key in zip((self._by_brand, self._by_model, self._by_year), keys):
+            if index is self._by_year and key not in index:
+                insort(self._years, key)
+            index.setdefault(key, set()).add(vehicle)
+        if vehicle.is_running:
+            self._running.add(vehicle)
+
+    def _unindex(self, vehicle: Vehicle) -> None:
+        keys = self._vehicles.pop(vehicle)
+        for index, key in zip((self._by_brand, self._by_model, self._by_year), keys):
+            members = index[key]
+            members.discard(vehicle)
+            if not members:
+                del index[key]
+                if index is self._by_year:
+                    self._years.pop(bisect_left(self._years, key))
+        self._running.discard(vehicle)
+
+    def _update_running(self, vehicle: Vehicle) -> None:
+        """
+        Called by Vehicle when its engine state flips
+        Args:
+            vehicle (Vehicle): The vehicle whose state changed
+        """
+        if vehicle.is_running:
+            self._running.add(vehicle)
+        else:
+            self._running.discard(vehicle)
+
+    def query(self, brand: Optional[str] = None, model: Optional[str] = None,
+              year_min: Optional[int] = None, year_max: Optional[int] = None,
+              is_running: Optional[bool] = None) -> List[Vehicle]:
+        """
+        Find vehicles matching every given criterion using the indexes
+        Args:
+            brand (Optional[str]): Exact brand to match
+            model (Optional[str]): Exact model to match
+            year_min (Optional[int]): Earliest year, inclusive
+            year_max (Optional[int]): Latest year, inclusive
+            is_running (Optional[bool]): Engine state to match
+        Returns:
+            List[Vehicle]: The matching vehicles
+        """
+        candidates: List[Set[Vehicle]] = []
+        if brand is not None:
+            candidates.append(self._by_brand.get(brand, set()))
+        if model is not None:
+            candidates.append(self._by_model.get(model, set()))
+        if year_min is not None or year_max is not None:
+            start = 0 if year_min is None else bisect_left(self._years, year_min)
+            stop = len(self._years) if year_max is None else bisect_right(self._years, year_max)
+            in_range: Set[Vehicle] = set()
+            for year in self._years[start:stop]:
+                in_range.update(self._by_year[year])
+            candidates.append(in_range)
+        if is_running is True:
+            candidates.append(self._running)
+
+        if not candidates:
+            matches = set(self._vehicles)
+        else:
+            # Intersect starting from the smallest candidate set
+            candidates.sort(key=len)
+            matches = set(candidates[0])
+            for members in candidates[1:]:
+                matches.intersection_update(members)
+        if is_running is False:
+            matches.difference_update(self._running)
+        return list(matches)
+
+    def __len__(self) -> int:
+        return len(self._vehicles)
+
+    def __iter__(self) -> Iterator[Vehicle]:
+        return iter(self._vehicles)
+
+    def __contains__(self, vehicle: object) -> bool:
+        return vehicle in self._vehicles
+# Functions to start or stop many vehicles at once
+def _run_engine_batch(vehicles: Iterable[Vehicle], method_name: str, max_workers: int,
+                      chunk_size: int, timeout: Optional[float]) -> List[Union[str, Exception]]:
+    """
+    Call an engine method on every vehicle, chunked across a thread pool
+    Args:
+        vehicles (Iterable[Vehicle]): The vehicles to operate on
+        method_name (str): "start_engine" or "stop_engine"
+        max_workers (int): Number of worker threads (1 runs inline)
+        chunk_size (int): Vehicles handled per task
+        timeout (Optional[float]): Seconds to wait for the whole batch; on timeout, chunks not
+            yet started are cancelled and chunks already running still finish in the background
+    Returns:
+        List[Union[str, Exception]]: Message or raised exception per vehicle, in input order
+    Raises:
+        ValueError: If max_workers or chunk_size is not positive
+        TimeoutError: If the batch does not finish within timeout
+    """
+    if max_workers <= 0 or chunk_size <= 0:
+        raise ValueError("max_workers and chunk_size must be positive")
+    vehicles = list(vehicles)
+
+    def run_chunk(chunk: List[Vehicle]) -> List[Union[str, Exception]]:
+        results: List[Union[str, Exception]] = []
+        for vehicle in chunk:
+            try:
+                results.append(getattr(vehicle, method_name)())
+            except Exception as e:
+                # Record the failure and carry on with the rest of the batch
+                results.append(e)
+        return results
+
+    chunks = [vehicles[i:i + chunk_size] for i in range(0, len(vehicles), chunk_size)]
+    if max_workers == 1 or len(chunks) <= 1:
+        return run_chunk(vehicles)
+    # Threads rather than processes: the engine state must change on these very objects
+    from concurrent.futures import ThreadPoolExecutor
+
+    pool = ThreadPoolExecutor(max_workers=max_workers)
+    try:
+        results = [result for chunk_results in pool.map(run_chunk, chunks, timeout=timeout)
+                   for result in chunk_results]
+    except BaseException:
+        # Return at once rather than waiting for the batch: queued chunks are cancelled, while
+        # chunks already running cannot be interrupted and finish in the background
+        pool.shutdown(wait=False, cancel_futures=True)
+        raise
+    pool.shutdown()
+    return results
+
+
+def start_all(vehicles: Iterable[Vehicle], max_workers: int = 4, chunk_size: int = 1024,
+              timeout: Optional[float] = None) -> List[Union[str, Exception]]:
+    """
+    Start the engines of many vehicles
+    Args:
+        vehicles (Iterable[Vehicle]): The vehicles to start
+        max_workers (int): Number of worker threads (default: 4)
+        chunk_size (int): Vehicles handled per task (default: 1024)
+        timeout (Optional[float]): Seconds to wait for the whole batch; vehicles whose chunk
+            was already running when it expired are still started
+    Returns:
+        List[Union[str, Exception]]: start_engine message or raised exception per vehicle, in input order
+    Raises:
+        TimeoutError: If the batch does not finish within timeout
+    """
+    return _run_engine_batch(vehicles, "start_engine", max_workers, chunk_size, timeout)
+
+
+def stop_all(vehicles: Iterable[Vehicle], max_workers: int = 4, chunk_size: int = 1024,
+             timeout: Optional[float] = None) -> List[Union[str, Exception]]:
+    """
+    Stop the engines of many vehicles
+    Args:
+        vehicles (Iterable[Vehicle]): The vehicles to stop
+        max_workers (int): Number of worker threads (default: 4)
+        chunk_size (int): Vehicles handled per task (default: 1024)
+        timeout (Optional[float]): Seconds to wait for the whole batch; vehicles whose chunk
+            was already running when it expired are still stopped
+    Returns:
+        List[Union[str, Exception]]: stop_engine message or raised exception per vehicle, in input order
+    Raises:
+        TimeoutError: If the batch does not finish within timeout
+    """
+    return _run_engine_batch(vehicles, "stop_engine", max_workers, chunk_size, timeout)
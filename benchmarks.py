@@ -0,0 +1,634 @@
+# Benchmark suite for the class hierarchies in the assignment2 package
+#
+# Usage:
+#   python benchmarks.py                              run the quick profile and print results
+#   python benchmarks.py --output results.json        also save the results as JSON
+#   python benchmarks.py --save-baseline base.json    save the results as the new baseline
+#   python benchmarks.py --baseline base.json         fail if anything is slower than the baseline
+#   python benchmarks.py --profile full               10^3-10^7 shapes and 1 KB-1 GB files
+#   python benchmarks.py --memory                     bytes per instance, slotted vs __dict__
+#   python benchmarks.py --imports                    fail if a module breaks the import-time budget
+import argparse
+import asyncio
+import gc
+import io
+import json
+import os
+import platform
+import subprocess
+import sys
+import tempfile
+import time
+import tracemalloc
+from typing import Any, Callable, Dict, List, Tuple
+
+REPO_DIR = os.path.dirname(os.path.abspath(__file__))
+
+# Input sizes for each benchmark group, per profile
+PROFILES = {
+    "quick": {
+        "objects": [10 ** 3, 10 ** 4],
+        "shapes": [10 ** 3, 10 ** 4, 10 ** 5],
+        "file_bytes": [1024, 1024 ** 2],
+    },
+    "full": {
+        "objects": [10 ** 3, 10 ** 4, 10 ** 5, 10 ** 6],
+        "shapes": [10 ** 3, 10 ** 4, 10 ** 5, 10 ** 6, 10 ** 7],
+        "file_bytes": [1024, 1024 ** 2, 100 * 1024 ** 2, 1024 ** 3],
+    },
+}
+
+# Registered benchmarks: name -> (size group, setup function)
+# A setup function takes the module and a size and returns the callable to time
+BENCHMARKS: Dict[str, Tuple[str, Callable]] = {}
+
+
+def benchmark(name: str, group: str) -> Callable:
+    """
+    Register a benchmark setup function
+    Args:
+        name (str): Name of the benchmark
+        group (str): Size group from PROFILES used to parameterize it
+    Returns:
+        Callable: Decorator registering the function
+    """
+    def register(setup: Callable) -> Callable:
+        BENCHMARKS[name] = (group, setup)
+        return setup
+    return register
+
+
+def load_module():
+    """
+    Import the assignment2 package, whose names load their submodules on first use
+    Returns:
+        module: The package
+    """
+    sys.path.insert(0, REPO_DIR)
+    import assignment2
+    return assignment2
+
+
+# Object construction
+@benchmark("construct_car", "objects")
+def construct_car(module, size: int) -> Callable:
+    return lambda: [module.Car("Toyota", "Camry", 2023, 4) for _ in range(size)]
+
+
+@benchmark("construct_circle", "objects")
+def construct_circle(module, size: int) -> Callable:
+    return lambda: [module.Circle(1.0 + i % 7) for i in range(size)]
+
+
+@benchmark("construct_dog", "objects")
+def construct_dog(module, size: int) -> Callable:
+    return lambda: [module.Dog("Rex", i % 15) for i in range(size)]
+
+
+@benchmark("construct_circle_bulk", "objects")
+def construct_circle_bulk(module, size: int) -> Callable:
+    radii = [1.0 + i % 7 for i in range(size)]
+    return lambda: module.Circle.from_arrays(radii)
+
+
+@benchmark("construct_dog_bulk", "objects")
+def construct_dog_bulk(module, size: int) -> Callable:
+    records = [("Rex", i % 15) for i in range(size)]
+    return lambda: module.Dog.from_records(records)
+
+
+@benchmark("construct_circle_interned", "objects")
+def construct_circle_interned(module, size: int) -> Callable:
+    circle = module.SpecFactory().circle
+    return lambda: [circle(1.0 + i % 7) for i in range(size)]
+
+
+@benchmark("construct_circle_interned_bulk", "objects")
+def construct_circle_interned_bulk(module, size: int) -> Callable:
+    radii = [1.0 + i % 7 for i in range(size)]
+    factory = module.SpecFactory()
+    return lambda: factory.intern_columns(module.Circle, radii)
+
+
+@benchmark("construct_car_shared", "objects")
+def construct_car_shared(module, size: int) -> Callable:
+    factory = module.SpecFactory()
+    return lambda: [factory.car("Toyota", "Camry", 2023, 4) for _ in range(size)]
+
+
+# Polymorphic dispatch
+@benchmark("dispatch_vehicle_description", "objects")
+def dispatch_vehicle_description(module, size: int) -> Callable:
+    vehicles = [module.Car("Toyota", "Camry", 2023, 4) if i % 2 else
+                module.Bike("Honda", "CB500", 2021, False) for i in range(size)]
+    return lambda: [vehicle.get_description() for vehicle in vehicles]
+
+
+@benchmark("dispatch_start_stop_engine", "objects")
+def dispatch_start_stop_engine(module, size: int) -> Callable:
+    vehicles = [module.Car("Toyota", "Camry", 2023, 4) if i % 2 else
+                module.Bike("Honda", "CB500", 2021, False) for i in range(size)]
+    return lambda: [(vehicle.start_engine(), vehicle.stop_engine()) for vehicle in vehicles]
+
+
+@benchmark("dispatch_start_stop_engine_instrumented", "objects")
+def dispatch_start_stop_engine_instrumented(module, size: int) -> Callable:
+    vehicles = [module.Car("Toyota", "Camry", 2023, 4) if i % 2 else
+                module.Bike("Honda", "CB500", 2021, False) for i in range(size)]
+    instrumentation = module.Instrumentation()
+    targets = {module.Vehicle: ("start_engine", "stop_engine")}
+
+    def run_instrumented():
+        with instrumentation.recording(targets):
+            return [(vehicle.start_engine(), vehicle.stop_engine()) for vehicle in vehicles]
+    return run_instrumented
+
+
+@benchmark("dispatch_calculate_area", "objects")
+def dispatch_calculate_area(module, size: int) -> Callable:
+    shapes = [module.Circle(1.0 + i % 7) if i % 2 else module.BorderedRectangle(2.0, 3.0) for i in range(size)]
+    return lambda: [shape.calculate_area() for shape in shapes]
+
+
+@benchmark("dispatch_process_sound", "objects")
+def dispatch_process_sound(module, size: int) -> Callable:
+    animals = [module.Dog("Rex", 3) if i % 2 else module.Cat("Luna", 4) for i in range(size)]
+    return lambda: [module.process_sound(animal) for animal in animals]
+
+
+@benchmark("stream_process_sounds", "objects")
+def stream_process_sounds(module, size: int) -> Callable:
+    animals = [module.Dog("Rex", 3) if i % 2 else module.Cat("Luna", 4) for i in range(size)]
+    return lambda: module.write_sounds(animals, io.StringIO())
+
+
+@benchmark("schedule_sounds", "objects")
+def schedule_sounds(module, size: int) -> Callable:
+    animals = [module.Dog("Rex", 3) if i % 2 else module.Cat("Luna", 4) for i in range(size)]
+
+    async def discard(batch: List[str]) -> None:
+        pass
+
+    async def simulate() -> int:
+        # Every animal sounds twice: spread over 4 ticks and run for 8
+        scheduler = module.SoundScheduler(discard)
+        scheduler.add_many(animals, 4, spread=True)
+        return await scheduler.run(8)
+
+    return lambda: asyncio.run(simulate())
+
+
+# Engine state log
+def make_engine_log(module, size: int):
+    cars = [module.Car("Toyota", "Camry", 2023, 4) for _ in range(100)]
+    log = module.EngineLog(max_events=size)
+    for i in range(size):
+        log.record(cars[i % 100], bool(i // 100 % 2), float(i))
+    return log
+
+
+@benchmark("engine_log_record", "objects")
+def engine_log_record(module, size: int) -> Callable:
+    return lambda: make_engine_log(module, size)
+
+
+@benchmark("engine_log_fleet_uptime", "objects")
+def engine_log_fleet_uptime(module, size: int) -> Callable:
+    log = make_engine_log(module, size)
+    return lambda: log.fleet_uptime(size / 4, size * 3 / 4)
+
+
+# Person records
+def make_person_table(module, size: int):
+    nationalities = ["Zimbabwean", "Zambian", "South African", "Kenyan"]
+    universities = ["Catholic University of Zimbabwe", "University of Zimbabwe", "NUST"]
+    return module.PersonTable.from_columns(
+        name=[f"Person {i}" for i in range(size)], age=[18 + i % 40 for i in range(size)],
+        gender=["Male" if i % 2 else "Female" for i in range(size)],
+        height=[1.5 + (i % 50) / 100 for i in range(size)], weight=[50.0 + i % 40 for i in range(size)],
+        skin_color=["black"] * size, nationality=[nationalities[i % 4] for i in range(size)],
+        occupation=["Student"] * size, university=[universities[i % 3] for i in range(size)],
+        marital_status=["Single"] * size, language=["English & Shona"] * size,
+        favourite_language=["English"] * size, hobby=["programming"] * size,
+        favourite_color=["Green"] * size, blood_type=["O plus"] * size)
+
+
+@benchmark("people_group_mean", "objects")
+def people_group_mean(module, size: int) -> Callable:
+    table = make_person_table(module, size)
+    return lambda: table.group_mean("height", "nationality")
+
+
+@benchmark("people_export_csv", "objects")
+def people_export_csv(module, size: int) -> Callable:
+    table = make_person_table(module, size)
+    return lambda: table.write_csv(io.StringIO())
+
+
+# Total area
+@benchmark("total_area_list", "shapes")
+def total_area_list(module, size: int) -> Callable:
+    shapes = [module.Circle(1.0 + i % 7) if i % 2 else module.BorderedRectangle(2.0, 3.0) for i in range(size)]
+    return lambda: module.calculate_total_area(shapes)
+
+
+@benchmark("total_area_shape_array", "shapes")
+def total_area_shape_array(module, size: int) -> Callable:
+    half = size // 2
+    shape_array = module.ShapeArray.from_columns([1.0 + i % 7 for i in range(size - half)],
+                                                 [2.0] * half, [3.0] * half)
+    return lambda: module.calculate_total_area(shape_array)
+
+
+@benchmark("total_area_compensated", "shapes")
+def total_area_compensated(module, size: int) -> Callable:
+    shapes = [module.Circle(1.0 + i % 7) if i % 2 else module.BorderedRectangle(2.0, 3.0) for i in range(size)]
+    return lambda: module.calculate_total_area(shapes, compensated=True)
+
+
+@benchmark("total_area_shape_array_parallel", "shapes")
+def total_area_shape_array_parallel(module, size: int) -> Callable:
+    half = size // 2
+    shape_array = module.ShapeArray.from_columns([1.0 + i % 7 for i in range(size - half)],
+                                                 [2.0] * half, [3.0] * half)
+    workers = os.cpu_count() or 1
+    return lambda: module.calculate_total_area(shape_array, workers=workers,
+                                               chunk_size=max(size // workers, 1))
+
+
+# File I/O, run in a temporary directory
+def make_text(size: int) -> str:
+    line = "benchmark line of text for the file handlers\n"
+    return (line * (size // len(line) + 1))[:size]
+
+
+@benchmark("text_write", "file_bytes")
+def text_write(module, size: int) -> Callable:
+    handler = module.TextFileHandler(os.path.join(WORK_DIR, "text_write.txt"))
+    content = make_text(size)
+    return lambda: handler.write(content)
+
+
+@benchmark("text_read", "file_bytes")
+def text_read(module, size: int) -> Callable:
+    handler = module.TextFileHandler(os.path.join(WORK_DIR, "text_read.txt"))
+    handler.write(make_text(size))
+    return handler.read
+
+
+@benchmark("binary_write", "file_bytes")
+def binary_write(module, size: int) -> Callable:
+    handler = module.BinaryFileHandler(os.path.join(WORK_DIR, "binary_write.bin"))
+    content = os.urandom(size)
+    return lambda: handler.write(content)
+
+
+@benchmark("binary_read", "file_bytes")
+def binary_read(module, size: int) -> Callable:
+    handler = module.BinaryFileHandler(os.path.join(WORK_DIR, "binary_read.bin"))
+    handler.write(os.urandom(size))
+    return handler.read
+
+
+@benchmark("gzip_stream_read", "file_bytes")
+def gzip_stream_read(module, size: int) -> Callable:
+    handler = module.GzipFileHandler(os.path.join(WORK_DIR, "gzip_stream_read.gz"), level=6)
+    handler.write_stream(make_text(1024).encode() for _ in range(max(1, size // 1024)))
+    return lambda: sum(len(chunk) for chunk in handler.iter_chunks())
+
+
+@benchmark("bulk_copy", "file_bytes")
+def bulk_copy(module, size: int) -> Callable:
+    # The total size is split across eight files copied concurrently
+    jobs = []
+    for i in range(8):
+        source = os.path.join(WORK_DIR, f"bulk_copy_{i}.bin")
+        module.BinaryFileHandler(source).write(os.urandom(max(1, size // 8)))
+        jobs.append((source, source + ".copy", None))
+    return lambda: module.bulk_copy(jobs)
+
+
+def make_snapshot_objects(module, size: int) -> List:
+    return [module.Car("Toyota", "Camry", 2000 + i % 24, 4) if i % 3 == 0 else
+            module.Circle(1.0 + i % 7, i, -i) if i % 3 == 1 else module.Dog("Rex", i % 15)
+            for i in range(size)]
+
+
+@benchmark("snapshot_dump", "objects")
+def snapshot_dump(module, size: int) -> Callable:
+    objects = make_snapshot_objects(module, size)
+    handler = module.BinaryFileHandler(os.path.join(WORK_DIR, "snapshot_dump.bin"))
+    return lambda: module.dump_objects(objects, handler)
+
+
+@benchmark("snapshot_load", "objects")
+def snapshot_load(module, size: int) -> Callable:
+    handler = module.BinaryFileHandler(os.path.join(WORK_DIR, "snapshot_load.bin"))
+    module.dump_objects(make_snapshot_objects(module, size), handler)
+    return lambda: list(module.load_objects(handler))
+
+
+WORK_DIR = ""
+
+
+# Classes measured by the memory benchmark: name -> (class, constructor arguments, attributes
+# the original, unslotted class stored in its __dict__ for them, in assignment order)
+def memory_factories(module) -> Dict[str, Tuple[type, tuple, Dict[str, Any]]]:
+    return {
+        "Vehicle": (module.Vehicle, ("Toyota", "Camry", 2023),
+                    {"brand": "Toyota", "model": "Camry", "year": 2023, "is_running": False}),
+        "Car": (module.Car, ("Toyota", "Camry", 2023, 4),
+                {"brand": "Toyota", "model": "Camry", "year": 2023, "is_running": False, "num_doors": 4}),
+        "Bike": (module.Bike, ("Harley-Davidson", "Sportster", 2022, True),
+                 {"brand": "Harley-Davidson", "model": "Sportster", "year": 2022, "is_running": False,
+                  "has_sidecar": True}),
+        "Circle": (module.Circle, (5.0,), {"radius": 5.0}),
+        "Rectangle": (module.Rectangle, (4.0, 6.0), {"width": 4.0, "height": 6.0}),
+        "BorderedRectangle": (module.BorderedRectangle, (4.0, 6.0, "Red", 2.0),
+                              {"color": "Red", "border_width": 2.0, "width": 4.0, "height": 6.0}),
+        "Dog": (module.Dog, ("Rex", 5), {"name": "Rex", "age": 5}),
+        "Cat": (module.Cat, ("Whiskers", 3), {"name": "Whiskers", "age": 3}),
+    }
+
+
+def unslotted_replica(name: str, attributes: Dict[str, Any]) -> Tuple[type, tuple]:
+    """
+    Build a stand-in for a class as it was before __slots__
+    Args:
+        name (str): Name of the original class
+        attributes (Dict[str, Any]): Attributes its __init__ assigned, in assignment order
+    Returns:
+        Tuple[type, tuple]: A plain class assigning the same attributes to its instance
+            __dict__, and the arguments for it
+    """
+    names = tuple(attributes)
+
+    def __init__(self, *values: Any) -> None:
+        for attribute, value in zip(names, values):
+            setattr(self, attribute, value)
+
+    return type(f"Unslotted{name}", (), {"__init__": __init__}), tuple(attributes.values())
+
+
+def bytes_per_instance(cls: type, args: tuple, count: int) -> float:
+    """
+    Measure the memory allocated per instance of a class
+    Args:
+        cls (type): The class to instantiate
+        args (tuple): Constructor arguments
+        count (int): Number of instances to allocate
+    Returns:
+        float: Average bytes allocated per instance
+    """
+    gc.collect()
+    tracemalloc.start()
+    try:
+        before = tracemalloc.get_traced_memory()[0]
+        instances = [cls(*args) for _ in range(count)]
+        after = tracemalloc.get_traced_memory()[0]
+    finally:
+        tracemalloc.stop()
+    # Exclude the list holding the instances
+    return (after - before - sys.getsizeof(instances)) / count
+
+
+def run_memory(count: int) -> Dict:
+    """
+    Compare bytes per instance of the slotted classes with replicas of the original classes
+    Args:
+        count (int): Instances allocated per class
+    Returns:
+        Dict: Machine-readable results
+    """
+    module = load_module()
+    results = {}
+    print(f"{'class':<20} {'with __dict__':>14} {'slotted':>10} {'saved':>8}")
+    for name, (cls, args, attributes) in memory_factories(module).items():
+        dict_cls, dict_args = unslotted_replica(name, attributes)
+        slotted = bytes_per_instance(cls, args, count)
+        with_dict = bytes_per_instance(dict_cls, dict_args, count)
+        results[name] = {"slotted_bytes": slotted, "dict_bytes": with_dict}
+        print(f"{name:<20} {with_dict:14.1f} {slotted:10.1f} {1 - slotted / with_dict:8.0%}")
+    return {"python": platform.python_version(), "platform": platform.platform(),
+            "instances": count, "memory": results}
+
+
+# Modules checked by the import-time budget; async_file_handlers is left out because it needs asyncio
+IMPORT_MODULES = ["assignment2", "assignment2.vehicles", "assignment2.shapes", "assignment2.animals",
+                  "assignment2.people", "assignment2.file_handlers", "assignment2.serialization",
+                  "assignment2.instrumentation", "assignment2.flyweights", "assignment2.engine_log"]
+# Slow standard library modules that must only be imported when a feature needs them; typing
+# is imported by type checkers only
+DEFERRED_IMPORTS = {"asyncio", "concurrent.futures", "multiprocessing", "json", "tempfile", "typing", "re"}
+# Allowed total import time per module in ms, shared with tests/test_import_time.py
+IMPORT_BUDGET_MS = 20.0
+
+
+def import_environment(cache_dir: str) -> Dict[str, str]:
+    """
+    Build the environment for measuring imports of the package
+    Args:
+        cache_dir (str): Empty directory for compiled bytecode, so the repository is not written
+    Returns:
+        Dict[str, str]: Environment for the interpreter
+    """
+    env = dict(os.environ, PYTHONPATH=REPO_DIR, PYTHONPYCACHEPREFIX=cache_dir)
+    env.pop("PYTHONDONTWRITEBYTECODE", None)
+    return env
+
+
+def measure_import(module_name: str, work_dir: str, env: Dict[str, str]) -> Dict:
+    """
+    Import a module in a fresh interpreter with -X importtime
+    Args:
+        module_name (str): Module to import
+        work_dir (str): Empty directory used as the working directory
+        env (Dict[str, str]): Environment for the interpreter
+    Returns:
+        Dict: Total and own-code import time in ms, modules imported and files created
+    """
+    process = subprocess.run([sys.executable, "-X", "importtime", "-c", f"import {module_name}"],
+                             cwd=work_dir, env=env, capture_output=True, text=True, check=True)
+    own_us, total_us, imported = 0, 0, set()
+    for line in process.stderr.splitlines():
+        # import time: self [us] | cumulative | imported package
+        if not line.startswith("import time:") or "self [us]" in line:
+            continue
+        own, cumulative, name = line[len("import time:"):].split("|")
+        name = name.strip()
+        imported.add(name)
+        if name.split(".")[0] == "assignment2":
+            own_us += int(own)
+        if name == module_name:
+            total_us = int(cumulative)
+    return {"total_ms": total_us / 1000, "own_ms": own_us / 1000, "imported": imported,
+            "output": process.stdout, "files": os.listdir(work_dir)}
+
+
+def run_imports(budget_ms: float, repeat: int) -> Dict:
+    """
+    Check that importing each module is fast and has no side effects
+    Bytecode is compiled first, so timings reflect a cold interpreter start, not compilation.
+    The budget applies to the total, which includes the standard library modules imported on
+    the way; own is the time spent in the package's own modules.
+    Args:
+        budget_ms (float): Allowed total import time per module
+        repeat (int): Imports per module; the fastest is kept
+    Returns:
+        Dict: Machine-readable results, with a list of every failure
+    """
+    results, failures = {}, []
+    with tempfile.TemporaryDirectory() as cache_dir, tempfile.TemporaryDirectory() as work_dir:
+        env = import_environment(cache_dir)
+        print(f"{'module':<32} {'own':>9} {'total':>9}")
+        for module_name in IMPORT_MODULES:
+            runs = [measure_import(module_name, work_dir, env) for _ in range(repeat + 1)][1:]
+            own_ms = min(run["own_ms"] for run in runs)
+            total_ms = min(run["total_ms"] for run in runs)
+            results[module_name] = {"own_ms": own_ms, "total_ms": total_ms}
+            print(f"{module_name:<32} {own_ms:6.2f} ms {total_ms:6.2f} ms")
+            if total_ms > budget_ms:
+                failures.append(f"{module_name}: {total_ms:.2f} ms over the {budget_ms:.2f} ms budget")
+            eager = sorted(DEFERRED_IMPORTS & runs[0]["imported"])
+            if eager:
+                failures.append(f"{module_name}: imports {', '.join(eager)} eagerly")
+            if runs[0]["output"] or runs[0]["files"]:
+                failures.append(f"{module_name}: import has side effects")
+        submodules = sorted(name for name in measure_import("assignment2", work_dir, env)["imported"]
+                            if name.startswith("assignment2."))
+        if submodules:
+            failures.append(f"assignment2: imports {', '.join(submodules)} eagerly")
+    return {"python": platform.python_version(), "platform": platform.platform(),
+            "budget_ms": budget_ms, "imports": results, "failures": failures}
+
+
+def time_call(function: Callable, repeat: int) -> float:
+    """
+    Time a callable, returning the best of several runs
+    Args:
+        function (Callable): The code to time
+        repeat (int): Number of runs
+    Returns:
+        float: Fastest run in seconds
+    """
+    best = float("inf")
+    gc_was_enabled = gc.isenabled()
+    gc.disable()
+    try:
+        for _ in range(repeat):
+            start = time.perf_counter()
+            function()
+            best = min(best, time.perf_counter() - start)
+    finally:
+        if gc_was_enabled:
+            gc.enable()
+    return best
+
+
+def run(profile: str, repeat: int, selected: List[str]) -> Dict:
+    """
+    Run the selected benchmarks for every size in a profile
+    Args:
+        profile (str): Name of the size profile
+        repeat (int): Runs per measurement
+        selected (List[str]): Benchmark name prefixes to run (all if empty)
+    Returns:
+        Dict: Machine-readable results
+    """
+    global WORK_DIR
+    module = load_module()
+    results = {}
+    with tempfile.TemporaryDirectory() as WORK_DIR:
+        for name, (group, setup) in BENCHMARKS.items():
+            if selected and not any(name.startswith(prefix) for prefix in selected):
+                continue
+            for size in PROFILES[profile][group]:
+                seconds = time_call(setup(module, size), repeat)
+                key = f"{name}[{size}]"
+                results[key] = {"benchmark": name, "size": size, "seconds": seconds,
+                                "ns_per_item": seconds * 1e9 / size}
+                print(f"{key:<45} {seconds * 1e3:12.3f} ms {seconds * 1e9 / size:12.1f} ns/item")
+    return {"python": platform.python_version(), "platform": platform.platform(),
+            "profile": profile, "repeat": repeat, "results": results}
+
+
+def compare(results: Dict, baseline: Dict, tolerance: float) -> List[str]:
+    """
+    Compare results against a baseline
+    Args:
+        results (Dict): Results from run()
+        baseline (Dict): Previously saved results
+        tolerance (float): Allowed slowdown as a fraction (0.2 means 20% slower)
+    Returns:
+        List[str]: Descriptions of every regression
+    """
+    regressions = []
+    for key, result in results["results"].items():
+        previous = baseline["results"].get(key)
+        if previous is None:
+            continue
+        ratio = result["seconds"] / previous["seconds"]
+        if ratio > 1 + tolerance:
+            regressions.append(f"{key}: {previous['seconds'] * 1e3:.3f} ms -> "
+                               f"{result['seconds'] * 1e3:.3f} ms ({ratio:.2f}x)")
+    return regressions
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Benchmark the Assignment 2 class hierarchies")
+    parser.add_argument("--profile", choices=sorted(PROFILES), default="quick")
+    parser.add_argument("--repeat", type=int, default=5)
+    parser.add_argument("--only", nargs="*", default=[], help="benchmark name prefixes to run")
+    parser.add_argument("--memory", action="store_true",
+                        help="measure bytes per instance instead of timings")
+    parser.add_argument("--imports", action="store_true",
+                        help="check import time and import side effects instead of timings")
+    parser.add_argument("--import-budget", type=float, default=IMPORT_BUDGET_MS,
+                        help=f"allowed total import time per module in ms (default: {IMPORT_BUDGET_MS:g})")
+    parser.add_argument("--output", help="write results as JSON to this file")
+    parser.add_argument("--baseline", help="compare against results saved in this file")
+    parser.add_argument("--save-baseline", help="write results as the new baseline to this file")
+    parser.add_argument("--tolerance", type=float, default=0.25,
+                        help="allowed slowdown against the baseline (default: 0.25)")
+    args = parser.parse_args()
+
+    if args.memory:
+        results = run_memory(100000)
+        if args.output:
+            with open(args.output, "w", encoding="utf-8") as file:
+                json.dump(results, file, indent=2)
+        return
+
+    if args.imports:
+        results = run_imports(args.import_budget, args.repeat)
+        if args.output:
+            with open(args.output, "w", encoding="utf-8") as file:
+                json.dump(results, file, indent=2)
+        if results["failures"]:
+            print("\nImport budget failures:")
+            for failure in results["failures"]:
+                print(f"  {failure}")
+            sys.exit(1)
+        print("\nAll modules within the import budget")
+        return
+
+    results = run(args.profile, args.repeat, args.only)
+    for path in (args.output, args.save_baseline):
+        if path:
+            with open(path, "w", encoding="utf-8") as file:
+                json.dump(results, file, indent=2)
+
+    if args.baseline:
+        with open(args.baseline, encoding="utf-8") as file:
+            baseline = json.load(file)
+        regressions = compare(results, baseline, args.tolerance)
+        if regressions:
+            print("\nRegressions against baseline:")
+            for regression in regressions:
+                print(f"  {regression}")
+            sys.exit(1)
+        print("\nNo regressions against baseline")
+
+
+if __name__ == "__main__":
+    main()
@@ -1,6 +1,10 @@
+import sys
+
+from assignment2.people import PersonTable
+
 # Constants (conventionally in uppercase)
 PI = 3.14159
-TAX_RATE = 0,2
+TAX_RATE = 0.2
 DEFAULT_VALUE = None
 
 # Variables
@@ -20,20 +24,26 @@ hobby = "programming"
 favourite_color = "Green"
 blood_type = "O plus "
 
-# Using print function to display information
-print("Personal Information:")
-print("Name:",name)
-print("Age: 21")
-print("Height:height","1.62m")
-print("Weight:weight","78.47")
-print("Skin:",skin_color)
-print("Occupation:",occupation)
-print("University:",university)
-print("Maritial Status:",marital_status)
-print("Language:",language)
-print("Nationality:",nationality)
-print("favourite language:",favourite_language)
-print("hobby:",hobby)
-print("favourite color:",favourite_color)
-print("blood type:",blood_type)
+# Profile record with the fields of assignment2.people.PersonTable
+profile = {
+    "name": name,
+    "age": age,
+    "gender": Gender,
+    "height": height,
+    "weight": weight,
+    "skin_color": skin_color,
+    "nationality": nationality,
+    "occupation": occupation,
+    "university": university,
+    "marital_status": marital_status,
+    "language": language,
+    "favourite_language": favourite_language,
+    "hobby": hobby,
+    "favourite_color": favourite_color,
+    "blood_type": blood_type,
+}
 
+if __name__ == "__main__":
+    # One buffered CSV export instead of a print call per field
+    print("Personal Information:")
+    PersonTable.from_records([profile]).write_csv(sys.stdout)
\ No newline at end of file
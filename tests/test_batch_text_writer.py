@@ -0,0 +1,81 @@
+# Tests for BatchTextWriter buffering and atomic replacement
+import os
+import stat
+import sys
+
+import pytest
+
+from assignment2.file_handlers import BatchTextWriter, TextFileHandler
+
+posix_only = pytest.mark.skipif(sys.platform == "win32", reason="POSIX permission bits")
+
+
+def mode_of(path):
+    return stat.S_IMODE(os.stat(path).st_mode)
+
+
+def test_append_mode_buffers_until_close(tmp_path):
+    handler = TextFileHandler(str(tmp_path / "log.txt"))
+    handler.write("first\n")
+    with BatchTextWriter(handler, buffer_size=1024, flush_interval=60.0) as writer:
+        writer.write("second\n")
+        assert handler.read() == "first\n"
+    assert handler.read() == "first\nsecond\n"
+
+
+def test_atomic_mode_replaces_on_close_only(tmp_path):
+    handler = TextFileHandler(str(tmp_path / "report.txt"))
+    handler.write("old")
+    with BatchTextWriter(handler, atomic=True, buffer_size=0) as writer:
+        writer.write("new")
+        assert handler.read() == "old"
+    assert handler.read() == "new"
+    assert os.listdir(tmp_path) == ["report.txt"]
+
+
+def test_atomic_mode_leaves_target_on_error(tmp_path):
+    handler = TextFileHandler(str(tmp_path / "report.txt"))
+    handler.write("old")
+    with pytest.raises(RuntimeError):
+        with BatchTextWriter(handler, atomic=True) as writer:
+            writer.write("partial")
+            raise RuntimeError("interrupted")
+    assert handler.read() == "old"
+    assert os.listdir(tmp_path) == ["report.txt"]
+
+
+@posix_only
+def test_atomic_replacement_keeps_the_target_mode(tmp_path):
+    path = str(tmp_path / "shared.txt")
+    handler = TextFileHandler(path)
+    handler.write("old")
+    os.chmod(path, 0o644)
+    with BatchTextWriter(handler, atomic=True) as writer:
+        writer.write("new")
+    assert mode_of(path) == 0o644
+
+
+@posix_only
+def test_atomic_new_file_gets_the_umask_mode(tmp_path):
+    path = str(tmp_path / "new.txt")
+    umask = os.umask(0o027)
+    try:
+        with BatchTextWriter(TextFileHandler(path), atomic=True) as writer:
+            writer.write("content")
+        with open(str(tmp_path / "plain.txt"), "w"):
+            pass
+    finally:
+        os.umask(umask)
+    assert mode_of(path) == mode_of(str(tmp_path / "plain.txt")) == 0o640
+
+
+def test_atomic_mode_never_changes_the_process_umask(tmp_path, monkeypatch):
+    def set_umask(mask):
+        raise AssertionError("the umask is process-wide and must not be changed")
+
+    monkeypatch.setattr(os, "umask", set_umask)
+    # First creating the file, then replacing it
+    for _ in range(2):
+        with BatchTextWriter(TextFileHandler(str(tmp_path / "new.txt")), atomic=True) as writer:
+            writer.write("content")
+    assert os.listdir(tmp_path) == ["new.txt"]
@@ -0,0 +1,31 @@
+# Tests for building animals and rectangles from columns
+import pytest
+
+from assignment2.animals import Dog
+from assignment2.shapes import BorderedRectangle
+
+
+def test_animals_match_the_constructor():
+    dogs = Dog.from_records([("Rex", 3), ("Fido", 0)])
+    assert [dog.get_description() for dog in dogs] == [Dog("Rex", 3).get_description(),
+                                                      Dog("Fido", 0).get_description()]
+
+
+def test_animal_failures_from_every_column_are_reported_together():
+    with pytest.raises(ValueError) as error:
+        Dog.from_records([("", 3), ("Rex", -1), (" ", -2), ("Fido", 1)])
+    assert str(error.value) == "Name cannot be empty (rows 0, 2); Age cannot be negative (rows 1, 2)"
+
+
+def test_rectangles_match_the_constructor():
+    rectangles = BorderedRectangle.from_arrays([1.0, 2.0], [3.0, 4.0], ["Red", "Blue"], [0.0, 1.5])
+    assert [rectangle.get_description() for rectangle in rectangles] == [
+        BorderedRectangle(1.0, 3.0, "Red", 0.0).get_description(),
+        BorderedRectangle(2.0, 4.0, "Blue", 1.5).get_description()]
+
+
+def test_rectangle_failures_from_every_column_are_reported_together():
+    with pytest.raises(ValueError) as error:
+        BorderedRectangle.from_arrays([1.0, 0.0, 2.0], [1.0, 1.0, -1.0], border_widths=[-1.0, 1.0, 1.0])
+    assert str(error.value) == ("Width and height must be positive (rows 1, 2); "
+                                "Border width cannot be negative (rows 0)")
@@ -0,0 +1,161 @@
+# Tests for BulkCopyEngine and ByteBudget
+import gzip
+import os
+import threading
+
+import pytest
+
+from assignment2 import file_handlers
+from assignment2.file_handlers import (BinaryFileHandler, BulkCopyEngine, ByteBudget, GzipFileHandler,
+                                       TextFileHandler, bulk_copy)
+
+
+def test_plain_copies_preserve_bytes(tmp_path):
+    jobs = []
+    for i in range(5):
+        source = tmp_path / f"in{i}.bin"
+        source.write_bytes(os.urandom(10000 + i))
+        jobs.append((str(source), str(tmp_path / f"out{i}.bin"), None))
+    results = bulk_copy(jobs, max_workers=3)
+    assert all(result.ok for result in results)
+    for source, destination, _ in jobs:
+        assert open(destination, "rb").read() == open(source, "rb").read()
+    assert [result.size for result in results] == [10000 + i for i in range(5)]
+
+
+@pytest.mark.parametrize("blocked, method", [(("copy_file_range",), "sendfile"),
+                                             (("copy_file_range", "sendfile"), "read_write")])
+def test_falls_back_when_zero_copy_is_unsupported(tmp_path, monkeypatch, blocked, method):
+    def unsupported(*args):
+        raise OSError(file_handlers.errno.ENOSYS, "not supported")
+
+    for name in blocked:
+        if hasattr(os, name):
+            monkeypatch.setattr(os, name, unsupported)
+    source = tmp_path / "in.bin"
+    source.write_bytes(os.urandom(300000))
+    result, = BulkCopyEngine(chunk_size=4096).run([(str(source), str(tmp_path / "out.bin"), None)])
+    assert result.ok
+    assert (tmp_path / "out.bin").read_bytes() == source.read_bytes()
+    if hasattr(os, "sendfile"):
+        assert result.method == method
+
+
+def test_text_to_gzip_without_transform(tmp_path):
+    source = TextFileHandler(str(tmp_path / "in.txt"))
+    source.write("line one\nline two\n")
+    destination = GzipFileHandler(str(tmp_path / "out.gz"))
+    result, = bulk_copy([(source, destination, None)])
+    assert result.ok, result.error
+    assert gzip.decompress((tmp_path / "out.gz").read_bytes()) == b"line one\nline two\n"
+
+
+def test_gzip_to_text_without_transform(tmp_path):
+    with gzip.open(tmp_path / "in.gz", "wb") as file:
+        file.write(b"hello\n")
+    result, = bulk_copy([(str(tmp_path / "in.gz"), TextFileHandler(str(tmp_path / "out.txt")), None)])
+    assert result.ok, result.error
+    assert (tmp_path / "out.txt").read_text() == "hello\n"
+
+
+def test_transform_streams_chunks(tmp_path):
+    source = TextFileHandler(str(tmp_path / "in.txt"))
+    source.write("keep\ndrop\nkeep too\n")
+    transform = lambda handler: (line for line in handler.iter_lines() if line.startswith("keep"))
+    result, = bulk_copy([(source, str(tmp_path / "out.txt"), transform)])
+    assert result.ok and result.method == "stream"
+    assert (tmp_path / "out.txt").read_text() == "keep\nkeep too\n"
+
+
+def test_failed_transform_removes_partial_destination(tmp_path):
+    source = TextFileHandler(str(tmp_path / "in.txt"))
+    source.write("text\n")
+
+    def broken(handler):
+        yield "partial\n"
+        raise RuntimeError("transform failed")
+
+    result, = bulk_copy([(source, str(tmp_path / "out.txt"), broken)])
+    assert isinstance(result.error, RuntimeError)
+    assert not (tmp_path / "out.txt").exists()
+
+
+def test_transform_failing_before_writing_keeps_existing_destination(tmp_path):
+    source = TextFileHandler(str(tmp_path / "in.txt"))
+    source.write("text\n")
+    (tmp_path / "out.txt").write_text("precious")
+
+    def broken(handler):
+        raise KeyError("missing")
+
+    result, = bulk_copy([(source, str(tmp_path / "out.txt"), broken)])
+    assert isinstance(result.error, KeyError)
+    assert (tmp_path / "out.txt").read_text() == "precious"
+
+
+def test_failed_raw_copy_removes_partial_destination(tmp_path, monkeypatch):
+    def failing(*args):
+        raise OSError(file_handlers.errno.EIO, "device failed")
+
+    for name in ("copy_file_range", "sendfile", "read"):
+        if hasattr(os, name):
+            monkeypatch.setattr(os, name, failing)
+    source = tmp_path / "in.bin"
+    source.write_bytes(b"data")
+    result, = bulk_copy([(str(source), str(tmp_path / "out.bin"), None)])
+    assert isinstance(result.error, IOError)
+    assert not (tmp_path / "out.bin").exists()
+
+
+def test_copy_onto_itself_is_an_error_and_keeps_the_file(tmp_path):
+    path = tmp_path / "same.bin"
+    path.write_bytes(b"precious")
+    result, = bulk_copy([(str(path), str(path), None)])
+    assert isinstance(result.error, ValueError)
+    assert path.read_bytes() == b"precious"
+
+
+def test_one_bad_job_does_not_stop_the_batch(tmp_path):
+    source = tmp_path / "in.bin"
+    source.write_bytes(b"data")
+    results = bulk_copy([("", str(tmp_path / "a.bin"), None),
+                         (str(tmp_path / "missing.bin"), str(tmp_path / "b.bin"), None),
+                         (str(source), str(tmp_path / "c.bin"), None)])
+    assert isinstance(results[0].error, ValueError)
+    assert isinstance(results[1].error, FileNotFoundError)
+    assert results[2].ok
+    assert "failed" in results[0].get_summary()
+    assert not (tmp_path / "b.bin").exists()
+
+
+def test_stream_budget_is_reserved_before_each_chunk_is_read(tmp_path):
+    source = BinaryFileHandler(str(tmp_path / "in.bin"))
+    source.write(os.urandom(64 * 1024))
+    engine = BulkCopyEngine(max_in_flight=8192, chunk_size=4096)
+    observed = []
+
+    def transform(handler):
+        for chunk in handler.iter_chunks(4096):
+            observed.append(engine.budget.used)
+            yield chunk
+
+    result, = engine.run([(source, GzipFileHandler(str(tmp_path / "out.gz")), transform)])
+    assert result.ok, result.error
+    # Each chunk is read while its reservation is already held
+    assert observed and all(used >= 4096 for used in observed)
+    assert engine.budget.used == 0
+
+
+def test_byte_budget_blocks_until_released():
+    budget = ByteBudget(10)
+    budget.acquire(8)
+    acquired = threading.Event()
+    worker = threading.Thread(target=lambda: (budget.acquire(5), acquired.set()))
+    worker.start()
+    assert not acquired.wait(0.1)
+    budget.release(8)
+    assert acquired.wait(5)
+    worker.join()
+    assert budget.used == 5
+    with pytest.raises(ValueError):
+        ByteBudget(0)
@@ -0,0 +1,37 @@
+# Tests for the cached get_description of vehicles, animals and styled shapes
+import pickle
+
+import pytest
+
+from assignment2.animals import Cat, Dog
+from assignment2.shapes import BorderedRectangle, calculate_total_area
+from assignment2.vehicles import Bike, Car
+
+
+def make_objects():
+    return [Car("Toyota", "Camry", 2020, 4), Bike("Harley", "Sportster", 2021, True),
+            Dog("Rex", 3), Cat("Whiskers", 2), BorderedRectangle(2.0, 3.0, "Red", 2.0)]
+
+
+@pytest.mark.parametrize("index", range(5))
+def test_objects_with_a_cached_description_pickle(index):
+    original = make_objects()[index]
+    description = original.get_description()
+    restored = pickle.loads(pickle.dumps(original))
+    assert restored.get_description() == description
+    assert restored._description == original._description
+
+
+def test_reassigning_an_attribute_clears_the_restored_cache():
+    car = Car("Toyota", "Camry", 2020, 4)
+    car.get_description()
+    restored = pickle.loads(pickle.dumps(car))
+    restored.num_doors = 2
+    assert restored.get_description() == Car("Toyota", "Camry", 2020, 2).get_description()
+
+
+def test_parallel_total_area_with_cached_descriptions():
+    rectangles = [BorderedRectangle(1.0, 2.0, "Red", 0.5) for _ in range(4)]
+    for rectangle in rectangles:
+        rectangle.get_description()
+    assert calculate_total_area(rectangles, workers=2) == pytest.approx(8.0)
@@ -0,0 +1,56 @@
+# Tests for start_all and stop_all
+import threading
+import time
+
+import pytest
+
+from assignment2.vehicles import Bike, Car, start_all, stop_all
+
+
+# Car whose engine only starts once a shared event is set
+class StuckCar(Car):
+    def __init__(self, release, started):
+        super().__init__("Toyota", "Camry", 2020, 4)
+        self.release = release
+        self.started = started
+
+    def start_engine(self):
+        self.started.append(self)
+        self.release.wait(5)
+        return super().start_engine()
+
+
+def test_results_are_in_input_order():
+    vehicles = [Car("Toyota", "Camry", 2020, 4), Bike("Harley", "Sportster", 2021, False)] * 50
+    results = start_all(vehicles, max_workers=4, chunk_size=7)
+    assert results == [vehicle.start_message() for vehicle in vehicles]
+    assert stop_all(vehicles, max_workers=4, chunk_size=7) == [vehicle.stop_message() for vehicle in vehicles]
+    assert not any(vehicle.is_running for vehicle in vehicles)
+
+
+def test_failures_are_returned_per_vehicle():
+    class BrokenCar(Car):
+        def start_engine(self):
+            raise RuntimeError("no fuel")
+
+    vehicles = [Car("Toyota", "Camry", 2020, 4), BrokenCar("Toyota", "Camry", 2020, 4)]
+    results = start_all(vehicles, max_workers=2, chunk_size=1)
+    assert results[0] == vehicles[0].start_message()
+    assert isinstance(results[1], RuntimeError)
+
+
+def test_timeout_returns_without_waiting_for_running_chunks():
+    release, started = threading.Event(), []
+    vehicles = [StuckCar(release, started) for _ in range(20)]
+    began = time.monotonic()
+    try:
+        with pytest.raises(TimeoutError):
+            start_all(vehicles, max_workers=2, chunk_size=1, timeout=0.1)
+        assert time.monotonic() - began < 2
+    finally:
+        release.set()
+    # Chunks already running finish in the background; queued chunks were cancelled
+    deadline = time.monotonic() + 5
+    while sum(vehicle.is_running for vehicle in vehicles) < len(started) and time.monotonic() < deadline:
+        time.sleep(0.01)
+    assert sum(vehicle.is_running for vehicle in vehicles) == len(started) <= 4
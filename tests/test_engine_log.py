@@ -0,0 +1,199 @@
+# Tests for EngineLog recording, queries, retention and eviction
+import gc
+import random
+
+import pytest
+
+from assignment2.engine_log import EngineLog
+from assignment2.vehicles import Car
+
+
+def make_cars(count):
+    return [Car("Toyota", "Camry", 2020, 4) for _ in range(count)]
+
+
+def brute_force_state(events, vehicle, t):
+    # Only transitions are logged, so before its first event the vehicle was in the other state
+    own = [(timestamp, state) for timestamp, code, state in events if code is vehicle]
+    if not own:
+        return False
+    state = not own[0][1]
+    for timestamp, new_state in own:
+        if timestamp <= t:
+            state = new_state
+    return state
+
+
+def brute_force_uptime(events, vehicle, start, end):
+    own = [(timestamp, state) for timestamp, code, state in events if code is vehicle]
+    if not own:
+        return 0.0
+    total, since = 0.0, start if not own[0][1] and own[0][0] > start else None
+    for timestamp, state in own:
+        if timestamp <= start:
+            since = start if state else None
+        elif timestamp < end:
+            if state and since is None:
+                since = timestamp
+            elif not state and since is not None:
+                total += timestamp - since
+                since = None
+    if since is not None:
+        total += end - since
+    return total
+
+
+@pytest.fixture
+def random_log():
+    rng = random.Random(7)
+    cars = make_cars(20)
+    log = EngineLog(chunk_size=16)
+    running = {car: False for car in cars}
+    events = []
+    timestamp = 0.0
+    for _ in range(500):
+        car = rng.choice(cars)
+        running[car] = not running[car]
+        timestamp += rng.choice((0.0, 0.5, 1.0, 2.5))
+        log.record(car, running[car], timestamp)
+        events.append((timestamp, car, running[car]))
+    return log, cars, events
+
+
+def test_is_running_at_matches_brute_force(random_log):
+    log, cars, events = random_log
+    for t in [-1.0, 0.0] + [timestamp for timestamp, _, _ in events[::7]] + [events[-1][0] + 1]:
+        for car in cars:
+            assert log.is_running_at(car, t) == brute_force_state(events, car, t)
+        assert log.running_at(t) == [car for car in log.vehicles if brute_force_state(events, car, t)]
+
+
+def test_uptime_matches_brute_force(random_log):
+    log, cars, events = random_log
+    end = events[-1][0]
+    for start, stop in [(0.0, end), (end / 3, end / 2), (end / 2, end + 10)]:
+        uptime = log.fleet_uptime(start, stop)
+        for car in cars:
+            assert uptime[car] == pytest.approx(brute_force_uptime(events, car, start, stop))
+            assert log.uptime(car, start, stop) == pytest.approx(uptime[car])
+
+
+def test_transitions_per_hour_counts_every_event(random_log):
+    log, _, events = random_log
+    end = events[-1][0]
+    counts = log.transitions_per_hour(0.0, end + 1, bucket_seconds=50.0)
+    assert sum(counts) == len(events)
+    assert counts[0] == sum(1 for timestamp, _, _ in events if timestamp < 50.0)
+
+
+def test_enabled_log_records_only_real_transitions():
+    car = make_cars(1)[0]
+    times = iter(range(10))
+    log = EngineLog(clock=lambda: float(next(times)))
+    with log.recording():
+        car.start_engine()
+        car.start_engine()
+        car.stop_engine()
+    car.start_engine()
+    assert len(log) == 2
+    assert log.is_running_at(car, 0.0) and not log.is_running_at(car, 1.0)
+
+
+def test_max_events_drops_whole_chunks_and_keeps_state():
+    car, other = make_cars(2)
+    log = EngineLog(max_events=8, chunk_size=4)
+    log.record(other, True, 0.0)
+    for i in range(1, 20):
+        log.record(car, bool(i % 2), float(i))
+    stats = log.stats()
+    assert stats["events"] <= 8 and stats["events"] + stats["dropped"] == 20
+    assert log.horizon > 0.0
+    # The state at the horizon survives eviction, and the other car is still running
+    assert log.is_running_at(other, 19.0)
+    assert log.is_running_at(car, 19.0)
+    assert other in log.running_at(log.horizon)
+
+
+def test_max_age_drops_old_chunks():
+    car = make_cars(1)[0]
+    log = EngineLog(max_age=10.0, chunk_size=2)
+    for i in range(40):
+        log.record(car, bool(i % 2), float(i))
+    assert log.horizon >= 39.0 - 10.0 - 2
+    assert log.stats()["dropped"] > 0
+    assert log.is_running_at(car, 39.0) and not log.is_running_at(car, 38.5)
+
+
+def test_eviction_forgets_stopped_vehicles_without_events():
+    log = EngineLog(max_events=4, chunk_size=2)
+    stopped, running = make_cars(2)
+    log.record(stopped, True, 0.0)
+    log.record(stopped, False, 1.0)
+    log.record(running, True, 2.0)
+    for i, car in enumerate(make_cars(10)):
+        log.record(car, True, 3.0 + 2 * i)
+        log.record(car, False, 4.0 + 2 * i)
+    assert stopped not in log.vehicles
+    assert running in log.vehicles
+    assert not log.is_running_at(stopped, 100.0)
+    assert log.is_running_at(running, 100.0)
+    # The registry is bounded by retention, not by every vehicle ever logged
+    assert log.stats()["vehicles"] <= 3
+    assert len(log._vehicles) <= 4
+
+
+def test_evicted_vehicles_are_no_longer_referenced():
+    log = EngineLog(max_events=2, chunk_size=1)
+    car = make_cars(1)[0]
+    log.record(car, True, 0.0)
+    log.record(car, False, 1.0)
+    for i, other in enumerate(make_cars(3)):
+        log.record(other, True, 2.0 + i)
+    assert car not in gc.get_referents(log._vehicles, log._index)
+
+
+def test_reused_codes_do_not_mix_histories():
+    log = EngineLog(max_events=2, chunk_size=1)
+    first, second, third, fourth = make_cars(4)
+    log.record(first, True, 0.0)
+    log.record(first, False, 1.0)
+    log.record(second, True, 2.0)
+    log.record(third, True, 3.0)
+    log.record(fourth, True, 4.0)
+    # The fourth car takes the code the first one had
+    assert first not in log.vehicles
+    assert len(log._vehicles) == 3
+    assert log.running_at(4.0) == [car for car in log.vehicles if car in (second, third, fourth)]
+    assert sorted(log.fleet_uptime(4.0, 6.0).values()) == [2.0, 2.0, 2.0]
+    assert log.is_running_at(fourth, 4.0) and not log.is_running_at(fourth, 3.5)
+
+
+def test_recording_a_vehicle_forgotten_by_the_same_eviction():
+    log = EngineLog(max_events=4, chunk_size=2)
+    first, second = make_cars(2)
+    with log.recording():
+        first.start_engine()
+        first.stop_engine()
+        second.start_engine()
+        second.stop_engine()
+        # Opening the third chunk evicts the first, which forgets the car being recorded
+        first.start_engine()
+    assert log.vehicles == [first, second]
+    assert log.is_running_at(first, log.horizon + 10) and not log.is_running_at(second, log.horizon + 10)
+    assert log.running_at(log._last_time) == [first]
+    first.stop_engine()
+    assert len(log) == 3
+
+
+def test_timestamps_must_not_decrease():
+    log = EngineLog()
+    car = make_cars(1)[0]
+    log.record(car, True, 5.0)
+    with pytest.raises(ValueError):
+        log.record(car, False, 4.0)
+
+
+def test_only_one_log_records_at_a_time():
+    with EngineLog().recording():
+        with pytest.raises(RuntimeError):
+            EngineLog().enable()
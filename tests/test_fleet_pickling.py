@@ -0,0 +1,46 @@
+# Tests for pickling and copying vehicles that belong to a Fleet
+import copy
+import pickle
+
+import pytest
+
+from assignment2.vehicles import Bike, Car, Fleet
+
+
+def make_fleet():
+    return Fleet([Car("Toyota", "Camry", 2020, 4), Bike("Harley", "Sportster", 2021, True)])
+
+
+@pytest.mark.parametrize("copier", [copy.copy, copy.deepcopy, lambda vehicle: pickle.loads(pickle.dumps(vehicle))])
+def test_copies_are_not_members(copier):
+    fleet = make_fleet()
+    for vehicle in fleet.query():
+        duplicate = copier(vehicle)
+        assert duplicate._fleet is None
+        assert duplicate.get_description() == vehicle.get_description()
+        duplicate.start_engine()
+        assert duplicate not in fleet.query(is_running=True)
+        with pytest.raises(KeyError):
+            fleet.remove(duplicate)
+        # The copy can join another fleet
+        Fleet([duplicate])
+
+
+def test_pickled_member_does_not_carry_its_fleet():
+    fleet = make_fleet()
+    for _ in range(100):
+        fleet.add(Car("Ford", "Focus", 2015, 4))
+    car = fleet.query(brand="Toyota")[0]
+    assert len(pickle.dumps(car)) == len(pickle.dumps(Car("Toyota", "Camry", 2020, 4)))
+
+
+def test_pickled_fleet_keeps_tracking_its_vehicles():
+    fleet = pickle.loads(pickle.dumps(make_fleet()))
+    car = fleet.query(brand="Toyota")[0]
+    assert car._fleet is fleet
+    car.start_engine()
+    assert fleet.query(is_running=True) == [car]
+    car.year = 2010
+    assert fleet.query(year_max=2012) == [car]
+    fleet.remove(car)
+    assert fleet.query(brand="Toyota") == []
@@ -0,0 +1,114 @@
+# Tests for SpecFactory, the shared specs and SharedVehicle
+import pickle
+
+import pytest
+
+from assignment2.engine_log import EngineLog
+from assignment2.flyweights import SharedVehicle, SpecFactory
+from assignment2.instrumentation import Instrumentation
+from assignment2.serialization import encode_objects
+from assignment2.shapes import Circle
+from assignment2.vehicles import Bike, Car, Fleet, start_all, stop_all
+
+
+def test_equal_arguments_share_one_spec():
+    factory = SpecFactory()
+    assert factory.circle(5.0) is factory.intern(Circle, 5.0)
+    assert factory.car("Toyota", "Camry", 2020, 4).spec is factory.car("Toyota", "Camry", 2020, 4).spec
+    assert factory.stats()["entries"] == 2
+
+
+def test_equal_values_of_different_types_get_distinct_specs():
+    factory = SpecFactory()
+    by_int = factory.car("Toyota", "Camry", 2020, 4).spec
+    by_float = factory.car("Toyota", "Camry", 2020, 4.0).spec
+    assert by_int is not by_float
+    assert by_int != by_float
+    assert by_int.get_description() == Car("Toyota", "Camry", 2020, 4).get_description()
+    assert by_float.get_description() == Car("Toyota", "Camry", 2020, 4.0).get_description()
+    assert factory.intern(Circle, 4) is not factory.intern(Circle, 4.0)
+
+
+def test_intern_columns_matches_intern_for_mixed_types():
+    factory = SpecFactory()
+    specs = factory.intern_columns(Circle, [4, 4.0, 4, 4.0])
+    assert specs[0] is specs[2] is factory.intern(Circle, 4)
+    assert specs[1] is specs[3] is factory.intern(Circle, 4.0)
+
+
+def test_specs_match_full_objects():
+    factory = SpecFactory()
+    spec = factory.bordered_rectangle(2.0, 3.0, "Red", 2.0)
+    shape = spec.create()
+    assert spec.calculate_area() == shape.calculate_area()
+    assert spec.get_description() == shape.get_description()
+    assert pickle.loads(pickle.dumps(spec)) == spec
+
+
+def test_building_a_spec_records_no_engine_transitions():
+    log = EngineLog()
+    instrumentation = Instrumentation()
+    with log.recording(), instrumentation.recording():
+        SpecFactory().car("Toyota", "Camry", 2020, 4)
+        SpecFactory().bike("Harley", "Sportster", 2021, True)
+    assert len(log) == 0
+    assert instrumentation.snapshot() == []
+
+
+def test_engine_messages_match_the_vehicle_classes():
+    factory = SpecFactory()
+    shared_car = factory.car("Toyota", "Camry", 2020, 4)
+    shared_bike = factory.bike("Harley", "Sportster", 2021, True)
+    assert shared_car.start_engine() == Car("Toyota", "Camry", 2020, 4).start_engine()
+    assert shared_car.stop_engine() == Car("Toyota", "Camry", 2020, 4).stop_engine()
+    assert shared_bike.start_engine() == Bike("Harley", "Sportster", 2021, True).start_engine()
+
+
+def test_shared_vehicles_keep_their_own_engine_state():
+    factory = SpecFactory()
+    first = factory.car("Toyota", "Camry", 2020, 4)
+    second = factory.car("Toyota", "Camry", 2020, 4)
+    first.start_engine()
+    assert first.is_running and not second.is_running
+
+
+def test_fleet_rejects_shared_vehicles():
+    shared = SpecFactory().car("Toyota", "Camry", 2020, 4)
+    assert isinstance(shared, SharedVehicle) and not isinstance(shared, Car)
+    with pytest.raises(TypeError):
+        Fleet().add(shared)
+    Fleet().add(shared.to_vehicle())
+
+
+def test_start_all_and_stop_all_accept_shared_vehicles():
+    factory = SpecFactory()
+    shared = [factory.car("Toyota", "Camry", 2020, 4) for _ in range(3)]
+    start_all(shared, max_workers=1)
+    assert all(vehicle.is_running for vehicle in shared)
+    stop_all(shared, max_workers=1)
+    assert not any(vehicle.is_running for vehicle in shared)
+
+
+def test_engine_log_does_not_record_shared_vehicles():
+    shared = SpecFactory().car("Toyota", "Camry", 2020, 4)
+    log = EngineLog()
+    with log.recording():
+        shared.start_engine()
+        car = shared.to_vehicle()
+        car.stop_engine()
+    assert log.vehicles == [car]
+
+
+def test_snapshots_reject_shared_vehicles():
+    shared = SpecFactory().car("Toyota", "Camry", 2020, 4)
+    with pytest.raises(TypeError):
+        list(encode_objects([shared]))
+    assert list(encode_objects([shared.to_vehicle()]))
+
+
+def test_to_vehicle_copies_the_engine_state():
+    shared = SpecFactory().bike("Harley", "Sportster", 2021, True)
+    shared.start_engine()
+    bike = shared.to_vehicle()
+    assert type(bike) is Bike and bike.is_running
+    assert bike.get_description() == shared.get_description()
@@ -0,0 +1,24 @@
+# Tests for the import-time budget, measured with -X importtime in fresh interpreters
+import pytest
+
+from benchmarks import DEFERRED_IMPORTS, IMPORT_BUDGET_MS, import_environment, measure_import
+
+
+@pytest.fixture(scope="module")
+def import_env(tmp_path_factory):
+    return import_environment(str(tmp_path_factory.mktemp("pycache")))
+
+
+@pytest.mark.parametrize("module_name", ["assignment2", "assignment2.shapes"])
+def test_import_is_fast_and_has_no_side_effects(module_name, import_env, tmp_path):
+    # The first import compiles the bytecode; the fastest of the rest is timed
+    runs = [measure_import(module_name, str(tmp_path), import_env) for _ in range(4)][1:]
+    assert min(run["total_ms"] for run in runs) <= IMPORT_BUDGET_MS
+    assert not DEFERRED_IMPORTS & runs[0]["imported"]
+    assert runs[0]["output"] == "" and runs[0]["files"] == []
+
+
+def test_package_import_loads_no_submodules(import_env, tmp_path):
+    imported = measure_import("assignment2", str(tmp_path), import_env)["imported"]
+    assert "assignment2" in imported
+    assert not [name for name in imported if name.startswith("assignment2.")]
@@ -0,0 +1,49 @@
+# Tests for Instrumentation of methods and module-level functions
+import assignment2
+from assignment2.animals import Dog
+from assignment2.instrumentation import Instrumentation
+
+
+def test_package_functions_are_instrumented_after_first_use():
+    dog = Dog("Rex", 5)
+    # The first lookup loads the function before instrumentation patches its module
+    assignment2.process_sound(dog)
+    instrumentation = Instrumentation()
+    with instrumentation.recording():
+        assignment2.process_sound(dog)
+    calls = {entry["method"]: entry["calls"] for entry in instrumentation.snapshot()}
+    assert calls["process_sound"] == 1
+    assert calls["make_sound"] == 1
+
+
+def test_demos_calls_are_instrumented(capsys):
+    from assignment2 import demos
+
+    instrumentation = Instrumentation()
+    with instrumentation.recording():
+        demos.animal_demo()
+    capsys.readouterr()
+    calls = {entry["method"]: entry["calls"] for entry in instrumentation.snapshot()}
+    assert calls["process_sound"] == 5
+
+
+def test_process_sounds_calls_instrumented_methods_like_process_sound():
+    from assignment2.animals import Cat, process_sound, process_sounds
+
+    animals = [Dog("Rex", 5), Cat("Whiskers", 3), Dog("Fido", 2)]
+    expected = [process_sound(animal) for animal in animals]
+    instrumentation = Instrumentation()
+    with instrumentation.recording():
+        assert list(process_sounds(animals)) == expected
+    calls = {(entry["owner"], entry["method"]): entry["calls"] for entry in instrumentation.snapshot()}
+    assert calls[("Dog", "make_sound")] == 2 and calls[("Cat", "make_sound")] == 1
+    assert calls[("assignment2.animals", "process_sound")] == 3
+    # Restored methods bring the templates back
+    assert list(process_sounds(animals)) == expected
+
+
+def test_process_sounds_follows_patched_methods(monkeypatch):
+    from assignment2.animals import process_sounds
+
+    monkeypatch.setattr(Dog, "make_sound", lambda self: f"{self.name} says: Grr!")
+    assert list(process_sounds([Dog("Rex", 5)])) == ["Dog named Rex, age 5 makes sound: Rex says: Grr!"]
@@ -0,0 +1,146 @@
+# Tests for PersonTable storage, grouping and exports
+import csv
+import io
+import json
+import random
+
+import pytest
+
+from assignment2.file_handlers import TextFileHandler
+from assignment2.people import DictionaryColumn, PersonTable
+
+# Strings that need quoting or escaping in CSV and JSON
+AWKWARD = ["plain", "with, comma", 'with "quotes"', "two\nlines", "carriage\rreturn", "Zürich ✓", ""]
+
+
+def make_records(count, seed=3):
+    rng = random.Random(seed)
+    records = []
+    for i in range(count):
+        record = {name: rng.choice(AWKWARD) for name in PersonTable.FIELDS}
+        record.update(name=f"Person {i}", age=rng.randrange(0, 100),
+                      height=round(rng.uniform(1.4, 2.1), 2), weight=rng.uniform(40, 120))
+        records.append(record)
+    return records
+
+
+def test_dictionary_column_stores_each_value_once():
+    column = DictionaryColumn(["a", "b", "a", "a", "c"])
+    assert list(column) == ["a", "b", "a", "a", "c"]
+    assert column.values == ["a", "b", "c"]
+    assert column[3] == "a" and len(column) == 5
+
+
+def test_rows_round_trip():
+    records = make_records(50)
+    table = PersonTable.from_records(records)
+    assert len(table) == 50
+    assert [table.row(i) for i in range(50)] == records
+    assert list(table.iter_rows(10, 13)) == [tuple(record.values()) for record in records[10:13]]
+
+
+def test_append_matches_from_records():
+    records = make_records(20)
+    table = PersonTable()
+    for record in records:
+        table.append(record)
+    assert list(table.iter_rows()) == list(PersonTable.from_records(records).iter_rows())
+
+
+@pytest.mark.parametrize("batch_size", [1, 7, 4096])
+def test_csv_reads_back_with_the_csv_module(batch_size):
+    records = make_records(30)
+    text = "".join(PersonTable.from_records(records).iter_csv(batch_size))
+    reader = csv.reader(io.StringIO(text, newline=""))
+    assert next(reader) == list(PersonTable.FIELDS)
+    assert list(reader) == [[str(value) for value in record.values()] for record in records]
+
+
+@pytest.mark.parametrize("value", AWKWARD)
+def test_csv_quotes_like_the_csv_module(value):
+    record = make_records(1)[0]
+    record["hobby"] = value
+    rows = "".join(PersonTable.from_records([record]).iter_csv()).split("\n", 1)[1]
+    expected = io.StringIO()
+    csv.writer(expected).writerow(record.values())
+    assert rows == expected.getvalue()[:-len("\r\n")] + "\n"
+
+
+def test_jsonl_parses_back_to_the_records():
+    records = make_records(30)
+    lines = "".join(PersonTable.from_records(records).iter_jsonl(batch_size=4)).splitlines()
+    assert [json.loads(line) for line in lines] == records
+
+
+def test_export_through_a_handler(tmp_path):
+    records = make_records(5)
+    handler = TextFileHandler(str(tmp_path / "people.jsonl"))
+    PersonTable.from_records(records).export(handler, format="jsonl")
+    assert [json.loads(line) for line in handler.read().splitlines()] == records
+    with pytest.raises(ValueError):
+        PersonTable.from_records(records).export(handler, format="xml")
+
+
+def test_grouping_matches_brute_force():
+    records = make_records(200)
+    table = PersonTable.from_records(records)
+    hobbies = {record["hobby"] for record in records}
+    assert table.group_count("hobby") == {hobby: sum(r["hobby"] == hobby for r in records) for hobby in hobbies}
+    means = table.group_mean("height", by="hobby")
+    for hobby in hobbies:
+        heights = [r["height"] for r in records if r["hobby"] == hobby]
+        assert means[hobby] == pytest.approx(sum(heights) / len(heights))
+    with pytest.raises(ValueError):
+        table.group_mean("name", by="hobby")
+    with pytest.raises(ValueError):
+        table.group_count("age")
+
+
+def test_invalid_columns_list_every_bad_row():
+    records = make_records(6)
+    records[1]["age"] = -1
+    records[4]["age"] = -3
+    with pytest.raises(ValueError, match=r"rows 1, 4"):
+        PersonTable.from_records(records)
+
+
+@pytest.mark.parametrize("field, value", [("age", 21.5), ("age", 65536), ("age", -1), ("height", "tall"),
+                                          ("weight", 0.0), ("hobby", ["unhashable"])])
+def test_rejected_append_leaves_the_table_unchanged(field, value):
+    records = make_records(3)
+    table = PersonTable.from_records(records[:2])
+    with pytest.raises((ValueError, TypeError)):
+        table.append(dict(records[2], **{field: value}))
+    assert len(table) == 2
+    assert {len(column) for column in table.columns.values()} == {2}
+    assert [table.row(i) for i in range(2)] == records[:2]
+    table.append(records[2])
+    assert table.row(2) == records[2]
+
+
+def test_values_that_do_not_fit_a_column_are_reported_by_row():
+    records = make_records(5)
+    records[1]["age"] = 21.5
+    records[3]["age"] = 70000
+    records[2]["height"] = "tall"
+    records[4]["weight"] = -1.0
+    with pytest.raises(ValueError) as error:
+        PersonTable.from_records(records)
+    assert str(error.value) == ("Age must be a whole number from 0 to 65535 (rows 1, 3); "
+                                "Height must be a number (rows 2); Weight must be positive (rows 4)")
+
+
+def test_missing_fields_are_reported():
+    records = make_records(3)
+    del records[2]["blood_type"]
+    with pytest.raises(ValueError, match="blood_type.*row 2"):
+        PersonTable.from_records(records)
+    with pytest.raises(ValueError, match="blood_type"):
+        PersonTable().append(records[2])
+    with pytest.raises(ValueError):
+        PersonTable.from_columns(name=["x"])
+
+
+def test_batch_size_must_be_positive():
+    with pytest.raises(ValueError):
+        list(PersonTable.from_records(make_records(1)).iter_csv(batch_size=0))
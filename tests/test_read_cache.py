@@ -0,0 +1,90 @@
+# Tests for ReadCache and the handlers reading through it
+import gzip
+import os
+import sys
+
+import pytest
+
+from assignment2.file_handlers import BinaryFileHandler, GzipFileHandler, ReadCache, TextFileHandler
+
+
+def test_repeated_reads_hit_the_cache(tmp_path):
+    path = str(tmp_path / "notes.txt")
+    cache = ReadCache()
+    handler = TextFileHandler(path, cache=cache)
+    handler.write("hello")
+    assert handler.read() == "hello"
+    assert handler.read() == "hello"
+    assert cache.stats()["hits"] == 1
+    assert cache.stats()["misses"] == 1
+
+
+def test_write_through_handler_invalidates(tmp_path):
+    path = str(tmp_path / "notes.txt")
+    cache = ReadCache()
+    handler = TextFileHandler(path, cache=cache)
+    handler.write("old")
+    assert handler.read() == "old"
+    handler.write("new")
+    assert handler.read() == "new"
+
+
+def test_external_change_is_detected(tmp_path):
+    path = tmp_path / "notes.txt"
+    cache = ReadCache()
+    handler = TextFileHandler(str(path), cache=cache)
+    path.write_text("first")
+    assert handler.read() == "first"
+    path.write_text("second, longer")
+    assert handler.read() == "second, longer"
+
+
+def test_evicts_least_recently_used_within_budget(tmp_path):
+    handlers = []
+    for name in "abc":
+        path = tmp_path / name
+        path.write_bytes(name.encode() * 1000)
+        handlers.append(BinaryFileHandler(str(path)))
+    cost = sys.getsizeof(handlers[0].read())
+    cache = ReadCache(max_bytes=2 * cost)
+    for handler in handlers:
+        handler.cache = cache
+        handler.read()
+    stats = cache.stats()
+    assert stats["entries"] == 2
+    assert stats["evictions"] == 1
+    assert stats["bytes"] <= 2 * cost
+
+
+def test_missing_file_raises(tmp_path):
+    handler = TextFileHandler(str(tmp_path / "missing.txt"), cache=ReadCache())
+    with pytest.raises(FileNotFoundError):
+        handler.read()
+
+
+def test_negative_budget_rejected():
+    with pytest.raises(ValueError):
+        ReadCache(max_bytes=-1)
+
+
+def test_raw_and_decompressed_reads_of_one_path_do_not_collide(tmp_path):
+    path = str(tmp_path / "data.gz")
+    with gzip.open(path, "wb") as file:
+        file.write(b"payload")
+    raw = open(path, "rb").read()
+    cache = ReadCache()
+    assert BinaryFileHandler(path, cache=cache).read() == raw
+    assert GzipFileHandler(path, cache=cache).read() == b"payload"
+    assert BinaryFileHandler(path, cache=cache).read() == raw
+    assert cache.stats()["entries"] == 2
+
+
+def test_invalidate_drops_every_handler_entry(tmp_path):
+    path = str(tmp_path / "data.gz")
+    with gzip.open(path, "wb") as file:
+        file.write(b"payload")
+    cache = ReadCache()
+    BinaryFileHandler(path, cache=cache).read()
+    GzipFileHandler(path, cache=cache).read()
+    cache.invalidate(os.path.relpath(path))
+    assert cache.stats()["entries"] == 0
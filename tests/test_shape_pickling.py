@@ -0,0 +1,69 @@
+# Tests for pickling and copying shapes that belong to a ShapeCollection
+import copy
+import pickle
+
+import pytest
+
+from assignment2.shapes import BorderedRectangle, Circle, Rectangle, ShapeCollection
+
+
+def make_shapes():
+    return [Circle(2.0, 1.0, 2.0), Rectangle(2.0, 3.0), BorderedRectangle(1.0, 2.0, "Red", 0.5)]
+
+
+def grow(shape):
+    if isinstance(shape, Circle):
+        shape.radius *= 2
+    else:
+        shape.width *= 2
+
+
+@pytest.mark.parametrize("index", range(3))
+def test_pickled_member_does_not_carry_its_collection(index):
+    shapes = make_shapes()
+    collection = ShapeCollection(shapes + [Circle(1.0) for _ in range(1000)])
+    data = pickle.dumps(shapes[index])
+    alone = make_shapes()[index]
+    alone.calculate_area()
+    assert len(data) == len(pickle.dumps(alone))
+    restored = pickle.loads(data)
+    assert restored._collection is None
+    assert restored.calculate_area() == shapes[index].calculate_area()
+    assert restored.get_description() == shapes[index].get_description()
+    # Changing the copy leaves the original collection alone
+    total = collection.total_area
+    grow(restored)
+    assert collection.total_area == total
+
+
+def test_copies_are_not_members():
+    shapes = make_shapes()
+    collection = ShapeCollection(shapes)
+    for shape in shapes:
+        for duplicate in (copy.copy(shape), copy.deepcopy(shape)):
+            assert duplicate._collection is None
+            assert duplicate not in collection
+    assert copy.copy(shapes[0]).x == 1.0 and copy.copy(shapes[0]).y == 2.0
+
+
+def test_pickled_collection_keeps_tracking_its_shapes():
+    collection = pickle.loads(pickle.dumps(ShapeCollection(make_shapes())))
+    assert all(shape._collection is collection for shape in collection)
+    circle = next(shape for shape in collection if isinstance(shape, Circle))
+    circle.radius = 1.0
+    assert collection.total_area == pytest.approx(collection.recompute())
+
+
+class Square(Rectangle):
+    # A subclass without __slots__ keeps its own attributes in __dict__
+    def __init__(self, side):
+        super().__init__(side, side)
+        self.label = "square"
+
+
+def test_subclass_attributes_survive_pickling():
+    square = Square(2.0)
+    collection = ShapeCollection([square])
+    for duplicate in (pickle.loads(pickle.dumps(square)), copy.copy(square)):
+        assert duplicate.label == "square" and duplicate.width == 2.0
+        assert duplicate._collection is None and duplicate not in collection
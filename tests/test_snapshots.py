@@ -0,0 +1,74 @@
+# Tests for the binary snapshot format
+import pytest
+
+from assignment2.animals import Cat, Dog
+from assignment2.file_handlers import BinaryFileHandler
+from assignment2.serialization import SnapshotReader, dump_objects, encode_objects, load_objects
+from assignment2.shapes import BorderedRectangle, Circle, Rectangle
+from assignment2.vehicles import Bike, Car
+
+
+def make_objects():
+    running = Car("Toyota", "Camry", 2020, 4)
+    running.start_engine()
+    return [running, Bike("Harley", "Sportster", 2021, True), Circle(2.5, 1.0, -2.0),
+            Rectangle(3.0, 4.0, 5.0, 6.0), BorderedRectangle(1.0, 2.0, "Red", 0.5),
+            Dog("Rex", 5), Cat("Whiskers", 3), Car("Toyota", "Corolla", 2019, 2)]
+
+
+def state(obj):
+    # Everything a record stores about an object
+    return (type(obj), obj.get_description(), getattr(obj, "is_running", None),
+            getattr(obj, "x", None), getattr(obj, "y", None))
+
+
+@pytest.fixture
+def snapshot(tmp_path):
+    handler = BinaryFileHandler(str(tmp_path / "objects.snap"))
+    dump_objects(make_objects(), handler, batch_size=3)
+    return handler
+
+
+def test_round_trip_keeps_every_field(snapshot):
+    assert [state(obj) for obj in load_objects(snapshot)] == [state(obj) for obj in make_objects()]
+
+
+def test_reader_decodes_single_records(snapshot):
+    expected = make_objects()
+    with SnapshotReader(snapshot) as reader:
+        assert len(reader) == len(expected)
+        assert state(reader[4]) == state(expected[4])
+        assert state(reader[-1]) == state(expected[-1])
+        with pytest.raises(IndexError):
+            reader[len(expected)]
+
+
+def test_strings_are_stored_once():
+    cars = [Car("Toyota", "Camry", 2000 + i % 20, 4) for i in range(100)]
+    data = b"".join(encode_objects(cars))
+    assert data.count(b"Toyota") == data.count(b"Camry") == 1
+
+
+@pytest.mark.parametrize("obj, field", [
+    (Dog("Rex", 2.5), "age"),
+    (Cat("Whiskers", 3.0), "age"),
+    (Car("Toyota", "Camry", 2020.0, 4), "year"),
+    (Car("Toyota", "Camry", 2020, 2 ** 31), "num_doors"),
+    (Bike("Harley", "Sportster", -2 ** 40, False), "year"),
+])
+def test_fields_that_do_not_fit_raise_value_error(obj, field):
+    with pytest.raises(ValueError, match=rf"\b{field}="):
+        list(encode_objects([obj]))
+
+
+def test_unsupported_objects_raise_type_error():
+    with pytest.raises(TypeError, match="Cannot serialize str objects"):
+        list(encode_objects(["text"]))
+
+
+def test_reader_rejects_other_files(tmp_path):
+    handler = BinaryFileHandler(str(tmp_path / "other.bin"))
+    handler.write(b"not a snapshot at all, just some bytes")
+    with pytest.raises(ValueError):
+        with SnapshotReader(handler):
+            pass
@@ -0,0 +1,134 @@
+# Tests for SoundScheduler timing, batching and back-pressure
+import asyncio
+import random
+import time
+from collections import Counter
+
+import pytest
+
+from assignment2.animals import Cat, Dog, process_sound
+from assignment2.sound_scheduler import SoundScheduler
+
+
+def recording_scheduler(**options):
+    # Scheduler whose sink records (tick, line) for every sound
+    heard = []
+
+    async def sink(lines):
+        heard.extend((scheduler.current_tick, line) for line in lines)
+
+    scheduler = SoundScheduler(sink, **options)
+    return scheduler, heard
+
+
+def test_matches_a_tick_by_tick_simulation():
+    rng = random.Random(11)
+    scheduler, heard = recording_scheduler(batch_size=5)
+    expected = Counter()
+    for i in range(60):
+        animal = (Dog if i % 2 else Cat)(f"Pet {i}", i % 15)
+        interval, start = rng.randrange(1, 8), rng.choice([None, rng.randrange(0, 10)])
+        scheduler.add(animal, interval, start)
+        first = interval if start is None else start
+        expected.update((tick, process_sound(animal)) for tick in range(first, 41, interval))
+    emitted = asyncio.run(scheduler.run(25)) + asyncio.run(scheduler.run(15))
+    assert Counter(heard) == expected
+    assert emitted == scheduler.sounds == sum(expected.values())
+    assert scheduler.current_tick == 40
+    assert len(scheduler) == 60
+
+
+def test_spread_staggers_a_cohort_over_its_interval():
+    scheduler, heard = recording_scheduler()
+    scheduler.add_many([Dog(f"Dog {i}", 3) for i in range(12)], interval=4, start=0, spread=True)
+    asyncio.run(scheduler.run(7))
+    assert Counter(tick for tick, _ in heard) == {tick: 3 for tick in range(8)}
+    assert scheduler.stats()["cohorts"] == 4
+
+
+def test_cohorts_with_the_same_interval_and_tick_merge():
+    scheduler, _ = recording_scheduler()
+    scheduler.add_many([Dog("Rex", 5)] * 3, interval=2, start=2)
+    scheduler.add_many([Cat("Luna", 4)] * 2, interval=2, start=2)
+    assert scheduler.stats()["cohorts"] == 1
+    assert scheduler.next_tick() == 2
+
+
+def test_batches_respect_batch_size():
+    sizes = []
+
+    async def sink(lines):
+        sizes.append(len(lines))
+
+    scheduler = SoundScheduler(sink, batch_size=4)
+    scheduler.add_many([Dog("Rex", 5)] * 10, interval=1)
+    asyncio.run(scheduler.run(3))
+    assert sizes == [4, 4, 2] * 3
+    assert scheduler.batches == 9
+
+
+def test_bounded_queue_applies_back_pressure():
+    async def main():
+        queue = asyncio.Queue(maxsize=2)
+        scheduler = SoundScheduler(queue.put, batch_size=1)
+        scheduler.add_many([Dog("Rex", 5)] * 50, interval=1)
+        received = []
+
+        async def consume():
+            while True:
+                received.append(await queue.get())
+                await asyncio.sleep(0)
+
+        consumer = asyncio.create_task(consume())
+        await scheduler.run(2)
+        await asyncio.sleep(0)
+        consumer.cancel()
+        # The scheduler never ran more than the queue's capacity ahead of the consumer
+        assert len(received) >= scheduler.sounds - 2
+        return scheduler
+
+    assert asyncio.run(main()).sounds == 100
+
+
+def test_failing_sink_keeps_the_schedule():
+    calls = []
+
+    async def sink(lines):
+        calls.append(lines)
+        if len(calls) == 1:
+            raise RuntimeError("sink closed")
+
+    scheduler = SoundScheduler(sink)
+    scheduler.add(Dog("Rex", 5), interval=1)
+    with pytest.raises(RuntimeError):
+        asyncio.run(scheduler.run(3))
+    assert len(scheduler) == 1
+    asyncio.run(scheduler.run(2))
+    assert len(calls) == 3
+
+
+def test_ticks_follow_the_wall_clock():
+    scheduler, heard = recording_scheduler(tick_seconds=0.02)
+    scheduler.add(Dog("Rex", 5), interval=1)
+    began = time.monotonic()
+    asyncio.run(scheduler.run(5))
+    assert time.monotonic() - began >= 0.1
+    assert [tick for tick, _ in heard] == [1, 2, 3, 4, 5]
+
+
+def test_invalid_arguments():
+    async def sink(lines):
+        pass
+
+    with pytest.raises(ValueError):
+        SoundScheduler(sink, tick_seconds=-1)
+    with pytest.raises(ValueError):
+        SoundScheduler(sink, batch_size=0)
+    scheduler = SoundScheduler(sink)
+    with pytest.raises(ValueError):
+        scheduler.add(Dog("Rex", 5), interval=0)
+    asyncio.run(scheduler.run(5))
+    with pytest.raises(ValueError):
+        scheduler.add(Dog("Rex", 5), interval=1, start=2)
+    with pytest.raises(ValueError):
+        asyncio.run(scheduler.run(-1))
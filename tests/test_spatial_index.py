@@ -0,0 +1,108 @@
+# Tests for SpatialIndex region and nearest-neighbour queries
+import random
+import time
+
+import pytest
+
+from assignment2.shapes import Circle, Rectangle, Shape, SpatialIndex
+
+
+def make_shapes(count=100, seed=7):
+    rng = random.Random(seed)
+    shapes = []
+    for i in range(count):
+        x, y = rng.uniform(0, 50), rng.uniform(0, 50)
+        if i % 2:
+            shapes.append(Circle(rng.uniform(0.1, 2.0), x, y))
+        else:
+            shapes.append(Rectangle(rng.uniform(0.1, 3.0), rng.uniform(0.1, 3.0), x, y))
+    return shapes
+
+
+def brute_region(shapes, *region):
+    return {id(shape) for shape in shapes if shape.intersects(*region)}
+
+
+def brute_nearest(shapes, x, y, count):
+    return sorted(shapes, key=lambda shape: shape.distance_to(x, y))[:count]
+
+
+@pytest.mark.parametrize("region", [(10, 10, 20, 20), (-5, -5, 0.5, 0.5), (0, 0, 50, 50), (25, 25, 25, 25)])
+def test_query_region_matches_brute_force(region):
+    shapes = make_shapes()
+    index = SpatialIndex.bulk_load(shapes)
+    assert {id(shape) for shape in index.query_region(*region)} == brute_region(shapes, *region)
+
+
+@pytest.mark.parametrize("point", [(0, 0), (25, 25), (49, 3), (-10, 60)])
+def test_nearest_matches_brute_force(point):
+    shapes = make_shapes()
+    index = SpatialIndex.bulk_load(shapes)
+    expected = [shape.distance_to(*point) for shape in brute_nearest(shapes, *point, 5)]
+    assert [shape.distance_to(*point) for shape in index.nearest(*point, count=5)] == expected
+
+
+def test_far_out_of_extent_queries_are_fast():
+    shapes = make_shapes()
+    index = SpatialIndex.bulk_load(shapes)
+    started = time.perf_counter()
+    assert index.query_region(1e9, 1e9, 1e9 + 10, 1e9 + 10) == []
+    assert len(index.query_region(-1e9, -1e9, 1e9, 1e9)) == len(shapes)
+    far = index.nearest(1e9, -1e9, count=3)
+    assert [shape.distance_to(1e9, -1e9) for shape in far] == \
+        [shape.distance_to(1e9, -1e9) for shape in brute_nearest(shapes, 1e9, -1e9, 3)]
+    assert time.perf_counter() - started < 1.0
+
+
+def test_update_and_remove():
+    circle = Circle(1.0, 0.0, 0.0)
+    index = SpatialIndex(cell_size=2.0)
+    index.insert(circle)
+    with pytest.raises(ValueError):
+        index.insert(circle)
+    circle.x, circle.y = 100.0, 100.0
+    index.update(circle)
+    assert index.query_region(-1, -1, 1, 1) == []
+    assert index.query_region(99, 99, 101, 101) == [circle]
+    index.remove(circle)
+    assert len(index) == 0 and circle not in index
+    with pytest.raises(KeyError):
+        index.remove(circle)
+
+
+def test_empty_index_queries():
+    index = SpatialIndex()
+    assert index.query_region(0, 0, 1, 1) == []
+    assert index.nearest(0, 0) == []
+    with pytest.raises(ValueError):
+        SpatialIndex(cell_size=0)
+
+
+def test_total_area_in_region_contained():
+    inside = Rectangle(1.0, 1.0, 1.0, 1.0)
+    straddling = Rectangle(4.0, 4.0, 3.0, 3.0)
+    index = SpatialIndex.bulk_load([inside, straddling])
+    assert index.total_area_in_region(0, 0, 5, 5) == pytest.approx(17.0)
+    assert index.total_area_in_region(0, 0, 5, 5, contained=True) == pytest.approx(1.0)
+
+
+class Square(Shape):
+    # A Shape subclass written before shapes had coordinates
+    def __init__(self, side):
+        self.side = side
+
+    def calculate_area(self):
+        return self.side ** 2
+
+
+def test_shapes_without_bounds_still_work_but_cannot_be_indexed():
+    square = Square(3.0)
+    assert square.calculate_area() == 9.0 and square.get_bounds() is None
+    index = SpatialIndex()
+    for add in (index.insert, lambda shape: index.insert_many([Circle(1.0), shape]),
+                lambda shape: SpatialIndex.bulk_load([shape])):
+        with pytest.raises(TypeError, match="Square has no bounds"):
+            add(square)
+    assert len(index) == 0
+    with pytest.raises(TypeError):
+        square.distance_to(0.0, 0.0)
@@ -0,0 +1,52 @@
+# Tests for FileHandler.write_stream
+import pytest
+
+from assignment2.file_handlers import BinaryFileHandler, GzipFileHandler, ReadCache, TextFileHandler
+
+
+def test_writes_chunks_and_counts_them(tmp_path):
+    handler = TextFileHandler(str(tmp_path / "out.txt"))
+    assert handler.write_stream(["one\n", "two\n"]) == 8
+    assert handler.write_stream(["three\n"], append=True) == 6
+    assert handler.read() == "one\ntwo\nthree\n"
+
+
+def test_compressed_handlers_stream_through_the_codec(tmp_path):
+    handler = GzipFileHandler(str(tmp_path / "out.gz"))
+    handler.write_stream([b"a" * 1000, b"b" * 1000])
+    assert handler.read() == b"a" * 1000 + b"b" * 1000
+
+
+def test_bad_chunk_removes_the_overwritten_file(tmp_path):
+    handler = TextFileHandler(str(tmp_path / "out.txt"))
+    handler.write("original")
+    with pytest.raises(TypeError):
+        handler.write_stream(["ok", 5])
+    assert not (tmp_path / "out.txt").exists()
+
+
+def test_bad_chunk_truncates_an_appended_file_back(tmp_path):
+    handler = BinaryFileHandler(str(tmp_path / "out.bin"), cache=ReadCache())
+    handler.write(b"original")
+    assert handler.read() == b"original"
+    with pytest.raises(TypeError):
+        handler.write_stream([b"more", "text"], append=True)
+    assert (tmp_path / "out.bin").read_bytes() == b"original"
+    assert handler.read() == b"original"
+
+
+def test_failing_producer_leaves_no_torn_file(tmp_path):
+    def chunks():
+        yield "partial"
+        raise KeyError("missing")
+
+    handler = TextFileHandler(str(tmp_path / "out.txt"))
+    with pytest.raises(KeyError):
+        handler.write_stream(chunks())
+    assert not (tmp_path / "out.txt").exists()
+
+
+def test_unopenable_file_is_left_alone(tmp_path):
+    handler = TextFileHandler(str(tmp_path / "missing" / "out.txt"))
+    with pytest.raises(IOError):
+        handler.write_stream(["text"])